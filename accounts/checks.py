@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from .hashers import MIN_PBKDF2_ITERATIONS
+
+
+@register()
+def check_pbkdf2_iterations(app_configs, **kwargs):
+    """Refuse a PBKDF2 work factor cheap enough to brute-force stolen hashes."""
+    iterations = getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', None)
+    if iterations and iterations < MIN_PBKDF2_ITERATIONS:
+        return [Error(
+            f'PASSWORD_PBKDF2_ITERATIONS is {iterations}, below the minimum of {MIN_PBKDF2_ITERATIONS}.',
+            hint='Raise it, or unset it (0) to follow Django\'s default.',
+            id='accounts.E001',
+        )]
+    return []
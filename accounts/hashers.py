@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+# Floor for PASSWORD_PBKDF2_ITERATIONS, enforced by the accounts.E001 check:
+# OWASP's current recommendation for PBKDF2-HMAC-SHA256.
+MIN_PBKDF2_ITERATIONS = 600_000
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor set by ``PASSWORD_PBKDF2_ITERATIONS``.
+
+    Keeps Django's algorithm name, so existing hashes verify unchanged and
+    any hash with a different iteration count is rewritten at the next
+    successful login.  Unset, it follows Django's default; set, it may not go
+    below ``MIN_PBKDF2_ITERATIONS``.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
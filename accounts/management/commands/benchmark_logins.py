@@ -0,0 +1,130 @@
+import json
+import random
+import secrets
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+PASSWORD = 'bench-Pass-123'
+# Share of legitimate logins in the mixed traffic.
+MIXED_LEGITIMATE = 0.1
+STUFFING_IPS = 4
+MIXES = ('legitimate', 'stuffing', 'mixed')
+
+
+class Command(BaseCommand):
+    help = ('Measure logins per CPU-second (one core) for legitimate, credential-stuffing '
+            'and mixed traffic, with and without the login rate limits. Runs in-process '
+            'against throwaway users that are rolled back afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='Login attempts per run.')
+        parser.add_argument('--users', type=int, default=50, help='Accounts with valid credentials.')
+        parser.add_argument('--endpoint', choices=('api', 'form'), default='api',
+                            help='/api/token/ or the login page.')
+        parser.add_argument('--mix', action='append', choices=MIXES, dest='mixes',
+                            help='Traffic mix to run, repeatable (default: all).')
+        parser.add_argument('--limits', choices=('on', 'off', 'both'), default='both',
+                            help='Run with the configured LOGIN_RATE_LIMITS, without them, or both.')
+        parser.add_argument('--iterations', type=int,
+                            help='PBKDF2 iterations to benchmark (default: PASSWORD_PBKDF2_ITERATIONS).')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+
+    def handle(self, *args, **options):
+        overrides = {'ALLOWED_HOSTS': ['testserver'], 'REQUEST_METRICS_SAMPLE_RATE': 0.0}
+        if options['iterations']:
+            overrides['PASSWORD_PBKDF2_ITERATIONS'] = options['iterations']
+        modes = ('on', 'off') if options['limits'] == 'both' else (options['limits'],)
+
+        results = []
+        with override_settings(**overrides):
+            for mix in options['mixes'] or MIXES:
+                for mode in modes:
+                    with override_settings(**({'LOGIN_RATE_LIMITS': {}} if mode == 'off' else {})):
+                        result = self._run(mix, options)
+                    result['limits'] = mode
+                    results.append(result)
+
+        self._report(results)
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as out:
+                json.dump(results, out, indent=2)
+
+    def _run(self, mix, options):
+        # Fresh names and addresses per run so no run starts already limited.
+        tag = secrets.token_hex(4)
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            User = get_user_model()
+            password = make_password(PASSWORD)
+            users = User.objects.bulk_create(
+                User(username=f'bench-{tag}-{index}', password=password)
+                for index in range(options['users'])
+            )
+            attempts = self._plan(mix, tag, [user.username for user in users], options['requests'], rng)
+            outcomes = Counter()
+            legitimate = Counter()
+            client = Client()
+            url = reverse('token_obtain_pair' if options['endpoint'] == 'api' else 'login')
+            success = 200 if options['endpoint'] == 'api' else 302
+
+            wall, cpu = time.perf_counter(), time.process_time()
+            for is_legitimate, username, secret, ip in attempts:
+                response = client.post(url, {'username': username, 'password': secret}, REMOTE_ADDR=ip)
+                outcome = ('ok' if response.status_code == success
+                           else 'limited' if response.status_code == 429 else 'failed')
+                outcomes[outcome] += 1
+                if is_legitimate:
+                    legitimate[outcome] += 1
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            transaction.set_rollback(True)
+
+        return {
+            'mix': mix,
+            'endpoint': options['endpoint'],
+            'requests': len(attempts),
+            'ok': outcomes['ok'],
+            'failed': outcomes['failed'],
+            'limited': outcomes['limited'],
+            'legitimate': sum(legitimate.values()),
+            'legitimate_ok': legitimate['ok'],
+            'cpu_seconds': round(cpu, 3),
+            'wall_seconds': round(wall, 3),
+            'requests_per_cpu_second': round(len(attempts) / cpu, 1) if cpu else None,
+            'logins_per_cpu_second': round(outcomes['ok'] / cpu, 1) if cpu else None,
+        }
+
+    def _plan(self, mix, tag, usernames, count, rng):
+        """``(legitimate, username, password, ip)`` for every attempt of one run."""
+        stuffing_ips = [f'2001:db8:{tag[:4]}:{tag[4:]}::{index:x}' for index in range(STUFFING_IPS)]
+        attempts = []
+        logins = 0
+        for index in range(count):
+            if mix == 'legitimate' or (mix == 'mixed' and rng.random() < MIXED_LEGITIMATE):
+                # Accounts take turns, each from its own address.
+                user = logins % len(usernames)
+                logins += 1
+                attempts.append((True, usernames[user], PASSWORD, f'2001:db8:{tag[:4]}:{tag[4:]}:1::{user:x}'))
+            else:
+                # A handful of addresses guessing at real and made-up accounts.
+                username = rng.choice(usernames) if rng.random() < 0.5 else f'guess-{tag}-{index}'
+                attempts.append((False, username, f'guess-{rng.getrandbits(32):x}', rng.choice(stuffing_ips)))
+        return attempts
+
+    def _report(self, results):
+        self.stdout.write(f'{"mix":<11} {"limits":<6} {"requests":>8} {"ok":>6} {"failed":>6} '
+                          f'{"limited":>7} {"legit ok":>9} {"req/cpu-s":>10} {"logins/cpu-s":>12}')
+        for result in results:
+            self.stdout.write(
+                f'{result["mix"]:<11} {result["limits"]:<6} {result["requests"]:>8} {result["ok"]:>6} '
+                f'{result["failed"]:>6} {result["limited"]:>7} '
+                f'{result["legitimate_ok"]:>4}/{result["legitimate"]:<4} '
+                f'{result["requests_per_cpu_second"]:>10} {result["logins_per_cpu_second"]:>12}'
+            )
@@ -0,0 +1,135 @@
+"""
+Rate limits for logins, checked before any password is hashed.
+
+Each limit allows ``attempts`` within a sliding ``window`` of seconds: a
+counter for the current window plus the previous one weighted by how much
+of it is still inside the window.  This is a sliding-window counter, not a
+token bucket, because it only needs ``cache.add``, ``cache.incr`` and
+``cache.decr``, which are atomic on the shared cache
+(``LOGIN_RATE_LIMIT_CACHE_ALIAS``, Redis in production), where a bucket
+would need a read-modify-write of its fill level.
+
+Every attempt counts against the client IP.  Only failed authentications
+count against the username they name (``record_failed_login``, hooked to
+``user_login_failed``), so successful logins never use up an account's
+allowance, and attempts that are refused are never recorded at all: a
+client that is already throttled cannot push anyone's lockout further out.
+A user who mistypes a few times is never noticed, while a credential-stuffing
+burst is turned away after ``attempts`` tries without costing a PBKDF2 run
+each.  Concurrent requests each see a different count, and one that took an
+attempt past the limit gives it back, so a parallel burst cannot slip
+through.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[getattr(settings, 'LOGIN_RATE_LIMIT_CACHE_ALIAS', 'default')]
+
+
+def client_ip(request):
+    """The client address, skipping ``LOGIN_RATE_LIMIT_PROXIES`` trusted proxies."""
+    proxies = getattr(settings, 'LOGIN_RATE_LIMIT_PROXIES', 0)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        addresses = [address.strip() for address in forwarded.split(',')]
+        return addresses[-min(proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class SlidingWindowLimit:
+    def __init__(self, scope, attempts, window):
+        self.scope = scope
+        self.attempts = attempts
+        self.window = float(window)
+
+    def key(self, value, window):
+        digest = hashlib.sha256(value.encode()).hexdigest()[:32]
+        return f'login-rate:{self.scope}:{digest}:{window}'
+
+    def _increment(self, key):
+        cache = get_cache()
+        # Both windows' counters are read within twice the window length.
+        timeout = int(self.window * 2) + 1
+        cache.add(key, 0, timeout)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr().
+            cache.add(key, 1, timeout)
+            return 1
+
+    def _wait(self, value, count, window, elapsed):
+        previous = get_cache().get(self.key(value, window - 1), 0)
+        carried = previous * (1 - elapsed / self.window)
+        over = carried + count - self.attempts
+        if over <= 0:
+            return 0
+        if count <= self.attempts and over <= carried:
+            # The previous window's share fades out before this one ends.
+            return over * self.window / previous
+        return self.window - elapsed
+
+    def wait(self, value, now=None):
+        """Seconds until another attempt for ``value`` is allowed, without counting one."""
+        now = time.time() if now is None else now
+        window, elapsed = divmod(now, self.window)
+        count = get_cache().get(self.key(value, int(window)), 0) + 1
+        return self._wait(value, count, int(window), elapsed)
+
+    def take(self, value, now=None):
+        """Count an attempt for ``value``; returns 0, or the seconds until one is allowed."""
+        now = time.time() if now is None else now
+        window, elapsed = divmod(now, self.window)
+        key = self.key(value, int(window))
+        count = self._increment(key)
+        wait = self._wait(value, count, int(window), elapsed)
+        if wait:
+            # Refused: give the attempt back so retrying never extends the wait.
+            try:
+                get_cache().decr(key)
+            except ValueError:
+                pass
+        return wait
+
+
+def get_limits():
+    limits = getattr(settings, 'LOGIN_RATE_LIMITS', None) or {}
+    return {scope: SlidingWindowLimit(scope, **limit) for scope, limit in limits.items()}
+
+
+def _normalize(username):
+    return (username or '').strip().lower()
+
+
+def check_login_rate(request, username):
+    """
+    Count a login attempt against the client IP; returns 0 if it may go
+    ahead, otherwise the seconds the client should wait.
+
+    The username limit is only consulted here, before the IP is charged, so
+    an attempt it refuses is not counted anywhere; failures are counted by
+    ``record_failed_login`` once the password has been checked.
+    """
+    limits = get_limits()
+    username = _normalize(username)
+    if 'username' in limits and username:
+        wait = limits['username'].wait(username)
+        if wait:
+            return wait
+    ip = client_ip(request)
+    if 'ip' in limits and ip:
+        return limits['ip'].take(ip)
+    return 0
+
+
+def record_failed_login(username):
+    """Count a failed authentication against ``username``."""
+    limit = get_limits().get('username')
+    username = _normalize(username)
+    if limit and username:
+        limit.take(username)
@@ -0,0 +1,11 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
+from django.dispatch import receiver
+
+from .ratelimit import record_failed_login
+
+
+@receiver(user_login_failed)
+def count_failed_login(sender, credentials, request=None, **kwargs):
+    username = credentials.get(get_user_model().USERNAME_FIELD)
+    record_failed_login(username if isinstance(username, str) else None)
@@ -1,11 +1,29 @@
-﻿from django.test import TestCase, Client
+﻿import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase, Client, RequestFactory, override_settings
 from django.urls import reverse
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+
+from accounts.ratelimit import SlidingWindowLimit, client_ip
+
+TEST_LIMITS = {
+    'ip': {'attempts': 4, 'window': 240},
+    'username': {'attempts': 2, 'window': 120},
+}
 
 class TestAuthentication(TestCase):
     """Test authentication views."""
     
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.user = User.objects.create_user(
             username='testuser',
@@ -105,4 +123,136 @@ class TestUserProfile(TestCase):
         response = self.client.get(reverse('profile'))
         
         self.assertEqual(response.status_code, 200)
-        self.assertTemplateUsed(response, 'accounts/profile.html')
\ No newline at end of file
+        self.assertTemplateUsed(response, 'accounts/profile.html')
+
+
+@override_settings(LOGIN_RATE_LIMITS=TEST_LIMITS)
+class TestLoginRateLimit(TestCase):
+    """Test the login rate limits."""
+    
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = Client()
+        self.user = User.objects.create_user(username='limited', password='testpass123')
+    
+    def _login(self, username='limited', password='wrong', **extra):
+        return self.client.post(reverse('login'), {'username': username, 'password': password}, **extra)
+    
+    def test_username_limit_rejects_before_hashing(self):
+        """Test that attempts past the failure limit are refused without checking the password."""
+        self._login()
+        self._login()
+        with mock.patch('accounts.views.authenticate') as authenticate:
+            response = self._login(password='testpass123')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertContains(response, 'Too many login attempts', status_code=429)
+        authenticate.assert_not_called()
+    
+    def test_ip_limit_spans_usernames(self):
+        """Test that one address guessing many accounts runs out of attempts."""
+        statuses = [self._login(username=f'guess{index}').status_code for index in range(5)]
+        self.assertEqual(statuses, [200, 200, 200, 200, 429])
+        # Another address is unaffected.
+        response = self._login(password='testpass123', REMOTE_ADDR='10.0.0.2')
+        self.assertRedirects(response, reverse('home'))
+    
+    def test_window_slides(self):
+        """Test that attempts are allowed again as the window moves on."""
+        limit = SlidingWindowLimit('test', attempts=2, window=20)
+        self.assertEqual(limit.take('key', now=100), 0)
+        self.assertEqual(limit.take('key', now=100), 0)
+        self.assertEqual(limit.take('key', now=100), 20)
+        # Refused attempts are not recorded, so retrying does not push the wait out.
+        self.assertEqual(limit.take('key', now=105), 15)
+        # A quarter of the previous window has slid out: 1.5 of its 2 attempts still count.
+        self.assertEqual(limit.wait('key', now=125), 0.5 * 20 / 2)
+        self.assertEqual(limit.take('key', now=125), 0.5 * 20 / 2)
+        self.assertEqual(limit.take('key', now=130), 0)
+    
+    def test_concurrent_attempts_are_all_counted(self):
+        """Test that a parallel burst gets no more than the limit through."""
+        limit = SlidingWindowLimit('test', attempts=3, window=60)
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            waits = list(pool.map(lambda _: limit.take('burst', now=1000), range(10)))
+        self.assertEqual(waits.count(0), 3)
+    
+    def test_successful_logins_do_not_count_against_username(self):
+        """Test that only failed authentications use up an account's allowance."""
+        for _ in range(2):
+            response = self._login(password='testpass123')
+            self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+        self._login()
+        self.assertRedirects(self._login(password='testpass123'), reverse('home'), fetch_redirect_response=False)
+    
+    def test_refused_attempts_do_not_extend_lockout(self):
+        """Test that retrying while refused counts against neither the username nor the IP."""
+        self._login()
+        self._login()
+        for _ in range(5):
+            self.assertEqual(self._login(password='testpass123').status_code, 429)
+        # Only the two failures were charged to the address.
+        self.assertEqual(self._login(username='other').status_code, 200)
+        self.assertEqual(self._login(username='other2').status_code, 200)
+    
+    @override_settings(LOGIN_RATE_LIMIT_PROXIES=1)
+    def test_client_ip_behind_proxy(self):
+        """Test that the address added by the trusted proxy is used."""
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='1.2.3.4, 5.6.7.8')
+        self.assertEqual(client_ip(request), '5.6.7.8')
+
+
+class TestPasswordHasher(TestCase):
+    """Test the password hashing policy."""
+    
+    def _login(self, username):
+        response = Client().post(reverse('login'), {'username': username, 'password': 'testpass123'})
+        self.assertEqual(response.status_code, 302)
+        return User.objects.get(username=username).password
+    
+    def test_iteration_change_rehashes_on_login(self):
+        """Test that a hash with an old work factor is rewritten at login."""
+        User.objects.create_user(username='rehash', password='testpass123')
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1500):
+            self.assertTrue(self._login('rehash').startswith('pbkdf2_sha256$1500$'))
+    
+    def test_iteration_floor_check(self):
+        """Test that a work factor below the floor fails the system check."""
+        from accounts.checks import check_pbkdf2_iterations
+        from accounts.hashers import MIN_PBKDF2_ITERATIONS
+        
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            self.assertEqual([error.id for error in check_pbkdf2_iterations(None)], ['accounts.E001'])
+        for iterations in (0, MIN_PBKDF2_ITERATIONS):
+            with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+                self.assertEqual(check_pbkdf2_iterations(None), [])
+    
+    def test_other_algorithm_upgraded_on_login(self):
+        """Test that hashes from other configured hashers are upgraded."""
+        User.objects.create(username='legacy', password=make_password('testpass123', hasher='pbkdf2_sha1'))
+        self.assertTrue(self._login('legacy').startswith('pbkdf2_sha256$1000$'))
+
+
+class TestBenchmarkLogins(TestCase):
+    """Test the login benchmark command."""
+    
+    def test_reports_every_mix(self):
+        """Test that each mix runs with and without limits and nothing is kept."""
+        users = User.objects.count()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'logins.json')
+            call_command('benchmark_logins', requests=20, users=3, json_path=path, stdout=StringIO())
+            with open(path, encoding='utf-8') as results_file:
+                results = json.load(results_file)
+        
+        self.assertEqual([(result['mix'], result['limits']) for result in results], [
+            ('legitimate', 'on'), ('legitimate', 'off'),
+            ('stuffing', 'on'), ('stuffing', 'off'),
+            ('mixed', 'on'), ('mixed', 'off'),
+        ])
+        legitimate = results[0]
+        self.assertEqual((legitimate['requests'], legitimate['ok']), (20, 20))
+        self.assertEqual(results[2]['ok'], 0)
+        self.assertEqual(User.objects.count(), users)
+
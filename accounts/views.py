@@ -1,8 +1,12 @@
+import math
+
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+
 from .forms import CustomUserCreationForm, LoginForm
+from .ratelimit import check_login_rate
 
 def register_view(request):
     if request.method == 'POST':
@@ -22,6 +26,12 @@ def login_view(request):
         if form.is_valid():
             username = form.cleaned_data['username']
             password = form.cleaned_data['password']
+            wait = check_login_rate(request, username)
+            if wait:
+                messages.error(request, 'Too many login attempts. Please try again later.')
+                response = render(request, 'accounts/login.html', {'form': form}, status=429)
+                response['Retry-After'] = math.ceil(wait)
+                return response
             user = authenticate(request, username=username, password=password)
             if user is not None:
                 login(request, user)
@@ -40,7 +50,7 @@ def logout_view(request):
 
 @login_required
 def profile_view(request):
-    user_applications = request.user.applications.all()
+    user_applications = request.user.applications.select_related('job')
     return render(request, 'accounts/profile.html', {
         'applications': user_applications
     })
@@ -0,0 +1,118 @@
+"""
+JWT authentication with the token's user kept in a per-process cache.
+
+``JWTAuthentication`` loads the user row on every request.  The fields
+the permission checks and views read (id, username, is_staff,
+is_superuser, is_active) are kept in a bounded LRU cache keyed by user id.
+Each hit builds a fresh, partially loaded ``User`` from them, so other fields
+still load on access and no instance is shared between requests.
+
+Entries are dropped when the user is saved or deleted (deactivation is a
+save) and when one of their refresh tokens is blacklisted, if the blacklist
+app is installed.  Other processes, and writes that skip signals such as
+``QuerySet.update()``, are caught up by the TTL: ``JWT_USER_CACHE_TTL``
+seconds is the longest a revoked user can keep authenticating.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+CACHED_FIELDS = ('id', 'username', 'is_staff', 'is_superuser', 'is_active')
+
+
+class UserCache:
+    """Thread-safe LRU mapping with a time-to-live on every entry."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserCache(
+    maxsize=getattr(settings, 'JWT_USER_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'JWT_USER_CACHE_TTL', 60),
+)
+
+
+def forget_user(user_id):
+    """Drop a user from this process's cache, e.g. after revoking their tokens."""
+    user_cache.discard(str(user_id))
+
+
+def _cached_fields(model):
+    # Password hashes are only kept when tokens carry a revoke claim.
+    wanted = CACHED_FIELDS + ('password',) if api_settings.CHECK_REVOKE_TOKEN else CACHED_FIELDS
+    # Model.from_db() takes the values in the model's field order.
+    return tuple(field.attname for field in model._meta.concrete_fields if field.attname in wanted)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the token's user through ``user_cache``."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+        fields = _cached_fields(self.user_model)
+        values = user_cache.get(str(user_id))
+        if values is not None and len(values) == len(fields):
+            user = self.user_model.from_db(DEFAULT_DB_ALIAS, fields, values)
+        else:
+            try:
+                user = (self.user_model.objects.only(*fields)
+                        .get(**{api_settings.USER_ID_FIELD: user_id}))
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+            user_cache.set(str(user_id), tuple(getattr(user, field) for field in fields))
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        return user
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_RETENTION seconds.'
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyKey.objects.expired().delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'{deleted} expired idempotency key(s) deleted.'))
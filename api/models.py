@@ -1,3 +1,34 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+def expiry_cutoff():
+    """Keys created before this are past ``IDEMPOTENCY_KEY_RETENTION`` and no longer replayed."""
+    return timezone.now() - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_RETENTION', 86400))
+
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    def expired(self):
+        return self.filter(created_at__lt=expiry_cutoff())
+
 
-# Create your models here.
+class IdempotencyKey(models.Model):
+    """Response of a request sent with an ``Idempotency-Key`` header, for replay."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    path = models.CharField(max_length=255)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    objects = IdempotencyKeyQuerySet.as_manager()
+    
+    class Meta:
+        unique_together = ['user', 'key']
+    
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
@@ -0,0 +1,72 @@
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from jobs.pagination import (
+    InvalidCursor, get_page_size, get_sort_ordering, keyset_paginate, ranked_paginate, search_ordering,
+)
+from jobs import applicant_search
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on (created_at, id), on (rank, id) when the request
+    carries a ``?q=`` search query, or on (salary_max, id) with ``?sort=salary``.
+
+    The body stays a plain list so existing clients keep working; the link to
+    the next page is sent in a ``Link: <...>; rel="next"`` header.
+    """
+    cursor_query_param = 'cursor'
+    search_query_param = 'q'
+    page_size_query_param = 'page_size'
+    sort_query_param = 'sort'
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = request.query_params.get(self.cursor_query_param)
+        page_size = get_page_size(request.query_params.get(self.page_size_query_param))
+        query = request.query_params.get(self.search_query_param, '').strip()
+        ordering = self.get_sort_ordering(request)
+        try:
+            rows, self.next_cursor = self.paginate(queryset, query, cursor, page_size, ordering, view)
+        except InvalidCursor:
+            raise NotFound('Invalid cursor')
+        return rows
+
+    def paginate(self, queryset, query, cursor, page_size, ordering, view):
+        """``(rows, next_cursor)``; the search joins the index, so every match is a candidate."""
+        if query:
+            queryset, ordering = search_ordering(queryset, query, ordering)
+        return keyset_paginate(queryset, cursor=cursor, page_size=page_size, ordering=ordering or self.ordering)
+
+    def get_sort_ordering(self, request):
+        return get_sort_ordering(request.query_params.get(self.sort_query_param))
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor
+        )
+
+    def get_paginated_response(self, data):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers['Link'] = f'<{next_link}>; rel="next"'
+        return Response(data, headers=headers)
+
+
+class ApplicantPagination(KeysetPagination):
+    """Applications to one job, newest first or ranked by applicant search."""
+    ordering = ('-applied_at', '-id')
+
+    def get_sort_ordering(self, request):
+        return None
+
+    def paginate(self, queryset, query, cursor, page_size, ordering, view):
+        if query:
+            hits = applicant_search.search(view.kwargs['job_id'], query)
+            return ranked_paginate(queryset, hits, cursor=cursor, page_size=page_size)
+        return keyset_paginate(queryset, cursor=cursor, page_size=page_size, ordering=self.ordering)
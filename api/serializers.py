@@ -1,25 +1,31 @@
+from django.conf import settings
 from rest_framework import serializers
 from jobs.models import Job, JobApplication
+from .mixins import EagerLoadingMixin
 
-class JobSerializer(serializers.ModelSerializer):
+class JobSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     
     class Meta:
         model = Job
         fields = ['id', 'title', 'company', 'location', 'salary', 
+                 'salary_min', 'salary_max', 'salary_currency', 'salary_period',
                  'job_type', 'category_name', 'created_at']
+        select_related = ['category']
 
-class JobDetailSerializer(serializers.ModelSerializer):
+class JobDetailSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     posted_by_name = serializers.CharField(source='posted_by.username', read_only=True)
     
     class Meta:
         model = Job
         fields = ['id', 'title', 'company', 'location', 'description',
-                 'requirements', 'salary', 'job_type', 'category_name',
+                 'requirements', 'salary', 'salary_min', 'salary_max',
+                 'salary_currency', 'salary_period', 'job_type', 'category_name',
                  'posted_by_name', 'created_at']
+        select_related = ['category', 'posted_by']
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.title', read_only=True)
     company_name = serializers.CharField(source='job.company', read_only=True)
     
@@ -28,6 +34,21 @@ class ApplicationSerializer(serializers.ModelSerializer):
         fields = ['id', 'job', 'job_title', 'company_name', 'cover_letter',
                  'resume', 'applied_at', 'status']
         read_only_fields = ['applied_at', 'status']
+        select_related = ['job']
+
+class JobApplicantSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    applicant_username = serializers.CharField(source='applicant.username', read_only=True)
+    applicant_email = serializers.EmailField(source='applicant.email', read_only=True)
+    applicant_name = serializers.CharField(source='applicant.get_full_name', read_only=True)
+    # Relevance, only set when the list is searched with ?q=
+    score = serializers.FloatField(source='rank', read_only=True, default=None)
+    
+    class Meta:
+        model = JobApplication
+        fields = ['id', 'applicant_username', 'applicant_email', 'applicant_name',
+                 'cover_letter', 'resume', 'applied_at', 'status', 'score']
+        read_only_fields = fields
+        select_related = ['applicant']
 
 # ADD THIS NEW SERIALIZER
 class ApplicationCreateSerializer(serializers.ModelSerializer):
@@ -37,4 +58,30 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'cover_letter': {'required': True},
             'resume': {'required': True}
-        }        
\ No newline at end of file
+        }        
+
+class ApplicationStatusSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=JobApplication.APPLICATION_STATUS)
+
+class ApplicationStatusUpdateSerializer(serializers.Serializer):
+    """``{"ids": [...], "status": "..."}`` or ``{"updates": [{"id", "status"}, ...]}``."""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    status = serializers.ChoiceField(choices=JobApplication.APPLICATION_STATUS, required=False)
+    updates = ApplicationStatusSerializer(many=True, required=False)
+    
+    def validate(self, attrs):
+        statuses = {}
+        if 'ids' in attrs:
+            if 'status' not in attrs:
+                raise serializers.ValidationError({'status': 'Required with ids.'})
+            statuses.update(dict.fromkeys(attrs['ids'], attrs['status']))
+        for update in attrs.get('updates', []):
+            statuses[update['id']] = update['status']
+        if not statuses:
+            raise serializers.ValidationError('Pass ids with a status, or updates.')
+        limit = getattr(settings, 'APPLICATION_STATUS_BATCH_MAX', 5000)
+        if len(statuses) > limit:
+            raise serializers.ValidationError(f'At most {limit} applications per request.')
+        return {'statuses': statuses}
+
@@ -0,0 +1,26 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import forget_user
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_cached_user(sender, instance, **kwargs):
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    forget_user(user_id)
+    # A request between the write and the commit can cache the old row again.
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+if apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    @receiver(post_save, sender=BlacklistedToken)
+    def forget_blacklisted_user(sender, instance, created, **kwargs):
+        if created and instance.token.user_id is not None:
+            forget_user(getattr(instance.token.user, api_settings.USER_ID_FIELD))
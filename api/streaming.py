@@ -0,0 +1,122 @@
+"""
+Opt-in streaming for list endpoints.
+
+``?stream=1`` (a JSON array) or ``Accept: application/x-ndjson`` /
+``?stream=ndjson`` (one JSON object per line) skip pagination and send the
+whole filtered list as a ``StreamingHttpResponse``.  Rows are read with
+``.iterator(chunk_size=...)`` and serialized one at a time by a single
+serializer instance, so memory stays flat and the first bytes leave as soon
+as the first chunk of rows is fetched.
+
+Under ASGI Django reads a plain iterator completely with
+``sync_to_async(list)`` before sending anything, so ``stream_response``
+hands ASGI requests an async iterator that pulls one buffered chunk at a
+time in the request's thread.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON = 'application/x-ndjson'
+# Bytes buffered before a chunk is handed to the server
+FLUSH_SIZE = 16 * 1024
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Lets content negotiation accept NDJSON; non-streamed bodies become one line."""
+    media_type = NDJSON
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (_dumps(data) + '\n').encode()
+
+
+def _dumps(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+class StreamingListMixin:
+    """
+    Adds streaming to a ListAPIView.  ``stream_ordering`` must end in a
+    unique column; views may override ``get_stream_queryset``.
+    """
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    stream_query_param = 'stream'
+    stream_ordering = ('-id',)
+
+    def stream_format(self, request):
+        """'ndjson', 'json' or None when the client did not ask to stream."""
+        requested = request.query_params.get(self.stream_query_param, '').lower()
+        if requested == 'ndjson' or getattr(request, 'accepted_media_type', '').startswith(NDJSON):
+            return 'ndjson'
+        if requested in ('1', 'true', 'json'):
+            return 'json'
+        return None
+
+    def get_stream_queryset(self):
+        return self.filter_queryset(self.get_queryset()).order_by(*self.stream_ordering)
+
+    def list(self, request, *args, **kwargs):
+        fmt = self.stream_format(request)
+        if fmt is None:
+            return super().list(request, *args, **kwargs)
+        rows = self.stream_rows(self.get_stream_queryset())
+        chunks = _ndjson(rows) if fmt == 'ndjson' else _json_array(rows)
+        content_type = NDJSON if fmt == 'ndjson' else 'application/json'
+        return stream_response(request, chunks, content_type=content_type)
+
+    def stream_rows(self, queryset):
+        serializer = self.get_serializer()
+        chunk_size = getattr(settings, 'API_STREAM_CHUNK_SIZE', 2000)
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            yield serializer.to_representation(instance)
+
+
+def stream_response(request, chunks, **kwargs):
+    """A StreamingHttpResponse over text ``chunks`` that stays lazy under ASGI too."""
+    content = _buffered(chunks)
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        content = _aiterate(content)
+    return StreamingHttpResponse(content, **kwargs)
+
+
+async def _aiterate(chunks):
+    # The database cursor lives in the request's thread, as for any sync code.
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+def _ndjson(rows):
+    for row in rows:
+        yield _dumps(row) + '\n'
+
+
+def _json_array(rows):
+    yield '['
+    separator = ''
+    for row in rows:
+        yield separator + _dumps(row)
+        separator = ',\n'
+    yield ']\n'
+
+
+def _buffered(chunks):
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= FLUSH_SIZE:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
@@ -1,15 +1,26 @@
-﻿import json
+﻿import asyncio
+import json
+from unittest import mock
+from asgiref.sync import sync_to_async
 from rest_framework.test import APITestCase, APIClient
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
 from rest_framework import status
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.db import connection
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
+from jobs import events
 from jobs.models import Job, JobCategory, JobApplication
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.authentication import UserCache, user_cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 class TestJobAPI(APITestCase):
     """Test Job API endpoints."""
     
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         
         # Create users
@@ -179,4 +190,1013 @@ class TestJobAPI(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['job_title'], self.job1.title)
\ No newline at end of file
+        self.assertEqual(response.data[0]['job_title'], self.job1.title)
+
+class TestJobListPagination(APITestCase):
+    """Test cursor pagination of the job list API."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            username='pager',
+            email='pager@test.com',
+            password='testpass123'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                Job.objects.create(
+                    title=f'Paged Job {i}',
+                    company='Paging Corp',
+                    location='Remote',
+                    description='Description',
+                    requirements='Requirements',
+                    job_type='remote',
+                    posted_by=self.employer,
+                    is_active=True
+                )
+    
+    def test_next_link_header(self):
+        """Test that a full page advertises the next page in the Link header."""
+        response = self.client.get(reverse('api_jobs'), {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertIn('rel="next"', response['Link'])
+        
+        next_url = response['Link'].split(';')[0].strip('<>')
+        response = self.client.get(next_url)
+        self.assertEqual(len(response.data), 1)
+        self.assertFalse(response.has_header('Link'))
+    
+    def test_invalid_cursor(self):
+        """Test that a garbage cursor returns 404."""
+        response = self.client.get(reverse('api_jobs'), {'cursor': '!!!'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_search_query(self):
+        """Test that ?q= filters the API list by relevance."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.create(
+                title='Kubernetes Engineer',
+                company='Cluster Inc',
+                location='Remote',
+                description='Operate clusters',
+                requirements='Kubernetes',
+                job_type='remote',
+                posted_by=self.employer,
+                is_active=True
+            )
+        response = self.client.get(reverse('api_jobs'), {'q': 'kubernetes'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['title'] for job in response.data], ['Kubernetes Engineer'])
+    
+    def test_facet_filters_and_counts(self):
+        """Test API facet filters and the facet counts endpoint."""
+        category = JobCategory.objects.create(name='Ops')
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.create(
+                title='SRE',
+                company='Cluster Inc',
+                location='Berlin',
+                description='Operate clusters',
+                requirements='Linux',
+                job_type='contract',
+                category=category,
+                posted_by=self.employer,
+                is_active=True
+            )
+        response = self.client.get(reverse('api_jobs'), {'job_type': 'contract'})
+        self.assertEqual([job['title'] for job in response.data], ['SRE'])
+        
+        response = self.client.get(reverse('api_job_facets'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn({'value': 'Berlin', 'label': 'Berlin', 'count': 1}, response.data['location'])
+        self.assertIn({'value': 'remote', 'label': 'Remote', 'count': 3}, response.data['job_type'])
+        
+        response = self.client.get(reverse('api_job_facets'), {'q': 'clusters'})
+        self.assertEqual(response.data['job_type'], [{'value': 'contract', 'label': 'Contract', 'count': 1}])
+
+
+class TestAPIQueryCounts(APITestCase):
+    """Test that API query counts do not grow with the result size."""
+    
+    # Upper bound per endpoint, independent of the number of rows returned
+    # (the list and detail views also read their ETag validators).
+    MAX_QUERIES = {
+        'api_jobs': 2,
+        'api_job_detail': 2,
+        'api_my_applications': 1,
+    }
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='counter',
+            email='counter@test.com',
+            password='testpass123'
+        )
+        self.employer = User.objects.create_user(
+            username='counting_employer',
+            email='counting@test.com',
+            password='testpass123'
+        )
+        self.category = JobCategory.objects.create(name='Counting')
+        self.client.force_authenticate(self.user)
+        cache.clear()
+    
+    def _add_jobs(self, count):
+        for i in range(count):
+            job = Job.objects.create(
+                title=f'Counted Job {i}',
+                company='Count Corp',
+                location='Remote',
+                description='Description',
+                requirements='Requirements',
+                job_type='remote',
+                category=self.category,
+                posted_by=self.employer,
+                is_active=True
+            )
+            JobApplication.objects.create(
+                job=job,
+                applicant=self.user,
+                cover_letter='Hello',
+                resume='resume.pdf'
+            )
+        return job
+    
+    def _assert_capped(self, name, *args):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name, args=args))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(
+            len(queries), self.MAX_QUERIES[name],
+            '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+    
+    def test_query_counts_are_constant(self):
+        """Test each endpoint stays under its cap at several result sizes."""
+        for batch in (1, 10):
+            job = self._add_jobs(batch)
+            self._assert_capped('api_jobs')
+            self._assert_capped('api_job_detail', job.id)
+            self._assert_capped('api_my_applications')
+
+
+class TestApplyIdempotency(APITestCase):
+    """Test Idempotency-Key handling on the apply endpoint."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='retrier',
+            email='retrier@test.com',
+            password='testpass123'
+        )
+        self.job = Job.objects.create(
+            title='Idempotent Job',
+            company='Retry Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.user,
+            is_active=True
+        )
+        self.client.force_authenticate(self.user)
+    
+    def _apply(self, key):
+        return self.client.post(
+            reverse('api_apply_job', args=[self.job.id]),
+            {'cover_letter': 'Hello', 'resume': SimpleUploadedFile('resume.pdf', b'content')},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY=key
+        )
+    
+    def test_oversized_resume_returns_413(self):
+        """Test that a resume over RESUME_UPLOAD_MAX_SIZE is refused with 413."""
+        with self.settings(RESUME_UPLOAD_MAX_SIZE=16):
+            response = self.client.post(
+                reverse('api_apply_job', args=[self.job.id]),
+                {'cover_letter': 'Hello', 'resume': SimpleUploadedFile('resume.pdf', b'x' * 64)},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(JobApplication.objects.exists())
+    
+    def test_retry_replays_first_response(self):
+        """Test that a retried request returns the original 201 without a new insert."""
+        first = self._apply('retry-1')
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        
+        with self.assertNumQueries(1):
+            second = self._apply('retry-1')
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), 1)
+    
+    def test_new_key_is_a_new_attempt(self):
+        """Test that a different key still hits the already-applied check."""
+        self._apply('retry-1')
+        response = self._apply('retry-2')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'You have already applied for this job')
+    
+    def test_key_reused_for_another_job_is_refused(self):
+        """Test that a key replays only for the request it was first sent with."""
+        self._apply('retry-1')
+        other = Job.objects.create(
+            title='Other Job', company='Retry Corp', location='Remote',
+            description='Description', requirements='Requirements',
+            job_type='remote', posted_by=self.user, is_active=True
+        )
+        response = self.client.post(
+            reverse('api_apply_job', args=[other.id]),
+            {'cover_letter': 'Hello', 'resume': SimpleUploadedFile('resume.pdf', b'content')},
+            format='multipart',
+            HTTP_IDEMPOTENCY_KEY='retry-1'
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(JobApplication.objects.filter(job=other).exists())
+    
+    def _race(self, key, path):
+        """Store ``key`` as a concurrent request would, between the replay check and the insert."""
+        from api.models import IdempotencyKey
+        
+        def store_key(request):
+            IdempotencyKey.objects.create(user=self.user, key=key, path=path, status_code=201, response={'id': 42})
+            return False
+        return mock.patch('api.views.upload_too_large', side_effect=store_key)
+    
+    def _key_insert_fails(self):
+        """Make the key insert lose the unique race without leaving a row behind."""
+        from django.db import IntegrityError
+        
+        return mock.patch('api.views.IdempotencyKey.objects.create', side_effect=IntegrityError)
+    
+    def test_key_insert_race_replays_winner(self):
+        """Test that losing the key insert to the same request replays its response."""
+        with self._race('race', reverse('api_apply_job', args=[self.job.id])):
+            response = self._apply('race')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'id': 42})
+        self.assertEqual(response['Idempotent-Replayed'], 'true')
+        self.assertFalse(JobApplication.objects.exists())
+    
+    def test_key_insert_race_for_another_job_is_refused(self):
+        """Test that losing the key insert to a request for another job returns 422."""
+        with self._race('race', '/api/jobs/0/apply/'):
+            response = self._apply('race')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(JobApplication.objects.exists())
+    
+    def test_key_insert_race_without_replay_conflicts(self):
+        """Test that a failed key insert with nothing to replay returns 409, not 500."""
+        with self._key_insert_fails():
+            response = self._apply('race')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(JobApplication.objects.exists())
+    
+    def test_expired_keys_are_not_replayed_and_purged(self):
+        """Test that keys past IDEMPOTENCY_KEY_RETENTION are dropped."""
+        from io import StringIO
+        from django.core.management import call_command
+        from api.models import IdempotencyKey
+        
+        self._apply('retry-1')
+        self._apply('retry-2')
+        with self.settings(IDEMPOTENCY_KEY_RETENTION=-1):
+            response = self._apply('retry-1')
+            self.assertEqual(response.data['error'], 'You have already applied for this job')
+            self.assertEqual(IdempotencyKey.objects.count(), 0)
+            
+            IdempotencyKey.objects.create(user=self.user, key='old', path='/', status_code=201, response={})
+            out = StringIO()
+            call_command('purge_idempotency_keys', stdout=out)
+        self.assertIn('1 expired', out.getvalue())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
+class TestConcurrentApply(TransactionTestCase):
+    """Test that parallel applications for the same job cannot both succeed."""
+    
+    PARALLEL = 8
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='racer',
+            email='racer@test.com',
+            password='testpass123'
+        )
+        self.job = Job.objects.create(
+            title='Contended Job',
+            company='Race Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.user,
+            is_active=True
+        )
+    
+    def _apply(self, barrier):
+        from django.db import connections
+        try:
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            return client.post(
+                reverse('api_apply_job', args=[self.job.id]),
+                {'cover_letter': 'Me first', 'resume': SimpleUploadedFile('resume.pdf', b'content')},
+                format='multipart'
+            ).status_code
+        finally:
+            connections.close_all()
+    
+    def test_exactly_one_parallel_apply_succeeds(self):
+        """Test N parallel applies produce one 201 and N-1 'already applied' responses."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
+        barrier = threading.Barrier(self.PARALLEL)
+        with ThreadPoolExecutor(max_workers=self.PARALLEL) as pool:
+            codes = list(pool.map(lambda _: self._apply(barrier), range(self.PARALLEL)))
+        
+        self.assertEqual(sorted(codes), [201] + [400] * (self.PARALLEL - 1))
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), 1)
+
+
+class TestJobApplicationsAPI(APITestCase):
+    """Test the employer applications endpoint and its applicant search."""
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        
+        self.client = APIClient()
+        self.employer = User.objects.create_user(username='employer', password='testpass123')
+        self.job = Job.objects.create(
+            title='Search Job',
+            company='Search Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.employer,
+            is_active=True
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            for username, resume in [('kube', b'kubernetes helm'), ('java', b'java spring')]:
+                JobApplication.objects.create(
+                    job=self.job,
+                    applicant=User.objects.create_user(username=username, password='testpass123'),
+                    cover_letter='Hello',
+                    resume=SimpleUploadedFile('cv.txt', resume)
+                )
+        self.url = reverse('api_job_applications', args=[self.job.id])
+    
+    def test_owner_lists_applications(self):
+        """Test the job owner gets every application, newest first."""
+        self.client.force_authenticate(self.employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['applicant_username'] for row in response.data], ['java', 'kube'])
+    
+    def test_query_ranks_matches_with_score(self):
+        """Test ?q= returns only matching applicants with their score."""
+        self.client.force_authenticate(self.employer)
+        response = self.client.get(self.url, {'q': 'kubernetes'})
+        self.assertEqual([row['applicant_username'] for row in response.data], ['kube'])
+        self.assertGreater(response.data[0]['score'], 0)
+    
+    def test_other_users_get_404(self):
+        """Test applications are hidden from anyone but the job owner."""
+        self.client.force_authenticate(User.objects.get(username='java'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TestJobListSalary(APITestCase):
+    """Test salary fields, filters and sort on the job list API."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        user = User.objects.create_user(username='poster', password='testpass123')
+        for index, salary in enumerate(['$40,000', '$100,000', '$70,000', 'DOE', '$55/hour']):
+            Job.objects.create(
+                title=f'Job {index}',
+                company='Pay Corp',
+                location='Remote',
+                description='Description',
+                requirements='Requirements',
+                salary=salary,
+                job_type='remote',
+                posted_by=user,
+                is_active=True
+            )
+    
+    def test_sort_by_salary_pages_with_cursor(self):
+        """Test ?sort=salary walks the parsed salaries highest first across pages."""
+        url = reverse('api_jobs')
+        first = self.client.get(url, {'sort': 'salary', 'page_size': 2})
+        self.assertEqual([job['salary_max'] for job in first.data], [114400, 100000])
+        next_url = first['Link'].split(';')[0].strip('<>')
+        second = self.client.get(next_url)
+        self.assertEqual([job['salary_max'] for job in second.data], [70000, 40000])
+        self.assertNotIn('Link', second)
+    
+    def test_salary_min_filter(self):
+        """Test ?salary_min= keeps jobs whose range reaches the amount."""
+        response = self.client.get(reverse('api_jobs'), {'salary_min': 70000})
+        self.assertEqual({job['salary'] for job in response.data}, {'$100,000', '$70,000', '$55/hour'})
+
+
+class TestJobImportExportAPI(APITestCase):
+    """Test the admin-only bulk import and export endpoints."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', is_staff=True)
+        self.user = User.objects.create_user(username='user', password='testpass123')
+    
+    def _upload(self, content, name='jobs.csv', **params):
+        url = reverse('api_job_import')
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.post(url, {'file': SimpleUploadedFile(name, content.encode())}, format='multipart')
+    
+    def test_import_requires_staff(self):
+        """Test regular users cannot import."""
+        self.client.force_authenticate(self.user)
+        response = self._upload('title\n')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_import_reports_counts_and_errors(self):
+        """Test the import response carries counts and per-row errors."""
+        self.client.force_authenticate(self.admin)
+        response = self._upload(
+            'title,company,location,description,requirements,job_type\n'
+            'Dev,Acme,Remote,d,r,remote\n'
+            'Bad,Acme,Remote,d,r,nope\n'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['rejected']), (1, 1))
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+        self.assertEqual(Job.objects.get().posted_by, self.admin)
+    
+    def test_export_streams_own_jobs(self):
+        """Test the export streams only the caller's jobs as CSV."""
+        for owner in (self.admin, self.user):
+            Job.objects.create(title=f'{owner.username} job', company='C', location='L', description='d',
+                               requirements='r', job_type='remote', posted_by=owner)
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('api_job_export'))
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('id,title,'))
+        self.assertEqual(len(lines), 2)
+        self.assertIn('admin job', lines[1])
+
+
+class TestStreamingLists(APITestCase):
+    """Test ?stream=1 and NDJSON streaming of list endpoints."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='streamer', password='testpass123')
+        category = JobCategory.objects.create(name='Technology')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jobs = [
+                Job.objects.create(
+                    title=f'Stream Job {index}',
+                    company='Stream Corp',
+                    location='Remote',
+                    description='Description',
+                    requirements='Requirements',
+                    job_type='remote',
+                    category=category,
+                    posted_by=self.user,
+                    is_active=True
+                )
+                for index in range(5)
+            ]
+    
+    def _content(self, response):
+        return b''.join(response.streaming_content).decode()
+    
+    def test_stream_json_array_has_every_job(self):
+        """Test ?stream=1 returns the full list as one JSON array, newest first."""
+        import json
+        
+        response = self.client.get(reverse('api_jobs'), {'stream': '1', 'page_size': 2})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        rows = json.loads(self._content(response))
+        self.assertEqual([row['id'] for row in rows], [job.id for job in reversed(self.jobs)])
+        self.assertEqual(rows[0]['category_name'], 'Technology')
+    
+    def test_ndjson_accept_header(self):
+        """Test Accept: application/x-ndjson streams one object per line."""
+        import json
+        
+        response = self.client.get(reverse('api_jobs'), {'job_type': 'remote'}, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self._content(response).splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['title'], 'Stream Job 4')
+    
+    @override_settings(SEARCH_MAX_RESULTS=2)
+    def test_search_stream_keeps_rank_order(self):
+        """Test ?q= streams every match, best first, whatever SEARCH_MAX_RESULTS says."""
+        import json
+        
+        Job.objects.filter(pk=self.jobs[0].pk).update(title='Stream Stream Stream')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jobs[0].refresh_from_db()
+            self.jobs[0].save()
+        response = self.client.get(reverse('api_jobs'), {'stream': 'ndjson', 'q': 'stream'})
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['id'], self.jobs[0].id)
+    
+    def test_stream_query_count_is_constant(self):
+        """Test streaming runs one query for the rows, with the category joined."""
+        response = self.client.get(reverse('api_jobs'), {'stream': 'ndjson'})
+        with CaptureQueriesContext(connection) as queries:
+            self._content(response)
+        self.assertEqual(len(queries), 1)
+    
+    def test_my_applications_stream(self):
+        """Test the applications list streams for the current user only."""
+        import json
+        
+        for job in self.jobs[:2]:
+            JobApplication.objects.create(job=job, applicant=self.user, cover_letter='Hi', resume='resume.pdf')
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse('api_my_applications'), {'stream': 'ndjson'})
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([row['job'] for row in rows], [self.jobs[1].id, self.jobs[0].id])
+
+
+class TestSparseFieldsets(APITestCase):
+    """Test ?fields= trimming the output and the columns selected."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='sparse', password='testpass123')
+        category = JobCategory.objects.create(name='Technology')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Sparse Job {index}',
+                company='Sparse Corp',
+                location='Remote',
+                description='Long description',
+                requirements='Long requirements',
+                job_type='remote',
+                category=category,
+                posted_by=self.user,
+                is_active=True
+            )
+            for index in range(3)
+        ]
+    
+    def _job_queries(self, queries):
+        return [query['sql'] for query in queries if 'FROM "jobs_job"' in query['sql']]
+    
+    def test_list_fields_trim_output_and_columns(self):
+        """Test only the requested fields are returned and selected."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api_jobs'), {'fields': 'id,title', 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([set(row) for row in response.data], [{'id', 'title'}] * 2)
+        sql = self._job_queries(queries.captured_queries)[-1]
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('JOIN', sql)
+        
+        next_url = response['Link'].split(';')[0].strip('<>')
+        second = self.client.get(next_url)
+        self.assertEqual([row['title'] for row in second.data], ['Sparse Job 0'])
+    
+    def test_related_field_joins_only_what_it_reads(self):
+        """Test a related source is fetched through a join of just that column."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api_jobs'), {'fields': 'title,category_name'})
+        self.assertEqual(response.data[0], {'title': 'Sparse Job 2', 'category_name': 'Technology'})
+        sql = self._job_queries(queries.captured_queries)[-1]
+        self.assertIn('JOIN "jobs_jobcategory"', sql)
+        self.assertNotIn('"requirements"', sql)
+    
+    def test_detail_fields(self):
+        """Test the detail endpoint skips the large text columns when not asked for."""
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api_job_detail', args=[self.jobs[0].id]), {'fields': 'title,company'})
+        self.assertEqual(response.data, {'title': 'Sparse Job 0', 'company': 'Sparse Corp'})
+        for sql in self._job_queries(queries.captured_queries):
+            self.assertNotIn('"description"', sql)
+    
+    def test_my_applications_fields(self):
+        """Test sparse fieldsets on the applications list."""
+        JobApplication.objects.create(job=self.jobs[0], applicant=self.user, cover_letter='Hi', resume='resume.pdf')
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api_my_applications'), {'fields': 'job_title,status'})
+        self.assertEqual(response.data, [{'job_title': 'Sparse Job 0', 'status': 'pending'}])
+        sql = queries.captured_queries[-1]['sql']
+        self.assertNotIn('"cover_letter"', sql)
+        self.assertNotIn('"description"', sql)
+    
+    def test_unknown_field_is_rejected(self):
+        """Test a typo in ?fields= is a 400, not an empty object."""
+        response = self.client.get(reverse('api_jobs'), {'fields': 'title,salery'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('salery', str(response.data))
+
+
+class TestJobBatchAPI(APITestCase):
+    """Test fetching many jobs by id in one request."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='batch', password='testpass123')
+        category = JobCategory.objects.create(name='Technology')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Batch Job {index}',
+                company='Batch Corp',
+                location='Remote',
+                description='Description',
+                requirements='Requirements',
+                job_type='remote',
+                category=category,
+                posted_by=self.user,
+                is_active=index != 2
+            )
+            for index in range(4)
+        ]
+    
+    def test_requires_authentication(self):
+        """Test the batch endpoint has the same auth as the detail endpoint."""
+        response = self.client.get(reverse('api_job_batch'), {'ids': self.jobs[0].id})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_preserves_order_and_reports_missing(self):
+        """Test results follow the requested order and inactive and missing ids are listed apart."""
+        self.client.force_authenticate(self.user)
+        ids = [self.jobs[3].id, self.jobs[2].id, 999999, self.jobs[0].id, self.jobs[3].id]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api_job_batch'), {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['id'] for job in response.data['results']], [self.jobs[3].id, self.jobs[0].id])
+        self.assertEqual(response.data['inactive'], [self.jobs[2].id])
+        self.assertEqual(response.data['missing'], [999999])
+        self.assertEqual(response.data['results'][0]['category_name'], 'Technology')
+        self.assertEqual(len(queries), 1)
+    
+    def test_rejects_bad_or_too_many_ids(self):
+        """Test malformed, empty and oversized id lists are a 400."""
+        self.client.force_authenticate(self.user)
+        url = reverse('api_job_batch')
+        self.assertEqual(self.client.get(url, {'ids': '1,abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(JOB_BATCH_MAX_IDS=2):
+            response = self.client.get(url, {'ids': '1,2,3'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestApplicationStatusAPI(APITestCase):
+    """Test the bulk application status endpoint."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.employer = User.objects.create_user(username='owner', password='testpass123')
+        self.stranger = User.objects.create_user(username='stranger', password='testpass123')
+        self.job = Job.objects.create(
+            title='Owned Job', company='Owner Corp', location='Remote',
+            description='Description', requirements='Requirements',
+            job_type='remote', posted_by=self.employer, is_active=True
+        )
+        self.applications = [
+            JobApplication.objects.create(
+                job=self.job,
+                applicant=User.objects.create_user(username=f'seeker{i}', password='testpass123'),
+                cover_letter='Hello',
+                resume='resume.pdf'
+            )
+            for i in range(3)
+        ]
+    
+    def test_owner_updates_statuses(self):
+        """Test ids+status and per-row updates in one request."""
+        self.client.force_authenticate(self.employer)
+        first, second, third = [application.id for application in self.applications]
+        response = self.client.post(reverse('api_application_status'), {
+            'ids': [first, second],
+            'status': 'reviewed',
+            'updates': [{'id': second, 'status': 'accepted'}, {'id': 999999, 'status': 'rejected'}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(response.data['updated']), [first, second])
+        self.assertEqual(response.data['missing'], [999999])
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.pending_count, self.job.reviewed_count, self.job.accepted_count), (1, 1, 1))
+    
+    def test_other_users_cannot_change_statuses(self):
+        """Test applications to someone else's job are reported as missing."""
+        self.client.force_authenticate(self.stranger)
+        response = self.client.post(reverse('api_application_status'), {
+            'ids': [self.applications[0].id], 'status': 'rejected',
+        }, format='json')
+        self.assertEqual(response.data['missing'], [self.applications[0].id])
+        self.assertFalse(JobApplication.objects.filter(status='rejected').exists())
+    
+    def test_invalid_payload(self):
+        """Test a bad status or an empty request is a 400."""
+        self.client.force_authenticate(self.employer)
+        url = reverse('api_application_status')
+        self.assertEqual(self.client.post(url, {'ids': [1], 'status': 'hired'}, format='json').status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, {}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestApplicationEvents(TestCase):
+    """Test the Server-Sent Events stream of application status changes."""
+    
+    def setUp(self):
+        self.applicant = User.objects.create_user(username='listener', password='testpass123')
+        employer = User.objects.create_user(username='hirer', password='testpass123')
+        job = Job.objects.create(
+            title='Live Job', company='Live Corp', location='Remote',
+            description='Description', requirements='Requirements',
+            job_type='remote', posted_by=employer, is_active=True
+        )
+        self.application = JobApplication.objects.create(
+            job=job, applicant=self.applicant, cover_letter='Hello', resume='resume.pdf'
+        )
+        self.url = reverse('api_application_events')
+    
+    def _change_status(self, value):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.application.status = value
+            self.application.save()
+    
+    async def test_pushes_status_changes(self):
+        """Test the stream sends a snapshot and then each status change."""
+        client = AsyncClient()
+        await client.aforce_login(self.applicant)
+        response = await client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = response.streaming_content
+        self.assertTrue((await anext(content)).startswith(b'retry:'))
+        snapshot = await anext(content)
+        self.assertIn(b'event: snapshot', snapshot)
+        self.assertIn(b'"status": "pending"', snapshot)
+        
+        await sync_to_async(self._change_status)('accepted')
+        event = await asyncio.wait_for(anext(content), 5)
+        self.assertIn(b'event: status', event)
+        self.assertIn(f'"id": {self.application.id}'.encode(), event)
+        self.assertIn(b'"status": "accepted"', event)
+        
+        # A client disconnect cancels the task reading the stream.
+        pending = asyncio.ensure_future(anext(content))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertNotIn(events.channel_for(self.applicant.pk), events.get_broker()._subscribers)
+    
+    async def test_accepts_jwt_and_rejects_anonymous(self):
+        """Test bearer tokens authenticate the stream and anonymous users get 401."""
+        client = AsyncClient()
+        response = await client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.applicant).access_token))()
+        response = await client.get(self.url, headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+    
+    def test_wsgi_sends_snapshot_only(self):
+        """Test a sync worker ends the stream after the snapshot instead of blocking."""
+        self.client.force_login(self.applicant)
+        response = self.client.get(self.url)
+        self.assertFalse(response.streaming)
+        body = response.content.decode()
+        self.assertIn('event: snapshot', body)
+        self.assertIn(f'"id": {self.application.id}', body)
+    
+    def test_in_process_broker_warned_with_several_workers(self):
+        """Test the system check warns about the in-process broker behind several web workers."""
+        from jobs.checks import check_events_broker
+        with override_settings(EVENTS_BROKER='jobs.events.InProcessBroker', WEB_CONCURRENCY=2):
+            self.assertEqual([error.id for error in check_events_broker(None)], ['jobs.W001'])
+        with override_settings(EVENTS_BROKER='jobs.events.InProcessBroker', WEB_CONCURRENCY=1):
+            self.assertEqual(check_events_broker(None), [])
+        with override_settings(EVENTS_BROKER='jobs.events.RedisBroker', WEB_CONCURRENCY=2):
+            self.assertEqual(check_events_broker(None), [])
+
+
+@override_settings(ROOT_URLCONF='jobportal.urls_async')
+class TestAsyncJobAPI(TestCase):
+    """Test the async job list and detail API against the DRF views."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='asyncapi', password='testpass123')
+        category = JobCategory.objects.create(name='Technology')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Async API Job {index}', company='Loop Corp', location='Remote',
+                description='Description', requirements='Requirements', salary=f'${50 + index * 10}k',
+                job_type='remote', category=category, posted_by=self.user, is_active=True
+            )
+            for index in range(3)
+        ]
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+    
+    def _sync_get(self, path, **kwargs):
+        cache.clear()
+        with override_settings(ROOT_URLCONF='jobportal.urls'):
+            return self.client.get(path, **kwargs)
+    
+    async def test_list_matches_drf_view(self):
+        """Test pages, cursors, sorting and ?fields= match the sync API."""
+        client = AsyncClient()
+        url = reverse('api_jobs')
+        for query in ('page_size=2', 'sort=salary&page_size=2', 'fields=id,title', 'q=async'):
+            response = await client.get(f'{url}?{query}')
+            expected = await sync_to_async(self._sync_get)(f'{url}?{query}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.content), expected.json(), query)
+            self.assertEqual(response.get('Link'), expected.get('Link'), query)
+        
+        next_url = (await client.get(url, {'page_size': 2}))['Link'].split(';')[0].strip('<>')
+        response = await client.get(next_url)
+        self.assertEqual([job['title'] for job in json.loads(response.content)], ['Async API Job 0'])
+        self.assertEqual((await client.get(url, {'fields': 'nope'})).status_code, 400)
+        self.assertEqual((await client.get(url, {'cursor': 'bogus'})).status_code, 404)
+    
+    async def test_list_delegates_other_formats(self):
+        """Test the browsable API still comes from the DRF view."""
+        response = await AsyncClient().get(reverse('api_jobs'), headers={'Accept': 'text/html'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('text/html', response['Content-Type'])
+    
+    async def test_stream_is_read_lazily(self):
+        """Test ?stream=ndjson hands ASGI an async iterator that fetches chunk by chunk."""
+        with mock.patch('api.streaming.FLUSH_SIZE', 1):
+            response = await AsyncClient().get(reverse('api_jobs'), {'stream': 'ndjson'})
+            self.assertTrue(response.is_async)
+            first = json.loads(await anext(response.streaming_content))
+            self.assertEqual(first['id'], self.jobs[-1].id)
+            rest = [json.loads(line) async for line in response.streaming_content]
+        self.assertEqual([row['id'] for row in rest], [job.id for job in reversed(self.jobs[:-1])])
+    
+    async def test_export_is_read_lazily(self):
+        """Test the job export also streams through an async iterator under ASGI."""
+        self.user.is_staff = True
+        await self.user.asave(update_fields=['is_staff'])
+        response = await AsyncClient().get(reverse('api_job_export'), {'type': 'jsonl'},
+                                           headers={'Authorization': f'Bearer {self.token}'})
+        self.assertTrue(response.is_async)
+        lines = b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [job.id for job in self.jobs])
+    
+    async def test_detail_requires_jwt(self):
+        """Test the async detail endpoint authenticates like JobDetailAPI."""
+        client = AsyncClient()
+        url = reverse('api_job_detail', args=[self.jobs[0].id])
+        response = await client.get(url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+        self.assertEqual((await client.get(url, headers={'Authorization': 'Bearer bad'})).status_code, 401)
+        
+        headers = {'Authorization': f'Bearer {self.token}'}
+        response = await client.get(url, headers=headers)
+        not_modified = await client.get(url, headers={**headers, 'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+        
+        expected = await sync_to_async(self._sync_get)(url, HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(json.loads(response.content), expected.json())
+        missing = await client.get(reverse('api_job_detail', args=[999999]), headers=headers)
+        self.assertEqual(missing.status_code, 404)
+
+
+class TestCachedJWTAuthentication(APITestCase):
+    """Test that JWT requests reuse the resolved user until it changes."""
+    
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='cached', password='testpass123')
+        self.job = Job.objects.create(
+            title='Cached Job', company='Cache Corp', location='Remote',
+            description='Description', requirements='Requirements',
+            job_type='remote', posted_by=self.user, is_active=True
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.url = reverse('api_job_detail', args=[self.job.id])
+    
+    def _user_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        return response, [query for query in queries.captured_queries if 'FROM "auth_user"' in query['sql']]
+    
+    def test_second_request_skips_user_lookup(self):
+        """Test that only the first authenticated call reads the user row."""
+        response, lookups = self._user_queries(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(lookups), 1)
+        self.assertNotIn('"email"', lookups[0]['sql'])
+        
+        for path in (self.url, reverse('api_my_applications')):
+            response, lookups = self._user_queries(path)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(lookups, [])
+    
+    def test_cached_user_keeps_its_fields(self):
+        """Test that a user rebuilt from the cache has the same field values."""
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        export = reverse('api_job_export')
+        self.assertEqual(self.client.get(export).status_code, status.HTTP_200_OK)
+        response, lookups = self._user_queries(export)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(lookups, [])
+        self.assertIn('Cached Job', b''.join(response.streaming_content).decode())
+    
+    def test_deactivation_is_seen_immediately(self):
+        """Test that saving the user evicts it from the cache."""
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_entry_cached_before_commit_is_evicted(self):
+        """Test that a row cached again while the deactivation is uncommitted is dropped on commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            # A concurrent request that still sees the committed, active row.
+            user_cache.set(str(self.user.pk), ('stale',))
+        self.assertIsNone(user_cache.get(str(self.user.pk)))
+    
+    def test_ttl_bounds_revocation_without_signals(self):
+        """Test that a write bypassing signals is picked up once the entry expires."""
+        self.client.get(self.url)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        
+        ttl = user_cache.ttl
+        user_cache.ttl = 0
+        self.addCleanup(setattr, user_cache, 'ttl', ttl)
+        user_cache.clear()
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_cache_is_bounded(self):
+        """Test that the least recently used entry is dropped first."""
+        bounded = UserCache(maxsize=2, ttl=60)
+        bounded.set('a', 1)
+        bounded.set('b', 2)
+        bounded.get('a')
+        bounded.set('c', 3)
+        self.assertEqual((bounded.get('a'), bounded.get('b'), bounded.get('c')), (1, None, 3))
+
+
+@override_settings(LOGIN_RATE_LIMITS={'ip': {'attempts': 10, 'window': 600}, 'username': {'attempts': 2, 'window': 120}})
+class TestTokenRateLimit(APITestCase):
+    """Test that /api/token/ is rate limited before credentials are checked."""
+    
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        User.objects.create_user(username='tokenuser', password='testpass123')
+    
+    def test_throttled_after_failures(self):
+        """Test that attempts past the username's failure limit get 429 with Retry-After."""
+        url = reverse('token_obtain_pair')
+        credentials = {'username': 'tokenuser', 'password': 'testpass123'}
+        self.assertEqual(self.client.post(url, credentials).status_code, status.HTTP_200_OK)
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, {**credentials, 'password': 'wrong'}).status_code,
+                             status.HTTP_401_UNAUTHORIZED)
+        with mock.patch('rest_framework_simplejwt.serializers.authenticate') as authenticate:
+            response = self.client.post(url, credentials)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+
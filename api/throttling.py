@@ -0,0 +1,16 @@
+from django.contrib.auth import get_user_model
+from rest_framework.throttling import BaseThrottle
+
+from accounts.ratelimit import check_login_rate
+
+
+class LoginRateThrottle(BaseThrottle):
+    """Applies the login rate limits to the credentials in the request body."""
+
+    def allow_request(self, request, view):
+        username = request.data.get(get_user_model().USERNAME_FIELD)
+        self.wait_seconds = check_login_rate(request, username if isinstance(username, str) else None)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
@@ -1,15 +1,22 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 from . import views
 
 urlpatterns = [
     # JWT Authentication
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/', views.TokenObtainPairAPI.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
     # Job APIs
     path('jobs/', views.JobListAPI.as_view(), name='api_jobs'),
+    path('jobs/facets/', views.JobFacetsAPI.as_view(), name='api_job_facets'),
+    path('jobs/batch/', views.JobBatchAPI.as_view(), name='api_job_batch'),
+    path('jobs/import/', views.JobImportAPI.as_view(), name='api_job_import'),
+    path('jobs/export/', views.JobExportAPI.as_view(), name='api_job_export'),
     path('jobs/<int:id>/', views.JobDetailAPI.as_view(), name='api_job_detail'),
     path('jobs/<int:job_id>/apply/', views.ApplyJobAPI.as_view(), name='api_apply_job'),
+    path('jobs/<int:job_id>/applications/', views.JobApplicationsAPI.as_view(), name='api_job_applications'),
+    path('applications/status/', views.ApplicationStatusAPI.as_view(), name='api_application_status'),
     path('my-applications/', views.MyApplicationsAPI.as_view(), name='api_my_applications'),
+    path('my-applications/events/', views.application_events, name='api_application_events'),
 ]
\ No newline at end of file
@@ -1,60 +1,479 @@
+import asyncio
+import io
+import json
+
+from asgiref.sync import sync_to_async
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from jobs.models import Job, JobApplication
-from .serializers import JobSerializer, JobDetailSerializer, ApplicationSerializer, ApplicationCreateSerializer  # CHANGED
+from jobs.applications import AlreadyApplied, submit_application, update_statuses
+from jobs.uploads import discard_upload, install_resume_upload_handler, max_resume_size, upload_too_large
+from jobs import bulk, events, facets, salary
+from jobs.cache import cache_public_response
+from jobs.pagination import InvalidCursor, apaginate_jobs, get_page_size, get_sort_ordering, search_ordering
+from jobs.search import search_jobs
+from jobs.conditional import async_condition, job_detail_etag, job_detail_last_modified, job_list_etag, job_list_last_modified
+from .serializers import JobSerializer, JobDetailSerializer, ApplicationSerializer, ApplicationCreateSerializer, JobApplicantSerializer, ApplicationStatusUpdateSerializer  # CHANGED
+from .pagination import ApplicantPagination, KeysetPagination
+from .mixins import OptimizedQuerysetMixin, requested_fields
+from .streaming import NDJSON, StreamingListMixin, stream_response
+from .models import IdempotencyKey, expiry_cutoff
+from .authentication import CachedJWTAuthentication
+from .throttling import LoginRateThrottle
+
+
+class TokenObtainPairAPI(TokenObtainPairView):
+    """Issues JWTs; rate limited per IP and username before the password is checked."""
+    throttle_classes = [LoginRateThrottle]
 
-class JobListAPI(generics.ListAPIView):
-    """Public API to list all active jobs (No auth required)"""
+
+@method_decorator(cache_public_response(anonymous_only=False), name='dispatch')
+@method_decorator(condition(etag_func=job_list_etag, last_modified_func=job_list_last_modified), name='dispatch')
+class JobListAPI(StreamingListMixin, OptimizedQuerysetMixin, generics.ListAPIView):
+    """Public API to list all active jobs (No auth required)
+    
+    ``?stream=1`` or ``Accept: application/x-ndjson`` streams the full list.
+    """
     queryset = Job.objects.filter(is_active=True)
     serializer_class = JobSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+    
+    def get_queryset(self):
+        queryset = facets.filter_jobs(super().get_queryset(), self.request.query_params)
+        return salary.filter_jobs(queryset, self.request.query_params)
+    
+    def get_stream_queryset(self):
+        params = self.request.query_params
+        queryset, ordering = search_ordering(
+            self.filter_queryset(self.get_queryset()), params.get('q', '').strip(),
+            get_sort_ordering(params.get('sort')),
+        )
+        return queryset.order_by(*ordering)
 
-class JobDetailAPI(generics.RetrieveAPIView):
+@method_decorator(cache_public_response(anonymous_only=False), name='dispatch')
+class JobFacetsAPI(APIView):
+    """Public API with active job counts per category, job type and location
+    
+    ``?q=`` counts the matches of that search instead.
+    """
+    permission_classes = [permissions.AllowAny]
+    
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        jobs = search_jobs(Job.objects.filter(is_active=True), query) if query else None
+        return Response(facets.get_facet_counts(jobs=jobs))
+
+class JobDetailAPI(OptimizedQuerysetMixin, generics.RetrieveAPIView):
     """API to get job details (Requires authentication)"""
     queryset = Job.objects.filter(is_active=True)
     serializer_class = JobDetailSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'id'
+    
+    @method_decorator(condition(etag_func=job_detail_etag, last_modified_func=job_detail_last_modified))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+class JobBatchAPI(OptimizedQuerysetMixin, generics.GenericAPIView):
+    """API to get many jobs by id in one request (Requires authentication)
+    
+    ``?ids=3,1,2`` returns the active jobs in that order from a single
+    query, and lists the ids of deactivated jobs under ``inactive`` and of
+    jobs that do not exist under ``missing``.
+    """
+    # Not filtered on is_active, so deactivated jobs can be told apart.
+    queryset = Job.objects.all()
+    serializer_class = JobDetailSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        ids = []
+        for value in request.query_params.get('ids', '').split(','):
+            value = value.strip()
+            if not value:
+                continue
+            if not value.isdigit():
+                return Response({"error": f"Invalid id: {value}"}, status=status.HTTP_400_BAD_REQUEST)
+            ids.append(int(value))
+        ids = list(dict.fromkeys(ids))
+        
+        limit = getattr(settings, 'JOB_BATCH_MAX_IDS', 100)
+        if not ids:
+            return Response({"error": "Pass job ids as ?ids=1,2,3"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > limit:
+            return Response({"error": f"At most {limit} ids per request"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # An annotation, so ?fields= projections cannot defer it.
+        jobs = self.get_queryset().annotate(active=F('is_active')).in_bulk(ids)
+        found = [jobs[job_id] for job_id in ids if job_id in jobs and jobs[job_id].active]
+        return Response({
+            "results": self.get_serializer(found, many=True).data,
+            "inactive": [job_id for job_id in ids if job_id in jobs and not jobs[job_id].active],
+            "missing": [job_id for job_id in ids if job_id not in jobs],
+        })
 
 class ApplyJobAPI(APIView):
-    """API to apply for a job (Requires authentication)"""
+    """API to apply for a job (Requires authentication)
+    
+    Send an ``Idempotency-Key`` header to make retries safe: a repeated key
+    replays the first successful response instead of applying again.  A key
+    reused for another job is refused with 422, and one a concurrent request
+    claimed without a response to replay with 409; keys are kept for
+    ``IDEMPOTENCY_KEY_RETENTION`` seconds.
+    """
     permission_classes = [IsAuthenticated]
     
+    def initial(self, request, *args, **kwargs):
+        # Before authentication, whose CSRF check may already parse the body.
+        install_resume_upload_handler(request)
+        super().initial(request, *args, **kwargs)
+    
     def post(self, request, job_id):
+        idempotency_key = request.headers.get('Idempotency-Key', '').strip()[:255]
+        if idempotency_key:
+            replay = self._replay(request, idempotency_key)
+            if replay is not None:
+                return replay
+        
         try:
-            job = Job.objects.get(id=job_id, is_active=True)
+            job = Job.objects.only('id').get(id=job_id, is_active=True)
         except Job.DoesNotExist:
             return Response(
                 {"error": "Job not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Check if already applied
-        if JobApplication.objects.filter(job=job, applicant=request.user).exists():
+        if upload_too_large(request):
             return Response(
-                {"error": "You have already applied for this job"},
-                status=status.HTTP_400_BAD_REQUEST
+                {"error": f"Resume must be smaller than {max_resume_size() // (1024 * 1024)} MB"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
             )
         
         # Use ApplicationCreateSerializer instead of ApplicationSerializer
         serializer = ApplicationCreateSerializer(data=request.data)  # CHANGED
-        if serializer.is_valid():
-            application = serializer.save(
-                job=job,
-                applicant=request.user
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Insert first; the unique (job, applicant) constraint is the check.
+        application = JobApplication(job=job, applicant=request.user, **serializer.validated_data)
+        try:
+            with transaction.atomic():
+                submit_application(application)
+                body = {"message": "Application submitted successfully", "id": application.id}
+                if idempotency_key:
+                    # Cleans up as it goes; purge_idempotency_keys covers idle users.
+                    IdempotencyKey.objects.filter(user=request.user).expired().delete()
+                    IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=idempotency_key,
+                        path=request.path,
+                        status_code=status.HTTP_201_CREATED,
+                        response=body,
+                    )
+        except AlreadyApplied:
+            if idempotency_key:
+                # A concurrent retry with the same key may have just won.
+                replay = self._replay(request, idempotency_key)
+                if replay is not None:
+                    return replay
+            return Response(
+                {"error": "You have already applied for this job"},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        except IntegrityError:
+            # Only the key insert can get here: a concurrent request stored
+            # the same key first, and the application was rolled back.
+            if application.resume:
+                discard_upload(application.resume.name, application.resume.storage)
+            replay = self._replay(request, idempotency_key)
+            if replay is not None:
+                return replay
+            return Response(
+                {"error": "This Idempotency-Key is in use by a concurrent request"},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(body, status=status.HTTP_201_CREATED)
+    
+    def _replay(self, request, key):
+        record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if record is None:
+            return None
+        if record.created_at < expiry_cutoff():
+            # Expired: the key is free for a new request.
+            record.delete()
+            return None
+        if record.path != request.path:
             return Response(
-                {"message": "Application submitted successfully", "id": application.id},
-                status=status.HTTP_201_CREATED
+                {"error": "This Idempotency-Key was already used for a different request"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
             )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(record.response, status=record.status_code, headers={'Idempotent-Replayed': 'true'})
 
-class MyApplicationsAPI(generics.ListAPIView):
+class MyApplicationsAPI(StreamingListMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     """API to view user's applications"""
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
+    stream_ordering = ('-applied_at', '-id')
+    
+    queryset = JobApplication.objects.all()
     
     def get_queryset(self):
-        return JobApplication.objects.filter(applicant=self.request.user)
\ No newline at end of file
+        return super().get_queryset().filter(applicant=self.request.user)
+
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+async def _jwt_user(request):
+    """The user of a JWT ``Authorization`` header or None; a bad token raises AuthenticationFailed."""
+    authenticated = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    return authenticated[0] if authenticated else None
+
+async def _event_user(request):
+    """The session user, or the user of a JWT ``Authorization`` header."""
+    user = await request.auser()
+    if user.is_authenticated:
+        return user
+    try:
+        return await _jwt_user(request)
+    except AuthenticationFailed:
+        return None
+
+async def application_events(request):
+    """Server-Sent Events stream of the user's application status changes
+    
+    Starts with a ``snapshot`` event holding every application's status,
+    then sends a ``status`` event per change.  Served by an ASGI worker the
+    connection stays open on the event loop; under WSGI only the snapshot is
+    sent and EventSource reconnects after ``retry``, i.e. it degrades to polling.
+    """
+    if request.method != 'GET':
+        return JsonResponse({"detail": "Method not allowed."}, status=405)
+    user = await _event_user(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    heartbeat = getattr(settings, 'EVENTS_HEARTBEAT', 15)
+    
+    async def snapshot():
+        rows = JobApplication.objects.filter(applicant_id=user.pk).values_list('id', 'job_id', 'status')
+        return [{'id': pk, 'job': job_id, 'status': value} async for pk, job_id, value in rows.order_by('id')]
+    
+    if not isinstance(request, ASGIRequest):
+        response = HttpResponse(f'retry: {heartbeat * 1000}\n\n' + _sse('snapshot', await snapshot()),
+                                content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        return response
+    
+    async def stream():
+        yield f'retry: {heartbeat * 1000}\n\n'
+        # Subscribe before reading the snapshot so no change falls in between.
+        async with events.get_broker().subscribe(events.channel_for(user.pk)) as subscription:
+            yield _sse('snapshot', await snapshot())
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield _sse('status', message)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+class JobApplicationsAPI(OptimizedQuerysetMixin, generics.ListAPIView):
+    """API for employers to list their job's applications, ``?q=`` searches resumes"""
+    serializer_class = JobApplicantSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ApplicantPagination
+    
+    queryset = JobApplication.objects.all()
+    
+    def get_queryset(self):
+        job = get_object_or_404(Job.objects.only('id'), id=self.kwargs['job_id'], posted_by=self.request.user)
+        return super().get_queryset().filter(job=job)
+
+class ApplicationStatusAPI(APIView):
+    """API to change the status of many applications at once (job owners)
+    
+    Applies one UPDATE per target status; ids that do not exist or belong to
+    someone else's job are returned under ``missing``.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = ApplicationStatusUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        result = update_statuses(serializer.validated_data['statuses'], owner=request.user)
+        return Response({
+            "updated": result.updated,
+            "unchanged": result.unchanged,
+            "missing": result.missing,
+        })
+
+class JobImportAPI(APIView):
+    """Admin API to bulk import jobs from an uploaded CSV or JSON Lines ``file``
+    
+    ``?dry_run=1`` validates without inserting; ``?type=csv|jsonl`` overrides the
+    format guessed from the file name.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+    # Per-row errors returned in the response; the counts cover all of them.
+    max_reported_errors = 100
+    
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the jobs as a 'file' field"}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.query_params.get('type') or bulk.guess_format(upload.name, upload.content_type or '')
+        if fmt not in bulk.FORMATS:
+            return Response({"error": f"type must be one of {', '.join(bulk.FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        
+        errors = []
+        
+        def on_error(line_number, row_errors):
+            if len(errors) < self.max_reported_errors:
+                errors.append({"line": line_number, "errors": row_errors})
+        
+        # Large uploads sit in a temporary file and are read line by line.
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        try:
+            result = bulk.import_jobs(stream, fmt, request.user, dry_run=dry_run, on_error=on_error)
+        finally:
+            stream.detach()
+        
+        body = {
+            "rows": result.rows,
+            "created": result.created,
+            "rejected": result.errors,
+            "dry_run": dry_run,
+            "errors": errors,
+        }
+        return Response(body, status=status.HTTP_201_CREATED if result.created else status.HTTP_200_OK)
+
+class JobExportAPI(APIView):
+    """Admin API streaming your jobs (all jobs for superusers) as ``?type=csv|jsonl``"""
+    permission_classes = [IsAdminUser]
+    content_types = {'csv': 'text/csv; charset=utf-8', 'jsonl': 'application/x-ndjson'}
+    
+    def get(self, request):
+        fmt = request.query_params.get('type', 'csv')
+        if fmt not in bulk.FORMATS:
+            return Response({"error": f"type must be one of {', '.join(bulk.FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        jobs = Job.objects.all()
+        if not request.user.is_superuser:
+            jobs = jobs.filter(posted_by=request.user)
+        jobs = facets.filter_jobs(jobs, request.query_params)
+        
+        response = stream_response(request, bulk.export_lines(jobs, fmt), content_type=self.content_types[fmt])
+        response['Content-Disposition'] = f'attachment; filename="jobs.{fmt}"'
+        return response
+
+
+# Async versions of JobListAPI and JobDetailAPI, routed in ASGI mode
+# (jobportal.urls_async).  They answer plain JSON GETs on the event loop and
+# hand anything else (browsable API, ?format=, ?stream=, OPTIONS) to the DRF
+# view in a thread, so the responses are the same in both modes.
+_job_list_api = JobListAPI.as_view()
+_job_detail_api = JobDetailAPI.as_view()
+
+def _is_plain_json_get(request):
+    accept = request.headers.get('Accept', '')
+    return (
+        request.method in ('GET', 'HEAD')
+        and 'format' not in request.GET
+        and 'stream' not in request.GET
+        and 'text/html' not in accept
+        and NDJSON not in accept
+        and 'indent' not in accept
+    )
+
+def _json_response(data, status=200, headers=None):
+    response = HttpResponse(JSONRenderer().render(data), status=status, headers=headers,
+                            content_type='application/json')
+    response['Vary'] = 'Accept'
+    response['Allow'] = 'GET, HEAD, OPTIONS'
+    return response
+
+def _sparse_queryset(serializer_class, queryset, drf_request):
+    fields = requested_fields(drf_request, serializer_class().fields)
+    return serializer_class.setup_eager_loading(queryset, fields)
+
+async def async_job_list_api(request):
+    if not _is_plain_json_get(request):
+        return await sync_to_async(_job_list_api)(request)
+    return await _async_job_list(request)
+
+@cache_public_response(anonymous_only=False)
+@async_condition(etag_func=job_list_etag, last_modified_func=job_list_last_modified)
+async def _async_job_list(request):
+    params = request.GET
+    drf_request = Request(request)
+    queryset = salary.filter_jobs(facets.filter_jobs(Job.objects.filter(is_active=True), params), params)
+    try:
+        queryset = _sparse_queryset(JobSerializer, queryset, drf_request)
+        rows, next_cursor = await apaginate_jobs(
+            queryset,
+            query=params.get('q', '').strip(),
+            cursor=params.get('cursor'),
+            page_size=get_page_size(params.get('page_size')),
+            ordering=get_sort_ordering(params.get('sort')),
+        )
+    except ValidationError as exc:
+        return _json_response(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+    except InvalidCursor:
+        return _json_response({'detail': 'Invalid cursor'}, status=status.HTTP_404_NOT_FOUND)
+    
+    headers = {}
+    if next_cursor:
+        next_link = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+        headers['Link'] = f'<{next_link}>; rel="next"'
+    data = JobSerializer(rows, many=True, context={'request': drf_request}).data
+    return _json_response(data, headers=headers)
+
+async def async_job_detail_api(request, id):
+    if not _is_plain_json_get(request):
+        return await sync_to_async(_job_detail_api)(request, id=id)
+    try:
+        user = await _jwt_user(request)
+    except AuthenticationFailed as exc:
+        user, detail = None, exc.detail
+    else:
+        detail = {'detail': 'Authentication credentials were not provided.'}
+    if user is None:
+        return _json_response(detail, status=status.HTTP_401_UNAUTHORIZED,
+                              headers={'WWW-Authenticate': 'Bearer realm="api"'})
+    request.user = user
+    return await _async_job_detail(request, id=id)
+
+@async_condition(etag_func=job_detail_etag, last_modified_func=job_detail_last_modified)
+async def _async_job_detail(request, id):
+    drf_request = Request(request)
+    try:
+        queryset = _sparse_queryset(JobDetailSerializer, Job.objects.filter(is_active=True), drf_request)
+    except ValidationError as exc:
+        return _json_response(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+    job = await queryset.filter(id=id).afirst()
+    if job is None:
+        return _json_response({'detail': 'No Job matches the given query.'}, status=status.HTTP_404_NOT_FOUND)
+    return _json_response(JobDetailSerializer(job, context={'request': drf_request}).data)
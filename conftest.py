@@ -0,0 +1,11 @@
+import pytest
+from django.test.utils import override_settings
+
+from jobportal.test_runner import TEST_SETTINGS
+
+
+@pytest.fixture(autouse=True, scope='session')
+def test_settings():
+    """The settings ``manage.py test`` runs with, for pytest runs."""
+    with override_settings(**TEST_SETTINGS):
+        yield
@@ -2,6 +2,9 @@
 ASGI config for jobportal project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with ``uvicorn jobportal.asgi:application`` (see the Procfile).  The
+public read paths are then served by async views (``jobportal.urls_async``);
+set ASYNC_VIEWS=0 to serve the sync views under ASGI instead.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -12,5 +15,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobportal.settings')
+os.environ.setdefault('ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
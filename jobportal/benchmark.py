@@ -0,0 +1,214 @@
+"""
+Latency and query-count benchmark of every page and endpoint.
+
+``run`` requests each route of ``jobs.urls``, ``accounts.urls`` and
+``api.urls`` in-process through the test client, as the user the route is
+meant for.  It records per-request latency and the number of SQL queries.
+Routes that create rows on every call are listed with the reason they are
+skipped rather than left out silently.  A route added to one of those url
+modules without a spec here shows up under ``unmeasured``.
+
+Results are plain dicts, written as JSON by the ``benchmark_portal``
+command and compared by ``compare``, so runs at different commits can be
+diffed.
+"""
+import statistics
+import time
+from collections import Counter, namedtuple
+
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from jobs.models import Job, JobApplication
+from jobs.seeding import DEFAULT_PASSWORD
+from .loadtest import percentile
+
+URL_MODULES = ('jobs.urls', 'accounts.urls', 'api.urls')
+
+# Routes whose every request inserts rows, which would change the data being measured.
+SKIPPED = {
+    'api_apply_job': 'every POST creates an application',
+}
+
+Endpoint = namedtuple('Endpoint', ['name', 'method', 'path', 'client', 'data', 'headers'])
+
+
+def route_names():
+    """URL names of every route in ``URL_MODULES``, in declaration order."""
+    names = []
+    for module in URL_MODULES:
+        for pattern in get_resolver(module).url_patterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                names.append(pattern.name)
+            elif isinstance(pattern, URLResolver):
+                names.extend(p.name for p in pattern.url_patterns if getattr(p, 'name', None))
+    return names
+
+
+class Fixtures:
+    """The seeded rows and logged-in clients the endpoints are requested with."""
+
+    def __init__(self):
+        applications = JobApplication.objects.filter(job__is_active=True, applicant__is_staff=False)
+        application = applications.select_related('job__posted_by', 'applicant').order_by('-job__application_count').first()
+        if application is None:
+            raise ValueError('Seed some jobs and applications first (see seed_portal).')
+        self.job = application.job
+        self.employer = application.job.posted_by
+        self.applicant = application.applicant
+        self.application_ids = list(self.job.applications.values_list('id', flat=True)[:20])
+        self.job_ids = list(Job.objects.filter(is_active=True).values_list('id', flat=True)[:20])
+        # A job the applicant can still apply to, for the application form.
+        self.open_job = (Job.objects.filter(is_active=True).exclude(applications__applicant=self.applicant)
+                         .order_by('-created_at').first() or self.job)
+
+        self.anonymous = Client()
+        self.as_applicant = Client()
+        self.as_applicant.force_login(self.applicant)
+        self.as_employer = Client()
+        self.as_employer.force_login(self.employer)
+        self.applicant_refresh = RefreshToken.for_user(self.applicant)
+        self.applicant_jwt = {'HTTP_AUTHORIZATION': f'Bearer {self.applicant_refresh.access_token}'}
+        self.employer_jwt = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.employer).access_token}'}
+
+    def endpoints(self):
+        args = [self.job.id]
+        credentials = {'username': self.applicant.username, 'password': DEFAULT_PASSWORD}
+        csv = 'title,company,location,description,requirements,job_type\n' + \
+            'Benchmark Role,Acme,Remote,Description,Requirements,remote\n' * 20
+        return [
+            # jobs.urls
+            Endpoint('home', 'get', reverse('home'), self.anonymous, None, {}),
+            Endpoint('job_detail', 'get', reverse('job_detail', args=args), self.anonymous, None, {}),
+            # The form only; posting it would create an application.
+            Endpoint('apply_job', 'get', reverse('apply_job', args=[self.open_job.id]), self.as_applicant, None, {}),
+            Endpoint('admin_dashboard', 'get', reverse('admin_dashboard'), self.as_employer, None, {}),
+            Endpoint('create_job', 'get', reverse('create_job'), self.as_employer, None, {}),
+            Endpoint('view_applications', 'get', reverse('view_applications', args=args), self.as_employer, None, {}),
+            Endpoint('update_application_status', 'post', reverse('update_application_status', args=args),
+                     self.as_employer, {'applications': self.application_ids, 'status': 'reviewed'}, {}),
+            # accounts.urls
+            Endpoint('register', 'get', reverse('register'), self.anonymous, None, {}),
+            Endpoint('login', 'post', reverse('login'), Client(), credentials, {}),
+            Endpoint('logout', 'get', reverse('logout'), self.anonymous, None, {}),
+            Endpoint('profile', 'get', reverse('profile'), self.as_applicant, None, {}),
+            # api.urls
+            Endpoint('token_obtain_pair', 'post', reverse('token_obtain_pair'), self.anonymous, credentials, {}),
+            Endpoint('token_refresh', 'post', reverse('token_refresh'), self.anonymous,
+                     {'refresh': str(self.applicant_refresh)}, {}),
+            Endpoint('api_jobs', 'get', reverse('api_jobs'), self.anonymous, None, {}),
+            Endpoint('api_job_facets', 'get', reverse('api_job_facets'), self.anonymous, None, {}),
+            Endpoint('api_job_batch', 'get', reverse('api_job_batch') + '?ids=' + ','.join(map(str, self.job_ids)),
+                     self.anonymous, None, self.applicant_jwt),
+            Endpoint('api_job_import', 'post', reverse('api_job_import') + '?dry_run=1', self.anonymous,
+                     {'file': _upload('jobs.csv', csv)}, self.employer_jwt),
+            Endpoint('api_job_export', 'get', reverse('api_job_export'), self.anonymous, None, self.employer_jwt),
+            Endpoint('api_job_detail', 'get', reverse('api_job_detail', args=args), self.anonymous, None, self.applicant_jwt),
+            Endpoint('api_job_applications', 'get', reverse('api_job_applications', args=args),
+                     self.anonymous, None, self.employer_jwt),
+            Endpoint('api_application_status', 'post', reverse('api_application_status'), self.anonymous,
+                     {'ids': self.application_ids, 'status': 'reviewed'}, {**self.employer_jwt, 'content_type': 'application/json'}),
+            Endpoint('api_my_applications', 'get', reverse('api_my_applications'), self.anonymous, None, self.applicant_jwt),
+            Endpoint('api_application_events', 'get', reverse('api_application_events'), self.as_applicant, None, {}),
+        ]
+
+
+def _upload(name, text):
+    return lambda: SimpleUploadedFile(name, text.encode(), content_type='text/csv')
+
+
+def _request(endpoint):
+    data = endpoint.data
+    if isinstance(data, dict):
+        # Uploads are rebuilt per request since the client consumes them.
+        data = {key: value() if callable(value) else value for key, value in data.items()}
+    kwargs = dict(endpoint.headers)
+    if data is not None:
+        kwargs['data'] = data
+    response = getattr(endpoint.client, endpoint.method)(endpoint.path, **kwargs)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def measure(endpoint, requests, warm_cache=False):
+    """Latency percentiles (ms), query counts and statuses over ``requests`` calls."""
+    latencies, queries, statuses = [], [], Counter()
+    cache = caches['default']
+    _request(endpoint)  # warm up imports, templates and the connection
+    for _ in range(requests):
+        if not warm_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = _request(endpoint)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+        statuses[response.status_code] += 1
+    latencies.sort()
+    return {
+        'name': endpoint.name,
+        'method': endpoint.method.upper(),
+        'path': endpoint.path,
+        'requests': requests,
+        'status': {str(code): count for code, count in sorted(statuses.items())},
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies), 2),
+            'p50': round(percentile(latencies, 0.50), 2),
+            'p90': round(percentile(latencies, 0.90), 2),
+            'p99': round(percentile(latencies, 0.99), 2),
+            'max': round(latencies[-1], 2),
+        },
+        'queries': {'mean': round(statistics.fmean(queries), 2), 'max': max(queries)},
+    }
+
+
+def run(requests=20, warm_cache=False, only=None):
+    """Measure every route at the current data; returns ``(results, skipped, unmeasured)``."""
+    fixtures = Fixtures()
+    endpoints = fixtures.endpoints()
+    measured = {endpoint.name for endpoint in endpoints}
+    results = [
+        measure(endpoint, requests, warm_cache)
+        for endpoint in endpoints
+        if only is None or endpoint.name in only
+    ]
+    names = route_names()
+    skipped = {name: reason for name, reason in SKIPPED.items() if name in names}
+    unmeasured = [name for name in names if name not in measured and name not in SKIPPED]
+    return results, skipped, unmeasured
+
+
+def compare(baseline, current, threshold=1.25):
+    """
+    Pair up the endpoints of two result files by scale and name.  Returns one
+    row per endpoint; ``regression`` is set when it runs more queries than
+    before or its p50 latency grew by more than ``threshold`` times.
+    """
+    before = {
+        (scale['jobs'], endpoint['name']): endpoint
+        for scale in baseline['scales'] for endpoint in scale['endpoints']
+    }
+    rows = []
+    for scale in current['scales']:
+        for endpoint in scale['endpoints']:
+            old = before.get((scale['jobs'], endpoint['name']))
+            if old is None:
+                continue
+            ratio = endpoint['latency_ms']['p50'] / old['latency_ms']['p50'] if old['latency_ms']['p50'] else 1.0
+            rows.append({
+                'jobs': scale['jobs'],
+                'name': endpoint['name'],
+                'p50_before': old['latency_ms']['p50'],
+                'p50_after': endpoint['latency_ms']['p50'],
+                'p50_ratio': round(ratio, 2),
+                'queries_before': old['queries']['max'],
+                'queries_after': endpoint['queries']['max'],
+                'regression': endpoint['queries']['max'] > old['queries']['max'] or ratio > threshold,
+            })
+    return rows
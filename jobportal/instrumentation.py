@@ -0,0 +1,170 @@
+"""
+Per-request database and template instrumentation.
+
+``RequestMetricsMiddleware`` counts the queries a request runs, the time
+spent in SQL and in template rendering, and how many queries repeat an
+earlier statement with different parameters (the N+1 signature).  The
+figures go out as a ``Server-Timing`` header and as one JSON log line on
+the ``jobportal.requests`` logger.  ``REQUEST_METRICS_SAMPLE_RATE`` sets
+the fraction of requests that pay for this.  The middleware is sync and
+async capable, so under ASGI it does not push async views onto a thread.
+"""
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger('jobportal.requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.statements = Counter()
+
+    @property
+    def queries(self):
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed with connection.execute_wrapper(); ``sql`` still holds
+        # the placeholders, so repeats differing only in params collapse.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.statements[sql] += 1
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.sql_time * 1000:.2f};desc="{self.queries} queries"',
+            f'dup;desc="{self.duplicates} repeated queries"',
+            f'tmpl;dur={self.template_time * 1000:.2f}',
+            f'total;dur={self.total_time * 1000:.2f}',
+        ])
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'duplicate_queries': self.duplicates,
+            'sql_ms': round(self.sql_time * 1000, 2),
+            'template_ms': round(self.template_time * 1000, 2),
+            'total_ms': round(self.total_time * 1000, 2),
+        }
+
+
+def current_metrics():
+    return _current.get()
+
+
+class TimedTemplate:
+    """Wraps a backend template so top-level renders are added to the metrics."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        metrics = current_metrics()
+        if metrics is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The stock Django template backend with render timing."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with self._instrument(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._report(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        # Connections are per thread and the async ORM runs this request's
+        # queries on its sync thread, so the wrappers are installed there.
+        instrumented = await sync_to_async(self._instrument)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(instrumented.close)()
+            _current.reset(token)
+        return self._report(request, response, metrics)
+
+    def _sampled(self):
+        sample_rate = getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 1.0)
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def _instrument(self, metrics):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    def _report(self, request, response, metrics):
+        if getattr(settings, 'REQUEST_METRICS_SERVER_TIMING', True):
+            response['Server-Timing'] = metrics.server_timing()
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **metrics.as_dict(),
+        }))
+        return response
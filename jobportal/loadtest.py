@@ -0,0 +1,143 @@
+"""
+Closed-loop HTTP load generator used to compare deployment modes.
+
+Each of ``concurrency`` clients keeps one keep-alive connection and sends its
+next request as soon as the previous response has been read.  Latencies are
+kept per request and reported as percentiles, so tail latency under load
+shows up and not only the mean.  Standard library only, so it runs wherever
+the project does.
+
+With ``cache_bust`` every request gets a unique ``_=`` query parameter, so
+the job board's response cache (``jobs.cache``) cannot answer it and the
+views themselves are measured.  The ``X-Cache`` header of each response is
+counted either way, so the summary says how many were cache hits.
+"""
+import asyncio
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+class ResponseError(Exception):
+    pass
+
+
+async def _read_response(reader):
+    """Read one HTTP/1.1 response; returns ``(status, keep_alive, x_cache)``."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ResponseError('connection closed')
+    try:
+        status = int(status_line.split()[1])
+    except (IndexError, ValueError):
+        raise ResponseError(f'bad status line {status_line!r}')
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif status not in (204, 304):
+        await reader.read()
+        return status, False, headers.get('x-cache')
+    return status, headers.get('connection', '').lower() != 'close', headers.get('x-cache')
+
+
+def _request(netloc, path, extra):
+    return f'GET {path} HTTP/1.1\r\nHost: {netloc}\r\n{extra}\r\n'.encode()
+
+
+async def _client(url, paths, headers, started, warmup, deadline, stats, offset, cache_bust):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    extra = ''.join(f'{name}: {value}\r\n' for name, value in headers)
+    requests = [_request(parts.netloc, path, extra) for path in paths]
+    index = offset
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        if writer is None:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                stats['errors'] += 1
+                await asyncio.sleep(0.05)
+                continue
+        if cache_bust:
+            path = paths[index % len(paths)]
+            request = _request(parts.netloc, f'{path}{"&" if "?" in path else "?"}_={offset}.{index}', extra)
+        else:
+            request = requests[index % len(requests)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive, x_cache = await _read_response(reader)
+        except (OSError, ResponseError, asyncio.IncompleteReadError, ValueError):
+            stats['errors'] += 1
+            writer.close()
+            writer = None
+            continue
+        if start - started >= warmup:
+            stats['latencies'].append(time.perf_counter() - start)
+            stats['status'][status] += 1
+            stats['cache'][(x_cache or 'uncached').lower()] += 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+def percentile(values, fraction):
+    """``fraction`` percentile of already sorted ``values`` (nearest rank)."""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+async def run(url, paths, concurrency=100, duration=20.0, warmup=2.0, headers=(), cache_bust=False):
+    """Load ``url`` with ``concurrency`` clients; returns a summary dict."""
+    stats = {'latencies': [], 'status': Counter(), 'cache': Counter(), 'errors': 0}
+    started = time.perf_counter()
+    deadline = started + warmup + duration
+    await asyncio.gather(*(
+        _client(url, paths, headers, started, warmup, deadline, stats, offset, cache_bust)
+        for offset in range(concurrency)
+    ))
+    latencies = sorted(stats['latencies'])
+    milliseconds = {
+        name: round(value * 1000, 2) if value is not None else None
+        for name, value in (
+            ('p50', percentile(latencies, 0.50)),
+            ('p90', percentile(latencies, 0.90)),
+            ('p99', percentile(latencies, 0.99)),
+            ('max', latencies[-1] if latencies else None),
+        )
+    }
+    return {
+        'url': url,
+        'paths': list(paths),
+        'concurrency': concurrency,
+        'duration': duration,
+        'requests': len(latencies),
+        'errors': stats['errors'],
+        'requests_per_second': round(len(latencies) / duration, 1),
+        'latency_ms': milliseconds,
+        'status': {str(code): count for code, count in sorted(stats['status'].items())},
+        'cache_bust': cache_bust,
+        # X-Cache of the measured responses: hit, miss or uncached (no header).
+        'cache': {name: stats['cache'][name] for name in ('hit', 'miss', 'uncached')},
+    }
@@ -4,6 +4,9 @@ Django settings for jobportal project.
 
 from pathlib import Path
 import os
+import sys
+
+from jobportal import sqlite
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -14,6 +17,9 @@ SECRET_KEY = 'django-insecure-your-secret-key-here'
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# True while running the test suite (manage.py test / pytest)
+TESTING = 'test' in sys.argv or 'pytest' in sys.modules
+
 ALLOWED_HOSTS = []
 
 
@@ -25,6 +31,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.humanize',
     
     # Third party
     'rest_framework',
@@ -34,9 +41,12 @@ INSTALLED_APPS = [
     'accounts',
     'jobs',
     'api',
+    'tasks',
 ]
 
 MIDDLEWARE = [
+    'jobportal.instrumentation.RequestMetricsMiddleware',
+    'jobs.cache.ResponseCacheMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,11 +56,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'jobportal.urls'
+# ASGI mode (set by jobportal.asgi) routes the public read paths to async views.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '0') == '1'
+ROOT_URLCONF = 'jobportal.urls_async' if ASYNC_VIEWS else 'jobportal.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'jobportal.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],  # ADD THIS LINE
         'APP_DIRS': True,
         'OPTIONS': {
@@ -65,17 +77,52 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'jobportal.wsgi.application'
+ASGI_APPLICATION = 'jobportal.asgi.application'
 
 
 # Database
+# WAL, synchronous=NORMAL, a 20s busy timeout, mmap and BEGIN IMMEDIATE
+# (see jobportal/sqlite.py); SQLITE_PROFILE=stock for SQLite's defaults
+SQLITE_OPTIONS = sqlite.options(
+    os.environ.get('SQLITE_PROFILE', 'production'),
+    busy_timeout=float(os.environ.get('SQLITE_BUSY_TIMEOUT', '20')),
+    mmap_size=int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+)
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': SQLITE_OPTIONS,
+        'TEST': {
+            # A file rather than shared-cache memory so concurrent tests see
+            # real SQLite locking (busy waits) instead of "table is locked".
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
 
+# Cache (local memory by default, Redis when REDIS_URL is set)
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Public job board response cache; entries are invalidated by content
+# version, the timeout only bounds how long unused pages linger.
+JOB_BOARD_CACHE_ALIAS = 'default'
+JOB_BOARD_CACHE_TIMEOUT = 300
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -92,6 +139,35 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: new hashes use the first entry; a login with a hash from
+# any other entry, or another PBKDF2 iteration count, is rehashed to it.
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# PBKDF2 work factor (0 follows Django's default; the accounts.E001 check
+# refuses values below accounts.hashers.MIN_PBKDF2_ITERATIONS). The test runner
+# lowers it (jobportal/test_runner.py), never these settings.
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 0))
+
+# Login rate limits (login page and /api/token/), checked before hashing:
+# ``attempts`` per sliding ``window`` of seconds.  Every attempt counts per IP,
+# only failed ones per username (accounts/ratelimit.py).
+# The test runner turns them off; tests enable them explicitly so attempts
+# do not add up across test cases.
+LOGIN_RATE_LIMITS = {
+    'ip': {'attempts': 30, 'window': 60},
+    'username': {'attempts': 10, 'window': 300},
+}
+LOGIN_RATE_LIMIT_CACHE_ALIAS = 'default'
+# Reverse proxies in front of the app whose X-Forwarded-For entry is trusted
+LOGIN_RATE_LIMIT_PROXIES = int(os.environ.get('LOGIN_RATE_LIMIT_PROXIES', 0))
+
+TEST_RUNNER = 'jobportal.test_runner.TestRunner'
+
 
 # Internationalization
 LANGUAGE_CODE = 'en-us'
@@ -108,6 +184,11 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resume uploads are streamed to disk, hashed and stored once per content
+RESUME_UPLOAD_MAX_SIZE = int(os.environ.get('RESUME_UPLOAD_MAX_SIZE', 5 * 1024 * 1024))
+# Whole multipart body (resume plus cover letter); larger requests are refused unread
+RESUME_UPLOAD_MAX_REQUEST_SIZE = RESUME_UPLOAD_MAX_SIZE + 256 * 1024
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'  # CORRECT
 
@@ -119,15 +200,104 @@ LOGOUT_REDIRECT_URL = '/'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
 }
 
+# Job list pagination (home page and /api/jobs/)
+JOB_LIST_PAGE_SIZE = 20
+JOB_LIST_MAX_PAGE_SIZE = 100
+
+# /api/jobs/batch/?ids=: most ids accepted in one request
+JOB_BATCH_MAX_IDS = 100
+
+# /api/applications/status/: most applications changed in one request
+APPLICATION_STATUS_BATCH_MAX = 5000
+
+# Streamed list responses (?stream=1 / NDJSON): rows fetched per database round trip
+API_STREAM_CHUNK_SIZE = 2000
+
+# jobs.search.search(): upper bound on the hits it returns.  ?q= lists join the
+# index instead and are not capped.
+SEARCH_MAX_RESULTS = 1000
+
+# Applicant search for employers: text kept per resume, terms indexed per application
+RESUME_TEXT_MAX_CHARS = 100_000
+APPLICANT_INDEX_MAX_TERMS = 2000
+APPLICANT_SEARCH_MAX_RESULTS = 1000
+
+# Request metrics (query count, SQL/template time, Server-Timing header)
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', '1.0'))
+REQUEST_METRICS_SERVER_TIMING = True
+
+# Background tasks (tasks app). Eager runs them inline, without a worker;
+# production queues them for `manage.py run_workers`.
+TASKS_ALWAYS_EAGER = os.environ.get('TASKS_ALWAYS_EAGER', '1') == '1'
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_BACKOFF = 10  # seconds before the first retry, doubled each time
+TASKS_RETRY_BACKOFF_MAX = 3600
+TASKS_LOCK_TIMEOUT = 600  # running tasks older than this are handed out again
+TASKS_POLL_INTERVAL = 1.0
+TASKS_DONE_RETENTION = 86400
+
+# Seconds an Idempotency-Key response is replayed (run purge_idempotency_keys)
+IDEMPOTENCY_KEY_RETENTION = 86400
+
+# Live application status events (/api/my-applications/events/, needs ASGI).
+# jobs.events.RedisBroker shares them across processes and is the default
+# whenever a Redis URL is configured; InProcessBroker only reaches clients of
+# the process that made the change (see the jobs.W001 system check).
+EVENTS_REDIS_URL = os.environ.get('EVENTS_REDIS_URL') or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+EVENTS_BROKER = os.environ.get('EVENTS_BROKER') or (
+    'jobs.events.RedisBroker' if os.environ.get('EVENTS_REDIS_URL') or os.environ.get('REDIS_URL')
+    else 'jobs.events.InProcessBroker'
+)
+# Web server worker processes; must match uvicorn --workers (Procfile)
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+EVENTS_HEARTBEAT = 15  # seconds between keepalive comments
+EVENTS_QUEUE_SIZE = 100  # undelivered events kept per connection
+
+# Email (employer notifications); printed to the console unless configured
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@jobportal.local')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'jobportal.requests': {
+            'handlers': ['console'],
+            'level': 'WARNING' if TESTING else os.environ.get('REQUEST_METRICS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'tasks': {
+            'handlers': ['console'],
+            # Retry and failure tests log on purpose.
+            'level': 'CRITICAL' if TESTING else 'INFO',
+            'propagate': False,
+        },
+        'jobs': {
+            'handlers': ['console'],
+            # Test fixtures point at resume files that were never stored.
+            'level': 'ERROR' if TESTING else 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 # JWT settings
 from datetime import timedelta
+# Users resolved from JWTs are cached per process (api.authentication);
+# a deactivated user is locked out of other processes within the TTL.
+JWT_USER_CACHE_SIZE = 10000
+JWT_USER_CACHE_TTL = int(os.environ.get('JWT_USER_CACHE_TTL', 60))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -145,11 +315,23 @@ if os.environ.get('DJANGO_ENV') == 'production':
     DEBUG = False
     ALLOWED_HOSTS = ['.yourdomain.com', 'localhost']
     
+    # Only instrument a sample of requests behind gunicorn
+    REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', '0.05'))
+    
+    # The Procfile starts this many uvicorn workers
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 2))
+    
+    # Side effects go through the queue; run `manage.py run_workers` (Procfile)
+    TASKS_ALWAYS_EAGER = os.environ.get('TASKS_ALWAYS_EAGER', '0') == '1'
+    
     # Database
     import dj_database_url
     DATABASES = {
         'default': dj_database_url.config(default=config('DATABASE_URL'))
     }
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+        # Options given in DATABASE_URL win over the profile's
+        DATABASES['default']['OPTIONS'] = {**SQLITE_OPTIONS, **DATABASES['default'].get('OPTIONS', {})}
     
     # Static files
     STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
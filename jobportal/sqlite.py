@@ -0,0 +1,44 @@
+"""
+SQLite connection options for running under several web and task workers.
+
+With SQLite's defaults a writer blocks every reader.  Worse, a transaction
+that reads and then writes starts as a reader: if another connection took
+the write lock in between, SQLite refuses the upgrade with "database is
+locked" at once, without waiting for the busy timeout, since waiting could
+deadlock.  The ``production`` profile avoids both problems:
+
+* ``journal_mode=WAL``: readers and the single writer no longer block each
+  other.
+* ``synchronous=NORMAL``: fsync at checkpoints instead of at every commit.
+  In WAL mode this cannot corrupt the database; a power cut can lose the
+  last commits.
+* ``busy_timeout``: wait this long for the write lock rather than failing.
+* ``mmap_size``: read database pages through a memory map.
+* ``transaction_mode=IMMEDIATE``: every ``atomic()`` block takes the write
+  lock at BEGIN.  Writers then queue on the busy timeout instead of
+  failing halfway through, and writes are serialized.  Reads outside
+  ``atomic()`` stay concurrent.
+
+WAL is stored in the database file.  Switching back to ``stock`` leaves a
+database in WAL mode until ``PRAGMA journal_mode=DELETE`` is run on it.
+"""
+PROFILES = ('production', 'stock')
+
+
+def options(profile='production', busy_timeout=20.0, mmap_size=256 * 1024 * 1024):
+    """``DATABASES[...]['OPTIONS']`` for the sqlite3 backend; ``busy_timeout`` in seconds."""
+    if profile not in PROFILES:
+        raise ValueError(f'Unknown SQLite profile {profile!r}; use one of {", ".join(PROFILES)}')
+    if profile == 'stock':
+        return {'timeout': busy_timeout}
+    pragmas = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(busy_timeout * 1000),
+        'mmap_size': mmap_size,
+    }
+    return {
+        'timeout': busy_timeout,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items()),
+    }
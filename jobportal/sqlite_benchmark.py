@@ -0,0 +1,223 @@
+"""
+Concurrent read/write benchmark of the SQLite connection profiles.
+
+``run`` seeds one database, copies it once per profile and starts
+``workers`` processes on each copy, every one with its own connection,
+like web and task workers sharing the file.  For ``duration`` seconds each
+worker loops over a mixed workload: job board pages and job details
+(reads), applications and bulk status changes (writes), picking a write
+``write_ratio`` of the time.  Failed operations are counted by error
+message instead of stopping the run, so "database is locked" under the
+stock profile shows up next to the throughput of the production one.
+"""
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+from .loadtest import percentile
+from .sqlite import PROFILES
+
+READS = ('list', 'detail')
+WRITES = ('apply', 'status')
+# Seconds to wait for the workers to start (django.setup) and to report back.
+START_TIMEOUT = 120
+
+
+def _environ(path, profile):
+    environ = {**os.environ, 'SQLITE_PATH': str(path), 'SQLITE_PROFILE': profile,
+               # Tasks are queued as rows, as a web worker does in production.
+               'TASKS_ALWAYS_EAGER': '0'}
+    # The production block would point DATABASES at DATABASE_URL instead.
+    environ.pop('DJANGO_ENV', None)
+    return environ
+
+
+def prepare(path, jobs=2000, seed=0):
+    """Migrate and seed a new database at ``path`` with ``manage.py`` in a subprocess."""
+    manage = [sys.executable, str(settings.BASE_DIR / 'manage.py')]
+    environ = _environ(path, 'stock')
+    subprocess.run(manage + ['migrate', '--noinput', '--verbosity', '0'],
+                   env=environ, check=True, capture_output=True, text=True)
+    subprocess.run(manage + ['seed_portal', '--jobs', str(jobs), '--users', str(max(2, jobs // 2)),
+                             '--applications', str(jobs * 2), '--seed', str(seed)],
+                   env=environ, check=True, capture_output=True, text=True)
+
+
+class Workload:
+    """The operations a worker picks from, over the ids found in the database."""
+
+    def __init__(self, rng):
+        from django.contrib.auth.models import User
+        from jobs.models import Job, JobApplication
+
+        self.rng = rng
+        self.job_ids = list(Job.objects.filter(is_active=True).values_list('id', flat=True))
+        self.category_ids = list(Job.objects.filter(is_active=True).values_list('category_id', flat=True).distinct())
+        self.seeker_ids = list(User.objects.filter(is_staff=False).values_list('id', flat=True))
+        self.application_ids = list(JobApplication.objects.values_list('id', flat=True))
+        self.statuses = [status for status, _ in JobApplication.APPLICATION_STATUS]
+        if not (self.job_ids and self.seeker_ids and self.application_ids):
+            raise ValueError('The database has no active jobs or applications to work with.')
+
+    def list(self):
+        from jobs.models import Job
+        from jobs.pagination import keyset_paginate
+
+        jobs = Job.objects.filter(is_active=True).select_related('category', 'posted_by')
+        if self.rng.random() < 0.5:
+            jobs = jobs.filter(category_id=self.rng.choice(self.category_ids))
+        keyset_paginate(jobs)
+
+    def detail(self):
+        from jobs.models import Job
+
+        Job.objects.select_related('category', 'posted_by').get(pk=self.rng.choice(self.job_ids))
+
+    def apply(self):
+        from jobs.applications import AlreadyApplied, submit_application
+        from jobs.models import JobApplication
+
+        application = JobApplication(
+            job_id=self.rng.choice(self.job_ids), applicant_id=self.rng.choice(self.seeker_ids),
+            resume='resumes/seed.pdf', cover_letter='Benchmark application.',
+        )
+        try:
+            submit_application(application)
+        except AlreadyApplied:
+            pass
+
+    def status(self):
+        from jobs.applications import update_statuses
+
+        update_statuses({
+            application_id: self.rng.choice(self.statuses)
+            for application_id in self.rng.sample(self.application_ids, 5)
+        })
+
+
+def _work(duration, write_ratio, seed, barrier):
+    from django.db import DatabaseError, connection
+
+    rng = random.Random(seed)
+    workload = Workload(rng)
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+    operations, errors = Counter(), Counter()
+    latencies = {'read': [], 'write': []}
+
+    barrier.wait(timeout=START_TIMEOUT)
+    started = time.monotonic()
+    deadline = started + duration
+    while time.monotonic() < deadline:
+        kind = 'write' if rng.random() < write_ratio else 'read'
+        name = rng.choice(WRITES if kind == 'write' else READS)
+        start = time.perf_counter()
+        try:
+            getattr(workload, name)()
+        except DatabaseError as exc:
+            errors[str(exc)] += 1
+            continue
+        latencies[kind].append((time.perf_counter() - start) * 1000)
+        operations[name] += 1
+    return {'journal_mode': journal_mode, 'elapsed': time.monotonic() - started,
+            'operations': operations, 'errors': errors, 'latencies': latencies}
+
+
+def _worker(path, profile, duration, write_ratio, seed, barrier, results):
+    environ = _environ(path, profile)
+    os.environ.clear()
+    os.environ.update(environ)
+    try:
+        import django
+        django.setup()
+        results.put(_work(duration, write_ratio, seed, barrier))
+    except BaseException:
+        barrier.abort()
+        results.put({'failed': traceback.format_exc()})
+
+
+def _milliseconds(values):
+    values = sorted(values)
+    if not values:
+        return {'p50': None, 'p99': None, 'max': None}
+    return {'p50': round(percentile(values, 0.50), 2), 'p99': round(percentile(values, 0.99), 2),
+            'max': round(values[-1], 2)}
+
+
+def measure(path, profile, workers=4, duration=10.0, write_ratio=0.2, seed=0):
+    """Run the workload on ``path`` from ``workers`` processes; returns a summary dict."""
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(str(path), profile, duration, write_ratio, seed + index, barrier, results))
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        # Collected before join(): a worker exits only once its result is read.
+        outcomes = [results.get(timeout=START_TIMEOUT + duration) for _ in processes]
+    except queue.Empty:
+        raise RuntimeError(f'The {profile} workers did not report back.')
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+    failed = [outcome['failed'] for outcome in outcomes if 'failed' in outcome]
+    if failed:
+        raise RuntimeError(f'A {profile} worker failed:\n{failed[0]}')
+
+    operations, errors = Counter(), Counter()
+    latencies = {'read': [], 'write': []}
+    for outcome in outcomes:
+        operations.update(outcome['operations'])
+        errors.update(outcome['errors'])
+        for kind, values in outcome['latencies'].items():
+            latencies[kind] += values
+    elapsed = max(outcome['elapsed'] for outcome in outcomes)
+    reads = sum(operations[name] for name in READS)
+    writes = sum(operations[name] for name in WRITES)
+    return {
+        'profile': profile,
+        'journal_mode': outcomes[0]['journal_mode'],
+        'workers': workers,
+        'seconds': round(elapsed, 2),
+        'operations': dict(operations),
+        'reads': reads,
+        'writes': writes,
+        'reads_per_second': round(reads / elapsed, 1),
+        'writes_per_second': round(writes / elapsed, 1),
+        'read_ms': _milliseconds(latencies['read']),
+        'write_ms': _milliseconds(latencies['write']),
+        'errors': dict(errors),
+    }
+
+
+def run(profiles=PROFILES, workers=4, duration=10.0, write_ratio=0.2, jobs=2000, seed=0, progress=None):
+    """Seed once, then ``measure`` every profile on its own copy; returns one summary per profile."""
+    report = progress or (lambda message: None)
+    with tempfile.TemporaryDirectory() as scratch:
+        seeded = Path(scratch) / 'seeded.sqlite3'
+        started = time.perf_counter()
+        prepare(seeded, jobs=jobs, seed=seed)
+        report(f'{jobs} jobs seeded in {time.perf_counter() - started:.1f}s')
+        summaries = []
+        for profile in profiles:
+            path = Path(scratch) / f'{profile}.sqlite3'
+            shutil.copyfile(seeded, path)
+            summaries.append(measure(path, profile, workers, duration, write_ratio, seed))
+        return summaries
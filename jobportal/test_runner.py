@@ -0,0 +1,28 @@
+"""
+Test runner that applies ``TEST_SETTINGS`` for the whole run.
+
+Cheap password hashing lives here rather than in settings.py, so no process
+outside the test runner can rehash real users' passwords down to it.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_SETTINGS = {
+    # Hashing at Django's default work factor dominates the suite's runtime.
+    'PASSWORD_PBKDF2_ITERATIONS': 1000,
+    # ...which is far below the production floor that check enforces.
+    'SILENCED_SYSTEM_CHECKS': ['accounts.E001'],
+    # Tests that need the limits enable them with override_settings.
+    'LOGIN_RATE_LIMITS': {},
+}
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._test_settings = override_settings(**TEST_SETTINGS)
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,20 @@
+"""
+URLconf for ASGI mode (``ASYNC_VIEWS=1``, the default in ``jobportal.asgi``).
+
+The public read paths are served by async views; every other route, and
+all URL names, are those of ``jobportal.urls``.
+"""
+from django.urls import path
+
+from api import views as api_views
+from jobs import views as jobs_views
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('', jobs_views.async_home_view, name='home'),
+    path('job/<int:job_id>/', jobs_views.async_job_detail_view, name='job_detail'),
+    path('api/jobs/', api_views.async_job_list_api, name='api_jobs'),
+    path('api/jobs/<int:id>/', api_views.async_job_detail_api, name='api_job_detail'),
+    *sync_urlpatterns,
+]
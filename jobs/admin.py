@@ -1,6 +1,7 @@
 
 # Register your models here.
 from django.contrib import admin
+from .applications import update_statuses
 from .models import Job, JobCategory, JobApplication
 
 @admin.register(JobCategory)
@@ -14,10 +15,39 @@ class JobAdmin(admin.ModelAdmin):
     list_filter = ['job_type', 'is_active', 'created_at']
     search_fields = ['title', 'company', 'location']
     list_editable = ['is_active']
+    # Maintained by jobs.counters; Job.save() never writes them.
+    readonly_fields = Job.COUNTER_FIELDS
 
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
     list_display = ['job', 'applicant', 'status', 'applied_at']
+    list_select_related = ['job', 'applicant']
     list_filter = ['status', 'applied_at']
     search_fields = ['job__title', 'applicant__username', 'applicant__email']
-    list_editable = ['status']
\ No newline at end of file
+    list_editable = ['status']
+    actions = ['mark_pending', 'mark_reviewed', 'mark_accepted', 'mark_rejected']
+    
+    def _set_status(self, request, queryset, status):
+        # One UPDATE for the whole selection; staff who are not superusers
+        # only change applications to their own jobs.
+        owner = None if request.user.is_superuser else request.user
+        ids = list(queryset.values_list('pk', flat=True))
+        result = update_statuses(dict.fromkeys(ids, status), owner=owner)
+        self.message_user(request, f'{len(result.updated)} application(s) marked as {status}.')
+    
+    @admin.action(description='Mark selected applications as pending')
+    def mark_pending(self, request, queryset):
+        self._set_status(request, queryset, 'pending')
+    
+    @admin.action(description='Mark selected applications as reviewed')
+    def mark_reviewed(self, request, queryset):
+        self._set_status(request, queryset, 'reviewed')
+    
+    @admin.action(description='Mark selected applications as accepted')
+    def mark_accepted(self, request, queryset):
+        self._set_status(request, queryset, 'accepted')
+    
+    @admin.action(description='Mark selected applications as rejected')
+    def mark_rejected(self, request, queryset):
+        self._set_status(request, queryset, 'rejected')
+
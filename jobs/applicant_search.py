@@ -0,0 +1,83 @@
+"""
+Per-job inverted index over applications, for employers searching applicants.
+
+Each application contributes one ``ApplicantTerm`` row per distinct term of
+its resume text and cover letter.  The weight is a saturated term frequency
+(as in BM25), with cover letter occurrences counting double since they are
+written for this job.  A search is one indexed lookup on (job, term) plus a
+grouped sum, weighted by each term's rarity among the job's applicants;
+resume files are never opened at query time.
+"""
+import math
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from .models import ApplicantTerm, Job
+from .search import tokenize
+
+TERM_MAX_LENGTH = 64
+# BM25 term-frequency saturation
+K1 = 1.2
+COVER_LETTER_BOOST = 2
+
+
+def terms_for(resume_text, cover_letter):
+    counts = Counter()
+    for text, boost in ((resume_text, 1), (cover_letter, COVER_LETTER_BOOST)):
+        for token in tokenize(text):
+            if 1 < len(token) <= TERM_MAX_LENGTH:
+                counts[token] += boost
+    limit = getattr(settings, 'APPLICANT_INDEX_MAX_TERMS', 2000)
+    return {term: _weight(count) for term, count in counts.most_common(limit)}
+
+
+def _weight(count):
+    return round(100 * count * (K1 + 1) / (count + K1))
+
+
+def index_application(application, resume_text=''):
+    """Replace the index rows of ``application``."""
+    rows = [
+        ApplicantTerm(job_id=application.job_id, application_id=application.pk, term=term, weight=weight)
+        for term, weight in terms_for(resume_text, application.cover_letter).items()
+    ]
+    with transaction.atomic():
+        ApplicantTerm.objects.filter(application_id=application.pk).delete()
+        ApplicantTerm.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def search(job_id, query, limit=None):
+    """
+    ``[(application_id, score), ...]`` best first, for applications to
+    ``job_id`` whose resume or cover letter contains every query term.
+    """
+    terms = list(dict.fromkeys(token for token in tokenize(query) if len(token) <= TERM_MAX_LENGTH))
+    if not terms:
+        return []
+    limit = limit or getattr(settings, 'APPLICANT_SEARCH_MAX_RESULTS', 1000)
+    rows = ApplicantTerm.objects.filter(job_id=job_id, term__in=terms)
+
+    document_frequency = dict(rows.values_list('term').annotate(Count('id')).order_by())
+    if len(document_frequency) < len(terms):
+        return []
+    # The denormalized counter saves a COUNT over the job's applications.
+    total = Job.objects.filter(pk=job_id).values_list('application_count', flat=True).first() or 1
+    rarity = Case(
+        *[When(term=term, then=Value(_idf(total, frequency)))
+          for term, frequency in document_frequency.items()],
+        output_field=FloatField(),
+    )
+    hits = (rows.values('application_id')
+            .annotate(matched=Count('term'), score=Sum(F('weight') * rarity, output_field=FloatField()))
+            .filter(matched=len(terms))
+            .order_by('-score', '-application_id')
+            .values_list('application_id', 'score')[:limit])
+    return list(hits)
+
+
+def _idf(total, frequency):
+    return math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
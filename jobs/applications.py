@@ -0,0 +1,93 @@
+"""
+The apply path shared by ``apply_job_view`` and ``ApplyJobAPI``.
+
+Instead of checking for an existing application and then inserting (two
+round trips, and racy), the insert is attempted straight away inside a
+savepoint and the ``unique_together`` violation is turned into
+``AlreadyApplied``.
+
+``update_statuses`` is the bulk counterpart of saving one application with
+a new status: one UPDATE per target status, counters adjusted per job, and
+a single ``statuses_changed`` signal instead of a post_save per row.
+"""
+from collections import defaultdict, namedtuple
+
+from django.db import IntegrityError, transaction
+from django.dispatch import Signal
+
+from . import counters
+from .models import JobApplication
+from .uploads import discard_upload
+
+# Sent once per update_statuses() call with ``changes``, a list of
+# StatusChange for the rows whose status actually moved.
+statuses_changed = Signal()
+
+StatusChange = namedtuple('StatusChange', 'application_id job_id applicant_id old_status new_status')
+StatusUpdateResult = namedtuple('StatusUpdateResult', 'updated unchanged missing')
+
+
+class AlreadyApplied(Exception):
+    pass
+
+
+def submit_application(application):
+    """Save an unsaved ``JobApplication``; raise AlreadyApplied on a duplicate."""
+    try:
+        with transaction.atomic():
+            application.save()
+    except IntegrityError:
+        if not JobApplication.objects.filter(
+            job_id=application.job_id, applicant_id=application.applicant_id
+        ).exists():
+            raise
+        if application.resume:
+            # The upload was stored before the INSERT failed; the file may
+            # be shared with other applications, so only drop it if unused.
+            discard_upload(application.resume.name, application.resume.storage)
+        raise AlreadyApplied
+    return application
+
+
+def update_statuses(statuses, owner=None):
+    """
+    Apply ``{application_id: status}`` in bulk; returns a StatusUpdateResult.
+
+    With ``owner`` only applications to jobs that user posted are touched;
+    the others are reported as missing, like ids that do not exist.
+    """
+    valid = dict(JobApplication.APPLICATION_STATUS)
+    unknown = set(statuses.values()) - set(valid)
+    if unknown:
+        raise ValueError(f"Unknown status: {', '.join(sorted(unknown))}")
+
+    with transaction.atomic():
+        rows = JobApplication.objects.select_for_update().filter(pk__in=list(statuses))
+        if owner is not None:
+            rows = rows.filter(job__posted_by=owner)
+        changes = []
+        unchanged = []
+        for application_id, job_id, applicant_id, old_status in rows.values_list(
+                'pk', 'job_id', 'applicant_id', 'status'):
+            new_status = statuses[application_id]
+            if old_status == new_status:
+                unchanged.append(application_id)
+            else:
+                changes.append(StatusChange(application_id, job_id, applicant_id, old_status, new_status))
+
+        by_status = defaultdict(list)
+        for change in changes:
+            by_status[change.new_status].append(change.application_id)
+        for new_status, application_ids in by_status.items():
+            JobApplication.objects.filter(pk__in=application_ids).update(status=new_status)
+
+        if changes:
+            counters.record_status_changes(
+                (change.job_id, change.old_status, change.new_status) for change in changes
+            )
+            statuses_changed.send(sender=JobApplication, changes=changes)
+
+    found = {change.application_id for change in changes}.union(unchanged)
+    missing = [application_id for application_id in statuses if application_id not in found]
+    return StatusUpdateResult([change.application_id for change in changes], unchanged, missing)
+
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class JobsConfig(AppConfig):
     name = 'jobs'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
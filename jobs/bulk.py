@@ -0,0 +1,203 @@
+"""
+Bulk import and export of jobs as CSV or JSON Lines.
+
+Both directions stream: rows are read, validated with the ``JobForm`` rules
+and inserted one batch at a time, and exports walk the table with a
+server-side iterator, so memory stays bounded by the batch size whatever
+the file size.  ``bulk_create`` skips the Job signals, so each batch adds
+its own jobs to the facet counts and the search index in the same
+transaction, and the cache version is bumped once at the end.  An upload
+costs the size of the upload, not of the job table.
+"""
+import csv
+import io
+import json
+from collections import Counter, namedtuple
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import cache, facets, salary, search
+from .forms import JobImportForm
+from .models import Job, JobCategory
+
+FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = ['id', 'title', 'company', 'location', 'description', 'requirements',
+                 'salary', 'job_type', 'category', 'is_active', 'created_at']
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+ImportResult = namedtuple('ImportResult', ['rows', 'created', 'errors'])
+
+
+def guess_format(filename='', content_type=''):
+    if filename.lower().endswith(('.jsonl', '.ndjson')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'jsonl'
+    return 'csv'
+
+
+def read_rows(stream, fmt):
+    """Yield ``(line_number, row_dict)`` from a text stream."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = {'__error__': f'Invalid JSON: {exc}'}
+        if not isinstance(row, dict):
+            row = {'__error__': 'Expected a JSON object'}
+        yield line_number, row
+
+
+class CategoryResolver:
+    """Maps a category id or (case-insensitive) name to an id, from one query."""
+
+    def __init__(self):
+        self.by_id = {}
+        self.by_name = {}
+        for pk, name in JobCategory.objects.values_list('pk', 'name'):
+            self.by_id[str(pk)] = pk
+            self.by_name[name.strip().lower()] = pk
+
+    def resolve(self, value):
+        value = str(value if value is not None else '').strip()
+        if not value:
+            return None, None
+        category_id = self.by_id.get(value) or self.by_name.get(value.lower())
+        if category_id is None:
+            return None, f'Unknown category {value!r}.'
+        return category_id, None
+
+
+class RowValidator:
+    """
+    Applies the ``JobImportForm`` field and model validation to plain dicts.
+
+    Instantiating a form deep-copies all of its fields, which costs more than
+    the validation itself, so the form's ``base_fields`` are used directly and
+    shared by every row.
+    """
+
+    def __init__(self):
+        self.fields = JobImportForm.base_fields
+        self.categories = CategoryResolver()
+
+    def validate(self, row):
+        """An unsaved Job for a valid row, or ``(None, errors)``."""
+        if '__error__' in row:
+            return None, {'__all__': [row['__error__']]}
+        data = {key: ('' if value is None else value) for key, value in row.items()}
+        is_active = str(data.get('is_active', '')).strip().lower()
+        # Absent means active, unlike an unticked checkbox.
+        data['is_active'] = is_active in TRUE_VALUES if is_active else True
+
+        cleaned, errors = {}, {}
+        for name, field in self.fields.items():
+            try:
+                cleaned[name] = field.clean(field.widget.value_from_datadict(data, {}, name))
+            except ValidationError as exc:
+                errors[name] = list(exc.messages)
+        category_id, category_error = self.categories.resolve(row.get('category'))
+        if category_error:
+            errors['category'] = [category_error]
+        if errors:
+            return None, errors
+
+        job = Job(category_id=category_id, **cleaned)
+        try:
+            # Foreign keys are excluded: validating them is a query per row.
+            job.full_clean(exclude=['posted_by', 'category'], validate_unique=False)
+        except ValidationError as exc:
+            return None, exc.message_dict
+        return job, None
+
+
+def import_jobs(stream, fmt, posted_by, batch_size=1000, dry_run=False, on_error=None):
+    """
+    Validate and insert the jobs in ``stream``.  Each batch of valid rows is
+    inserted in its own transaction; invalid rows are reported to
+    ``on_error(line_number, errors)`` and skipped.
+    """
+    validator = RowValidator()
+    rows = read_rows(stream, fmt)
+    total = created = error_count = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        jobs = []
+        for line_number, row in batch:
+            total += 1
+            job, errors = validator.validate(row)
+            if errors:
+                error_count += 1
+                if on_error is not None:
+                    on_error(line_number, errors)
+                continue
+            job.posted_by = posted_by
+            # bulk_create bypasses the pre_save signal that parses salaries.
+            salary.apply_to_job(job)
+            jobs.append(job)
+        if jobs and not dry_run:
+            with transaction.atomic():
+                Job.objects.bulk_create(jobs, batch_size=batch_size)
+                add_derived_data(jobs)
+            created += len(jobs)
+
+    if created:
+        transaction.on_commit(cache.bump_content_version)
+    return ImportResult(total, created, error_count)
+
+
+def add_derived_data(jobs):
+    """What the Job signals would have done for newly inserted ``jobs``."""
+    deltas = Counter()
+    for job in jobs:
+        deltas.update(facets.values_for_job(job).items())
+    for (facet, value), count in deltas.items():
+        facets.adjust(facet, value, count)
+    search.index_jobs([job for job in jobs if job.is_active])
+
+
+def refresh_derived_data():
+    """Bring everything the Job signals maintain up to date after bulk writes."""
+    facets.rebuild()
+    backend = search.get_backend()
+    backend.install()
+    backend.rebuild()
+    cache.bump_content_version()
+
+
+def export_rows(queryset):
+    """Yield one dict per job, streamed from the database in chunks."""
+    values = [field if field != 'category' else 'category__name' for field in EXPORT_FIELDS]
+    for row in queryset.order_by('pk').values_list(*values).iterator(chunk_size=2000):
+        record = dict(zip(EXPORT_FIELDS, row))
+        record['category'] = record['category'] or ''
+        record['created_at'] = record['created_at'].isoformat()
+        yield record
+
+
+def export_lines(queryset, fmt):
+    """Yield the export as text chunks (header first for CSV)."""
+    if fmt == 'jsonl':
+        for record in export_rows(queryset):
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for record in export_rows(queryset):
+        writer.writerow(record)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,223 @@
+"""
+Response cache for the public job board.
+
+Entries are keyed by the request URL and a global content version.  The
+version is bumped by the Job/JobCategory signals in ``jobs.signals``, which
+makes every older entry unreachable at once, so pages are never served
+stale and no TTL guesswork is needed.  Works on any Django cache backend
+that supports ``incr`` (local memory, Redis, Memcached).  Async views are
+wrapped with the cache's async API.
+
+The decorator only serves hits and marks misses; ``ResponseCacheMiddleware``
+stores a marked response once every other middleware has run, so anything
+they add for one client (CSRF cookies and tokens, ``Vary: Cookie``) is seen
+before the response is shared.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import cc_delim_re, get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+VERSION_KEY = 'jobs:content-version'
+# Headers that are specific to the request that filled the cache.
+UNCACHED_HEADERS = {'set-cookie', 'server-timing', 'x-cache'}
+
+
+def get_cache():
+    return caches[getattr(settings, 'JOB_BOARD_CACHE_ALIAS', 'default')]
+
+
+def get_content_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock rather than 1 so a version lost to eviction or
+        # a restart can never line up with entries written before.
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aget_content_version():
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, time.time_ns(), None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def bump_content_version():
+    cache = get_cache()
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        return cache.get(VERSION_KEY)
+
+
+def make_cache_key(request, version):
+    params = sorted(request.GET.lists())
+    # Host (absolute links) and Accept (DRF content negotiation) change the body.
+    accept = request.META.get('HTTP_ACCEPT', '')
+    raw = f'{request.method}:{request.get_host()}:{request.path}:{params}:{accept}:{version}'
+    return 'jobs:page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _is_cacheable_request(request, anonymous_only):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if anonymous_only and request.user.is_authenticated:
+        return False
+    # Pending flash messages are rendered into the page.
+    return CookieStorage.cookie_name not in request.COOKIES
+
+
+def _is_cacheable_response(response):
+    return response.status_code == 200 and not response.streaming
+
+
+def _varies_on_cookie(headers):
+    vary = ','.join(value for name, value in headers if name.lower() == 'vary')
+    return 'cookie' in {field.strip().lower() for field in cc_delim_re.split(vary)}
+
+
+def _is_shareable(request, response):
+    """Whether a rendered response, after all middleware, may go to other clients."""
+    if not _is_cacheable_response(response) or response.cookies:
+        return False
+    # A CSRF token was rendered or is about to be set for this client.
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE') or request.META.get('CSRF_COOKIE_USED'):
+        return False
+    # The browsable API renders the user and a CSRF token into the page.
+    renderer = getattr(response, 'accepted_renderer', None)
+    if renderer is not None and renderer.media_type.startswith('text/html'):
+        return False
+    # Only the variant for clients without cookies is shared.
+    return not (_varies_on_cookie(response.items()) and request.COOKIES)
+
+
+def _applies_to(request, entry):
+    return not (request.COOKIES and _varies_on_cookie(entry[1]))
+
+
+def _freeze(response):
+    headers = [(name, value) for name, value in response.items()
+               if name.lower() not in UNCACHED_HEADERS]
+    return response.status_code, headers, response.content
+
+
+def _thaw(request, entry):
+    status, headers, content = entry
+    # Revalidation against the stored validators costs no query either.
+    stored = {name.lower(): value for name, value in headers}
+    if 'etag' in stored or 'last-modified' in stored:
+        not_modified = get_conditional_response(
+            request,
+            etag=stored.get('etag'),
+            last_modified=parse_http_date_safe(stored.get('last-modified', '')),
+        )
+        if not_modified is not None:
+            return not_modified
+    response = HttpResponse(content, status=status)
+    for name, value in headers:
+        response[name] = value
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def cache_public_response(anonymous_only=True, timeout=None):
+    """
+    Cache a public GET view until the job board content changes.
+
+    With ``anonymous_only`` (the default) logged-in users bypass the cache,
+    for pages that render the current user.  ``timeout`` is a safety net
+    only; invalidation is driven by the content version.
+    """
+    def ttl():
+        return timeout if timeout is not None else getattr(settings, 'JOB_BOARD_CACHE_TIMEOUT', 300)
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            return _async_wrapper(view_func, anonymous_only, ttl)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable_request(request, anonymous_only):
+                return view_func(request, *args, **kwargs)
+
+            key = make_cache_key(request, get_content_version())
+            entry = get_cache().get(key)
+            if entry is not None and _applies_to(request, entry):
+                return _thaw(request, entry)
+            return _mark(view_func(request, *args, **kwargs), key, ttl())
+        return wrapper
+    return decorator
+
+
+def _mark(response, key, timeout):
+    if _is_cacheable_response(response):
+        response.job_board_cache = (key, timeout)
+        response['X-Cache'] = 'MISS'
+    return response
+
+
+def _async_wrapper(view_func, anonymous_only, ttl):
+    # Async views return rendered responses.  They resolve request.user with
+    # auser() before this runs, so the anonymous check does no sync query.
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if not _is_cacheable_request(request, anonymous_only):
+            return await view_func(request, *args, **kwargs)
+
+        key = make_cache_key(request, await aget_content_version())
+        entry = await get_cache().aget(key)
+        if entry is not None and _applies_to(request, entry):
+            return _thaw(request, entry)
+        return _mark(await view_func(request, *args, **kwargs), key, ttl())
+    return wrapper
+
+
+class ResponseCacheMiddleware:
+    """
+    Stores the responses ``cache_public_response`` marked as misses.  List it
+    right after the metrics middleware so its response phase runs last.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        pending = self._pending(request, response)
+        if pending is not None:
+            get_cache().set(*pending)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        pending = self._pending(request, response)
+        if pending is not None:
+            await get_cache().aset(*pending)
+        return response
+
+    def _pending(self, request, response):
+        marked = getattr(response, 'job_board_cache', None)
+        if marked is None or not _is_shareable(request, response):
+            return None
+        key, timeout = marked
+        return key, _freeze(response), timeout
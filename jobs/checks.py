@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+from django.utils.module_loading import import_string
+
+
+@register()
+def check_events_broker(app_configs, **kwargs):
+    """InProcessBroker loses events between web workers; warn when there are several."""
+    from .events import RedisBroker
+
+    broker = import_string(getattr(settings, 'EVENTS_BROKER', 'jobs.events.InProcessBroker'))
+    workers = getattr(settings, 'WEB_CONCURRENCY', 1)
+    if workers > 1 and not issubclass(broker, RedisBroker):
+        return [Warning(
+            f'EVENTS_BROKER is {settings.EVENTS_BROKER} but WEB_CONCURRENCY is {workers}: '
+            'status changes saved in one worker never reach live clients of the others.',
+            hint='Set REDIS_URL (or EVENTS_REDIS_URL) to use jobs.events.RedisBroker, or run one web worker.',
+            id='jobs.W001',
+        )]
+    return []
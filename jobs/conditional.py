@@ -0,0 +1,146 @@
+"""
+Validators for conditional GET (ETag / Last-Modified) on job pages.
+
+They are computed from a single indexed read, never from the rows being
+served, so a client revalidating with ``If-None-Match`` or
+``If-Modified-Since`` gets its 304 without any serialization or rendering.
+Use with ``django.views.decorators.http.condition``.
+
+The list validator combines the newest ``updated_at`` of the active jobs,
+their number (read from the facet counts, so no COUNT over the jobs) and
+the job board content version, which also moves on deletes and category
+changes.  ``Last-Modified`` alone cannot see hard deletes, which is why the
+ETag is preferred whenever a client sends both.
+
+``async_condition`` is the same decorator for async views: the validators
+query the database, so they are computed in a worker thread first.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db.models import Func, Subquery
+from django.views.decorators.http import condition
+
+from .cache import get_content_version
+from .models import Job, JobApplication, JobFacetCount
+
+
+def _digest(*parts):
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _has_flash_messages(request):
+    return CookieStorage.cookie_name in request.COOKIES
+
+
+def _user_key(request):
+    user = getattr(request, 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def job_list_state(request):
+    """``(newest updated_at, active job count)`` in one query, memoized per request."""
+    if not hasattr(request, '_job_list_state'):
+        # A plain SUM (not an aggregate, so no GROUP BY) over the few job_type rows.
+        total = (JobFacetCount.objects.filter(facet='job_type')
+                 .annotate(total=Func('count', function='SUM')).values('total'))
+        row = (Job.objects.filter(is_active=True).order_by('-updated_at')
+               .annotate(total=Subquery(total))
+               .values_list('updated_at', 'total').first())
+        request._job_list_state = row or (None, 0)
+    return request._job_list_state
+
+
+def job_list_last_modified(request, *args, **kwargs):
+    if _has_flash_messages(request):
+        return None
+    return job_list_state(request)[0]
+
+
+def _job_list_etag(request, user_key):
+    if _has_flash_messages(request):
+        return None
+    last_modified, total = job_list_state(request)
+    return _digest(
+        'list', last_modified, total, get_content_version(), user_key,
+        request.get_full_path(), request.META.get('HTTP_ACCEPT', ''),
+    )
+
+
+def job_list_etag(request, *args, **kwargs):
+    """ETag for the public API list, identical for every user."""
+    return _job_list_etag(request, None)
+
+
+def job_board_etag(request, *args, **kwargs):
+    """ETag for the home page, which also renders the current user."""
+    return _job_list_etag(request, _user_key(request))
+
+
+def job_detail_state(request, job_id):
+    """``updated_at`` of an active job (None if missing), memoized per request."""
+    if not hasattr(request, '_job_detail_state'):
+        request._job_detail_state = (Job.objects.filter(id=job_id, is_active=True)
+                                     .values_list('updated_at', flat=True).first())
+    return request._job_detail_state
+
+
+def job_detail_last_modified(request, job_id=None, id=None, **kwargs):
+    if _has_flash_messages(request):
+        return None
+    return job_detail_state(request, job_id or id)
+
+
+def job_detail_etag(request, job_id=None, id=None, **kwargs):
+    job_id = job_id or id
+    if _has_flash_messages(request):
+        return None
+    updated_at = job_detail_state(request, job_id)
+    if updated_at is None:
+        return None
+    return _digest(
+        'detail', job_id, updated_at, get_content_version(),
+        request.META.get('HTTP_ACCEPT', ''),
+    )
+
+
+def job_page_last_modified(request, job_id, **kwargs):
+    if _user_key(request) is not None:
+        # The page shows whether the user applied, which updated_at misses.
+        return None
+    return job_detail_last_modified(request, job_id)
+
+
+def job_page_etag(request, job_id, **kwargs):
+    """ETag for job_detail_view, which also shows whether the user applied."""
+    etag = job_detail_etag(request, job_id)
+    user_key = _user_key(request)
+    if etag is None or user_key is None:
+        return etag
+    has_applied = JobApplication.objects.filter(job_id=job_id, applicant_id=user_key).exists()
+    return _digest(etag, user_key, has_applied)
+
+
+def async_condition(etag_func=None, last_modified_func=None):
+    """``condition`` for async views, with the validators run via sync_to_async."""
+    def validators(request, *args, **kwargs):
+        return (
+            etag_func(request, *args, **kwargs) if etag_func else None,
+            last_modified_func(request, *args, **kwargs) if last_modified_func else None,
+        )
+
+    def decorator(view_func):
+        conditional_view = condition(
+            etag_func=etag_func and (lambda request, *args, **kwargs: request._validators[0]),
+            last_modified_func=last_modified_func and (lambda request, *args, **kwargs: request._validators[1]),
+        )(view_func)
+
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            request._validators = await sync_to_async(validators)(request, *args, **kwargs)
+            return await conditional_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
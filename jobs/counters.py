@@ -0,0 +1,85 @@
+"""
+Denormalized application counters on Job.
+
+Every change is a single ``UPDATE ... SET x = x + 1`` so concurrent
+applications never lose an increment and dashboards read the totals straight
+off the job rows.  ``reconcile`` recomputes them from JobApplication for the
+rare case they drift (raw SQL, bulk writes bypassing the signals).
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Job, JobApplication
+
+STATUS_FIELDS = {status: f'{status}_count' for status, _ in JobApplication.APPLICATION_STATUS}
+COUNTER_FIELDS = list(Job.COUNTER_FIELDS)
+
+
+def _apply(job_id, deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if changes:
+        Job.objects.filter(pk=job_id).update(**changes)
+
+
+def record_created(job_id, status):
+    _apply(job_id, {'application_count': 1, STATUS_FIELDS[status]: 1})
+
+
+def record_deleted(job_id, status):
+    _apply(job_id, {'application_count': -1, STATUS_FIELDS[status]: -1})
+
+
+def record_status_change(job_id, old_status, new_status):
+    if old_status == new_status:
+        return
+    _apply(job_id, {STATUS_FIELDS[old_status]: -1, STATUS_FIELDS[new_status]: 1})
+
+
+def record_status_changes(changes):
+    """``(job_id, old_status, new_status)`` triples, one UPDATE per job."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for job_id, old_status, new_status in changes:
+        if old_status != new_status:
+            deltas[job_id][STATUS_FIELDS[old_status]] -= 1
+            deltas[job_id][STATUS_FIELDS[new_status]] += 1
+    for job_id, job_deltas in deltas.items():
+        _apply(job_id, job_deltas)
+
+
+def counts_by_job(job_ids=None):
+    """Actual counters computed from JobApplication, keyed by job id."""
+    applications = JobApplication.objects.all()
+    if job_ids is not None:
+        applications = applications.filter(job_id__in=job_ids)
+    counts = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+    rows = applications.values('job_id', 'status').annotate(total=Count('id')).order_by()
+    for row in rows:
+        job_counts = counts[row['job_id']]
+        job_counts['application_count'] += row['total']
+        job_counts[STATUS_FIELDS[row['status']]] += row['total']
+    return counts
+
+
+def reconcile(job_ids=None, batch_size=1000, dry_run=False):
+    """Repair drifted counters; returns the number of jobs that were wrong."""
+    actual = counts_by_job(job_ids)
+    jobs = Job.objects.only('id', *COUNTER_FIELDS).order_by('pk')
+    if job_ids is not None:
+        jobs = jobs.filter(pk__in=job_ids)
+
+    empty = dict.fromkeys(COUNTER_FIELDS, 0)
+    drifted = []
+    for job in jobs.iterator(chunk_size=batch_size):
+        expected = actual.get(job.pk, empty)
+        if any(getattr(job, field) != expected[field] for field in COUNTER_FIELDS):
+            for field in COUNTER_FIELDS:
+                setattr(job, field, expected[field])
+            drifted.append(job)
+
+    if not dry_run:
+        for start in range(0, len(drifted), batch_size):
+            with transaction.atomic():
+                Job.objects.bulk_update(drifted[start:start + batch_size], COUNTER_FIELDS)
+    return len(drifted)
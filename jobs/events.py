@@ -0,0 +1,177 @@
+"""
+Live application status events for the applicant SSE stream.
+
+Status changes are published to a per-applicant channel once the
+transaction that made them commits.  ``application_events`` subscribes to
+that channel and holds the connection open on the event loop, so an idle
+subscriber costs a queue rather than a thread.
+
+The broker is chosen with ``EVENTS_BROKER``:
+
+* ``InProcessBroker`` delivers inside one process only, which is enough for
+  a single ASGI worker and for tests.  It is the default without Redis; the
+  ``jobs.W001`` check warns about it when ``WEB_CONCURRENCY`` is above one.
+* ``RedisBroker`` publishes through Redis pub/sub so changes made by any web
+  or task worker reach subscribers held by any ASGI worker.  Each process
+  keeps a single pattern subscription and fans out locally.  It is the
+  default when ``REDIS_URL`` or ``EVENTS_REDIS_URL`` is set, and needs the
+  ``redis`` package (in requirements.txt).
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = aioredis = None
+
+logger = logging.getLogger('jobs.events')
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def channel_for(user_id):
+    return f'applications:{user_id}'
+
+
+class Subscription:
+    """Messages for one connected client, filled from any thread."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    def put(self, message):
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The subscriber's loop is gone; it unsubscribes on its way out.
+            pass
+
+    def _put(self, message):
+        if self.queue.full():
+            # A client that stopped reading loses the oldest updates, not the newest.
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        maxsize = getattr(settings, 'EVENTS_QUEUE_SIZE', 100)
+        subscription = Subscription(asyncio.get_running_loop(), maxsize)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscription)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisBroker(InProcessBroker):
+    prefix = 'jobportal:events:'
+
+    def __init__(self, url=None):
+        if redis is None:
+            raise RuntimeError('RedisBroker needs the redis package')
+        super().__init__()
+        self.url = url or settings.EVENTS_REDIS_URL
+        self._client = redis.Redis.from_url(self.url)
+        self._listeners = {}
+
+    def publish(self, channel, message):
+        self._client.publish(self.prefix + channel, json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        loop = asyncio.get_running_loop()
+        listener = self._listeners.get(loop)
+        if listener is None or listener.done():
+            self._listeners[loop] = loop.create_task(self._listen())
+        async with super().subscribe(channel) as subscription:
+            yield subscription
+
+    async def _listen(self):
+        while True:
+            client = aioredis.from_url(self.url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.prefix + '*')
+                    async for message in pubsub.listen():
+                        if message['type'] != 'pmessage':
+                            continue
+                        channel = message['channel'].decode()[len(self.prefix):]
+                        self.deliver(channel, json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Lost the Redis event subscription, reconnecting')
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'EVENTS_BROKER', 'jobs.events.InProcessBroker')
+                _broker = import_string(path)()
+                # uvicorn does not run the system checks; repeat jobs.W001 here.
+                if type(_broker) is InProcessBroker and getattr(settings, 'WEB_CONCURRENCY', 1) > 1:
+                    logger.warning('InProcessBroker with WEB_CONCURRENCY=%s: live status events '
+                                 'only reach clients of the worker that saved the change.',
+                                 settings.WEB_CONCURRENCY)
+    return _broker
+
+
+def status_event(change):
+    return {'id': change.application_id, 'job': change.job_id, 'status': change.new_status}
+
+
+def publish_status_changes(changes):
+    """Publish ``StatusChange`` rows to their applicants after commit."""
+    changes = list(changes)
+    if not changes:
+        return
+
+    def publish():
+        broker = get_broker()
+        for change in changes:
+            try:
+                broker.publish(channel_for(change.applicant_id), status_event(change))
+            except Exception:
+                # Live updates are best effort; the status itself is saved.
+                logger.exception('Could not publish status change of application %s', change.application_id)
+
+    transaction.on_commit(publish)
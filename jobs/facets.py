@@ -0,0 +1,143 @@
+"""
+Facet filters and per-value counts for the public job list.
+
+Counts live in ``JobFacetCount`` and are adjusted with ``F()`` updates from
+the Job save/delete signals, so rendering the sidebar is a single indexed
+read instead of a GROUP BY over every active job.  Counts for a search are
+grouped over its matches instead.
+"""
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import Job, JobCategory, JobFacetCount
+
+FACETS = ('category', 'job_type', 'location')
+LOCATION_LIMIT = 10
+
+
+def facet_values(is_active, category_id, job_type, location):
+    """The facet values a job contributes to; inactive jobs count for nothing."""
+    if not is_active:
+        return {}
+    values = {'job_type': job_type, 'location': location}
+    if category_id is not None:
+        values['category'] = str(category_id)
+    return {facet: value for facet, value in values.items() if value}
+
+
+def values_for_job(job):
+    return facet_values(job.is_active, job.category_id, job.job_type, job.location)
+
+
+def stored_values(job_id):
+    """Facet values of a job as currently saved in the database."""
+    row = (Job.objects.filter(pk=job_id)
+           .values('is_active', 'category_id', 'job_type', 'location').first())
+    return facet_values(**row) if row else {}
+
+
+def apply_change(old, new):
+    """Move counts from the ``old`` facet values of a job to the ``new`` ones."""
+    for facet in FACETS:
+        before, after = old.get(facet), new.get(facet)
+        if before == after:
+            continue
+        if before is not None:
+            adjust(facet, before, -1)
+        if after is not None:
+            adjust(facet, after, 1)
+
+
+def adjust(facet, value, delta):
+    counts = JobFacetCount.objects.filter(facet=facet, value=value)
+    if counts.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            JobFacetCount.objects.create(facet=facet, value=value, count=delta)
+    except IntegrityError:
+        # Another writer created the row first.
+        counts.update(count=F('count') + delta)
+
+
+def rebuild():
+    """Recompute every count from scratch (after bulk writes or to fix drift)."""
+    rows = _grouped_rows(Job.objects.filter(is_active=True))
+    with transaction.atomic():
+        JobFacetCount.objects.all().delete()
+        JobFacetCount.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def filter_jobs(queryset, params):
+    """Apply ``?category=``, ``?job_type=`` and ``?location=`` filters."""
+    category = params.get('category', '')
+    if category.isdigit():
+        queryset = queryset.filter(category_id=int(category))
+    job_type = params.get('job_type', '')
+    if job_type in dict(Job.JOB_TYPE_CHOICES):
+        queryset = queryset.filter(job_type=job_type)
+    location = params.get('location', '').strip()
+    if location:
+        queryset = queryset.filter(location=location)
+    return queryset
+
+
+def get_facet_counts(categories=None, jobs=None):
+    """
+    Return ``{facet: [{'value', 'label', 'count'}, ...]}`` ordered by count.
+
+    ``categories`` may be passed in when the caller already loaded them to
+    avoid a second query for their names.  ``jobs`` (e.g. the matches of a
+    search) counts that queryset instead of every active job.
+    """
+    if categories is None:
+        categories = JobCategory.objects.all()
+    rows = _count_rows() if jobs is None else _grouped_rows(jobs)
+    return _facet_counts(rows, categories)
+
+
+async def aget_facet_counts(categories, jobs=None):
+    """Async version of get_facet_counts()."""
+    if jobs is None:
+        rows = [row async for row in _count_rows()]
+    else:
+        rows = await sync_to_async(_grouped_rows)(jobs)
+    return _facet_counts(rows, categories)
+
+
+def _count_rows():
+    return JobFacetCount.objects.filter(count__gt=0).order_by('-count', 'value')
+
+
+def _grouped_rows(jobs):
+    """Unsaved JobFacetCount rows for ``jobs``, grouped per facet value."""
+    rows = []
+    for facet in FACETS:
+        field = 'category_id' if facet == 'category' else facet
+        for row in jobs.values(field).annotate(total=Count('id')).order_by():
+            if row[field] in (None, ''):
+                continue
+            rows.append(JobFacetCount(facet=facet, value=str(row[field]), count=row['total']))
+    return sorted(rows, key=lambda row: (-row.count, row.value))
+
+
+def _facet_counts(rows, categories):
+    category_names = {str(category.pk): category.name for category in categories}
+    job_types = dict(Job.JOB_TYPE_CHOICES)
+
+    facets = {facet: [] for facet in FACETS}
+    for row in rows:
+        if row.facet == 'category':
+            label = category_names.get(row.value)
+            if label is None:
+                continue
+        elif row.facet == 'job_type':
+            label = job_types.get(row.value, row.value)
+        else:
+            if len(facets['location']) >= LOCATION_LIMIT:
+                continue
+            label = row.value
+        facets[row.facet].append({'value': row.value, 'label': label, 'count': row.count})
+    return facets
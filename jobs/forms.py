@@ -20,4 +20,8 @@ class ApplicationForm(forms.ModelForm):
                 'rows': 5,
                 'placeholder': 'Write your cover letter here...'
             }),
-        }
\ No newline at end of file
+        }
+class JobImportForm(JobForm):
+    """JobForm rules for one imported row; the importer resolves the category."""
+    class Meta(JobForm.Meta):
+        fields = [field for field in JobForm.Meta.fields if field != 'category']
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs import cache, salary
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Parse Job.salary text into the structured salary fields, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--missing-only', action='store_true',
+                            help='Only parse jobs that have salary text but no parsed range.')
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.all()
+        if options['missing_only']:
+            jobs = jobs.exclude(salary='').filter(salary_max__isnull=True)
+        seen, updated = salary.backfill(jobs, batch_size=options['batch_size'])
+        if updated:
+            # bulk_update skips the signals that invalidate cached pages.
+            cache.bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f'{seen} job(s) parsed, {updated} updated.'))
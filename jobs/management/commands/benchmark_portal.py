@@ -0,0 +1,134 @@
+import json
+import platform
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from jobportal import benchmark
+from jobs import seeding
+
+
+class Command(BaseCommand):
+    help = ('Seed the database at each scale and measure latency percentiles and queries '
+            'per request for every page and API endpoint. The seeded data is rolled back '
+            'unless --keep is given. Write JSON with --json and diff two runs with --compare.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1000,10000',
+                            help='Comma separated job counts to measure at (default: 1000,10000).')
+        parser.add_argument('--users-per-job', type=float, default=0.5)
+        parser.add_argument('--applications-per-job', type=float, default=3.0)
+        parser.add_argument('--requests', type=int, default=20, help='Measured requests per endpoint and scale.')
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Keep the page cache between requests (default: every request is a miss).')
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Only measure this URL name (repeatable).')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed of the generated data.')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded data.')
+        parser.add_argument('--json', dest='json_path', help='Write the results to this file.')
+        parser.add_argument('--compare', metavar='BASELINE', help='Results file of an earlier run to compare with.')
+        parser.add_argument('--threshold', type=float, default=1.25,
+                            help='p50 slowdown ratio counted as a regression by --compare.')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Exit with an error when --compare finds a regression.')
+
+    def handle(self, *args, **options):
+        try:
+            scales = sorted({int(value) for value in options['scales'].split(',') if value.strip()})
+        except ValueError:
+            raise CommandError('--scales takes comma separated job counts, e.g. 1000,10000')
+        if not scales or scales[0] < 1 or options['requests'] < 1:
+            raise CommandError('Scales and --requests must be positive.')
+
+        report = {
+            'commit': _git_commit(),
+            'created': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests': options['requests'],
+            'warm_cache': options['warm_cache'],
+            'scales': [],
+        }
+        overrides = {
+            'ALLOWED_HOSTS': ['testserver'],
+            # A private cache, so clearing it between requests leaves the site's alone.
+            'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                   'LOCATION': 'benchmark'}},
+            'LOGIN_RATE_LIMITS': {},
+            'REQUEST_METRICS_SAMPLE_RATE': 0.0,
+            'TASKS_ALWAYS_EAGER': True,
+        }
+        with override_settings(**overrides), transaction.atomic():
+            seeded = 0
+            for jobs in scales:
+                started = time.perf_counter()
+                added = jobs - seeded
+                seeding.seed(
+                    jobs=added,
+                    users=max(2, round(added * options['users_per_job'])),
+                    applications=round(added * options['applications_per_job']),
+                    random_seed=options['seed'] + jobs,
+                )
+                seeded = jobs
+                seed_seconds = time.perf_counter() - started
+                self.stdout.write(f'{jobs} jobs seeded in {seed_seconds:.1f}s')
+
+                results, skipped, unmeasured = benchmark.run(
+                    requests=options['requests'],
+                    warm_cache=options['warm_cache'],
+                    only=set(options['endpoints']) if options['endpoints'] else None,
+                )
+                report['scales'].append({'jobs': jobs, 'seed_seconds': round(seed_seconds, 1), 'endpoints': results})
+                report['skipped'], report['unmeasured'] = skipped, unmeasured
+                self._report(results)
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        for name, reason in report['skipped'].items():
+            self.stdout.write(f'skipped {name}: {reason}')
+        for name in report['unmeasured']:
+            self.stdout.write(self.style.WARNING(f'not measured: {name} (add it to jobportal.benchmark)'))
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as out:
+                json.dump(report, out, indent=2)
+        if options['compare']:
+            self._compare(options, report)
+
+    def _report(self, results):
+        self.stdout.write(f'  {"endpoint":<27} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"queries":>8}  status')
+        for result in results:
+            latency = result['latency_ms']
+            self.stdout.write(
+                f'  {result["name"]:<27} {latency["p50"]:>8} {latency["p90"]:>8} {latency["p99"]:>8} '
+                f'{result["queries"]["max"]:>8}  {result["status"]}'
+            )
+
+    def _compare(self, options, report):
+        with open(options['compare'], encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = benchmark.compare(baseline, report, threshold=options['threshold'])
+        self.stdout.write(f'Compared with {baseline.get("commit") or options["compare"]}:')
+        for row in rows:
+            line = (f'  {row["jobs"]:>7} {row["name"]:<27} p50 {row["p50_before"]:>8} -> {row["p50_after"]:<8} '
+                    f'x{row["p50_ratio"]:<5} queries {row["queries_before"]} -> {row["queries_after"]}')
+            self.stdout.write(self.style.ERROR(line + '  REGRESSION') if row['regression'] else line)
+        regressions = sum(row['regression'] for row in rows)
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{regressions} endpoint(s) regressed.')
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
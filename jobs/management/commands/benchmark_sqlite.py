@@ -0,0 +1,79 @@
+import json
+import platform
+import sqlite3
+import subprocess
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from jobportal import sqlite, sqlite_benchmark
+
+from .benchmark_portal import _git_commit
+
+
+class Command(BaseCommand):
+    help = ('Run a mixed read/write workload from several processes against a seeded scratch '
+            'SQLite database, once per connection profile, and report throughput, latency '
+            'percentiles and "database is locked" errors. The site database is not touched.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append', dest='profiles', choices=sqlite.PROFILES,
+                            help='Profile to measure (repeatable; default: all of them).')
+        parser.add_argument('--workers', type=int, default=4, help='Worker processes (default: 4).')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per profile (default: 10).')
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help='Share of operations that write (default: 0.2).')
+        parser.add_argument('--jobs', type=int, default=2000, help='Jobs to seed (default: 2000).')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed of the data and the workload.')
+        parser.add_argument('--json', dest='json_path', help='Write the results to this file.')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['duration'] <= 0 or options['jobs'] < 1:
+            raise CommandError('--workers, --duration and --jobs must be positive.')
+        if not 0 <= options['write_ratio'] <= 1:
+            raise CommandError('--write-ratio must be between 0 and 1.')
+        try:
+            results = sqlite_benchmark.run(
+                profiles=options['profiles'] or sqlite.PROFILES,
+                workers=options['workers'],
+                duration=options['duration'],
+                write_ratio=options['write_ratio'],
+                jobs=options['jobs'],
+                seed=options['seed'],
+                progress=lambda message: self.stdout.write(message),
+            )
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(f'Preparing the database failed:\n{exc.stderr}')
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        self._report(results)
+        if options['json_path']:
+            report = {
+                'commit': _git_commit(),
+                'created': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'workers': options['workers'],
+                'write_ratio': options['write_ratio'],
+                'jobs': options['jobs'],
+                'profiles': results,
+            }
+            with open(options['json_path'], 'w', encoding='utf-8') as out:
+                json.dump(report, out, indent=2)
+
+    def _report(self, results):
+        self.stdout.write(f'{"profile":<11} {"journal":<8} {"reads/s":>9} {"writes/s":>9} '
+                          f'{"read p50/p99 ms":>17} {"write p50/p99 ms":>17} {"errors":>7}')
+        for result in results:
+            read = '{p50}/{p99}'.format(**result['read_ms'])
+            write = '{p50}/{p99}'.format(**result['write_ms'])
+            line = (f'{result["profile"]:<11} {result["journal_mode"]:<8} {result["reads_per_second"]:>9} '
+                    f'{result["writes_per_second"]:>9} {read:>17} {write:>17} {sum(result["errors"].values()):>7}')
+            self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
+        for result in results:
+            for message, count in result['errors'].items():
+                self.stdout.write(f'  {result["profile"]}: {count} x {message}')
+
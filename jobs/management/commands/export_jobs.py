@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from jobs import bulk
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Export jobs as CSV or JSON Lines, streamed in constant memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default='-', help="Output file, or '-' for stdout.")
+        parser.add_argument('--format', choices=bulk.FORMATS,
+                            help='Output format (default: from the file extension, else csv).')
+        parser.add_argument('--user', help='Only jobs posted by this username.')
+        parser.add_argument('--active-only', action='store_true')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or bulk.guess_format(options['path'])
+        jobs = Job.objects.all()
+        if options['user']:
+            jobs = jobs.filter(posted_by__username=options['user'])
+        if options['active_only']:
+            jobs = jobs.filter(is_active=True)
+
+        if options['path'] == '-':
+            for chunk in bulk.export_lines(jobs, fmt):
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['path'], 'w', encoding='utf-8', newline='') as out:
+            for chunk in bulk.export_lines(jobs, fmt):
+                out.write(chunk)
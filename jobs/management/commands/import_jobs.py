@@ -0,0 +1,62 @@
+import io
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import bulk
+
+
+class Command(BaseCommand):
+    help = 'Import jobs from a CSV or JSON Lines file, validated with the JobForm rules.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin.")
+        parser.add_argument('--user', required=True, help='Username the jobs are posted by.')
+        parser.add_argument('--format', choices=bulk.FORMATS,
+                            help='Input format (default: from the file extension, else csv).')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows validated and inserted per transaction.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate and report errors without inserting.')
+        parser.add_argument('--errors', metavar='PATH',
+                            help='Write the per-row error report (JSON Lines) here instead of stderr.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist.")
+        fmt = options['format'] or bulk.guess_format(options['path'])
+
+        report = open(options['errors'], 'w', encoding='utf-8') if options['errors'] else None
+
+        def on_error(line_number, errors):
+            line = json.dumps({'line': line_number, 'errors': errors})
+            if report is None:
+                self.stderr.write(line)  # OutputWrapper ends the line
+            else:
+                report.write(line + '\n')
+
+        if options['path'] == '-':
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+        else:
+            stream = open(options['path'], encoding='utf-8-sig', newline='')
+        try:
+            result = bulk.import_jobs(
+                stream, fmt, user,
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+                on_error=on_error,
+            )
+        finally:
+            stream.close()
+            if options['errors']:
+                report.close()
+
+        verb = 'would be imported' if options['dry_run'] else 'imported'
+        valid = result.rows - result.errors
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.rows} row(s) read, {valid} {verb}, {result.errors} rejected.'
+        ))
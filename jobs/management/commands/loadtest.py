@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobportal import loadtest
+
+# --compare starts one server per deployment mode on consecutive ports.
+SERVERS = {
+    'wsgi': ['-m', 'gunicorn', 'jobportal.wsgi', '--bind', '127.0.0.1:{port}',
+             '--workers', '{workers}', '--log-level', 'warning'],
+    'asgi': ['-m', 'uvicorn', 'jobportal.asgi:application', '--port', '{port}',
+             '--workers', '{workers}', '--log-level', 'warning', '--no-access-log'],
+}
+
+
+class Command(BaseCommand):
+    help = ('Load test running servers, or start a WSGI (gunicorn, sync workers) and an '
+            'ASGI (uvicorn, async views) server with --compare, and report throughput '
+            'and latency percentiles.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='*', metavar='LABEL=URL',
+                            help='Servers to test, e.g. wsgi=http://127.0.0.1:8000.')
+        parser.add_argument('--compare', action='store_true',
+                            help='Start gunicorn and uvicorn for this project and test both.')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes per server with --compare.')
+        parser.add_argument('--port', type=int, default=8100, help='First port used by --compare.')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request, repeatable (default: / and /api/jobs/).')
+        parser.add_argument('--cached', action='store_true',
+                            help='Request the paths as given, so the response cache can answer '
+                                 'repeats (default: add a unique ?_= to every request).')
+        parser.add_argument('--header', action='append', default=[],
+                            help="Extra request header, e.g. 'Authorization: Bearer ...'.")
+        parser.add_argument('--concurrency', type=int, default=200)
+        parser.add_argument('--duration', type=float, default=20.0, help='Measured seconds per target.')
+        parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds before that.')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['targets']:
+            label, sep, url = target.partition('=')
+            if not sep or not url.startswith('http://'):
+                raise CommandError(f'Expected LABEL=http://host:port, got {target!r}')
+            targets.append((label, url.rstrip('/')))
+        if not targets and not options['compare']:
+            raise CommandError('Give LABEL=URL targets or --compare.')
+
+        paths = options['paths'] or ['/', '/api/jobs/']
+        headers = []
+        for header in options['header']:
+            name, sep, value = header.partition(':')
+            if not sep:
+                raise CommandError(f'Expected "Name: value", got {header!r}')
+            headers.append((name.strip(), value.strip()))
+
+        results = []
+        servers = []
+        try:
+            if options['compare']:
+                for offset, mode in enumerate(SERVERS):
+                    port = options['port'] + offset
+                    servers.append(self._start(mode, port, options['workers']))
+                    targets.append((mode, f'http://127.0.0.1:{port}'))
+            mode = 'response cache allowed' if options['cached'] else 'response cache bypassed'
+            for label, url in targets:
+                self.stdout.write(f'{label}: {options["concurrency"]} clients for {options["duration"]}s '
+                                  f'on {url} ({mode})')
+                result = asyncio.run(loadtest.run(
+                    url, paths,
+                    concurrency=options['concurrency'],
+                    duration=options['duration'],
+                    warmup=options['warmup'],
+                    headers=headers,
+                    cache_bust=not options['cached'],
+                ))
+                result['label'] = label
+                results.append(result)
+        finally:
+            for server in servers:
+                server.terminate()
+                server.wait(timeout=10)
+
+        self._report(results)
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as out:
+                json.dump(results, out, indent=2)
+
+    def _start(self, mode, port, workers):
+        command = [sys.executable] + [part.format(port=port, workers=workers) for part in SERVERS[mode]]
+        env = {**os.environ, 'ASYNC_VIEWS': '1' if mode == 'asgi' else '0'}
+        server = subprocess.Popen(command, env=env)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'{" ".join(command)} exited with {server.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f'{mode} server did not start on port {port}')
+
+    def _report(self, results):
+        self.stdout.write(f'{"target":<10} {"req/s":>9} {"p50 ms":>8} {"p90 ms":>8} '
+                          f'{"p99 ms":>8} {"max ms":>8} {"errors":>7} {"cached":>7}  status')
+        for result in results:
+            latency = result['latency_ms']
+            # Share of measured responses the response cache answered (X-Cache: HIT).
+            hits = f'{100 * result["cache"]["hit"] / result["requests"]:.0f}%' if result['requests'] else '-'
+            self.stdout.write(
+                f'{result["label"]:<10} {result["requests_per_second"]:>9} '
+                + ' '.join(f'{latency[name] if latency[name] is not None else "-":>8}'
+                           for name in ('p50', 'p90', 'p99', 'max'))
+                + f' {result["errors"]:>7} {hits:>7}  {result["status"]}'
+            )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobApplication
+from jobs.tasks import process_resume
+
+
+class Command(BaseCommand):
+    help = 'Re-extract resumes and rebuild the applicant search index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', dest='job_ids',
+                            help='Only reindex applications to this job id (repeatable).')
+        parser.add_argument('--queue', action='store_true',
+                            help='Queue the work for run_workers instead of doing it here.')
+
+    def handle(self, *args, **options):
+        applications = JobApplication.objects.order_by('pk')
+        if options['job_ids']:
+            applications = applications.filter(job_id__in=options['job_ids'])
+        count = 0
+        for application_id in applications.values_list('pk', flat=True).iterator(chunk_size=1000):
+            if options['queue']:
+                process_resume.delay(application_id)
+            else:
+                process_resume(application_id)
+            count += 1
+        verb = 'queued' if options['queue'] else 'reindexed'
+        self.stdout.write(self.style.SUCCESS(f'{count} application(s) {verb}.'))
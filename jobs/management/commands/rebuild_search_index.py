@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from jobs.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the active jobs.'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        backend.install()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
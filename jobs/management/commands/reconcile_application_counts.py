@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs import counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized application counters on jobs and fix any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', dest='job_ids',
+                            help='Only reconcile this job id (repeatable).')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted jobs without writing.')
+
+    def handle(self, *args, **options):
+        drifted = counters.reconcile(
+            job_ids=options['job_ids'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        verb = 'would be fixed' if options['dry_run'] else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f'{drifted} job(s) with drifted counters {verb}.'))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import seeding
+
+
+class Command(BaseCommand):
+    help = ('Fill the database with realistic users, jobs and applications for benchmarks '
+            'and load tests, inserted with bulk_create in batches.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--applications', type=int, default=2000)
+        parser.add_argument('--employers', type=int,
+                            help='How many of the users post jobs (default: one in twenty).')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, help='Random seed, for repeatable data.')
+        parser.add_argument('--password', default=seeding.DEFAULT_PASSWORD,
+                            help='Password of every seeded account.')
+
+    def handle(self, *args, **options):
+        if min(options['jobs'], options['users'], options['applications']) < 0 or options['batch_size'] < 1:
+            raise CommandError('Counts must not be negative and --batch-size must be positive.')
+        started = time.perf_counter()
+        result = seeding.seed(
+            jobs=options['jobs'],
+            users=options['users'],
+            applications=options['applications'],
+            employers=options['employers'],
+            batch_size=options['batch_size'],
+            password=options['password'],
+            random_seed=options['seed'],
+            progress=lambda message: self.stdout.write(f'  {message}'),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {result.users} users ({result.employers} employers), {result.jobs} jobs and '
+            f'{result.applications} applications in {time.perf_counter() - started:.1f}s '
+            f'(usernames tagged {result.tag}).'
+        ))
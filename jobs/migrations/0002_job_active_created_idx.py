@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='job_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from jobs.search import get_backend
+
+    backend = get_backend(schema_editor.connection)
+    backend.install()
+    backend.rebuild()
+
+
+def uninstall_search_index(apps, schema_editor):
+    from jobs.search import get_backend
+
+    get_backend(schema_editor.connection).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_active_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
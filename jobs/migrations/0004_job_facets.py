@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_facet_counts(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobFacetCount = apps.get_model('jobs', 'JobFacetCount')
+    active = Job.objects.filter(is_active=True)
+    rows = []
+    for facet, field in [('category', 'category_id'), ('job_type', 'job_type'), ('location', 'location')]:
+        for row in active.values(field).annotate(total=models.Count('id')).order_by():
+            if row[field] not in (None, ''):
+                rows.append(JobFacetCount(facet=facet, value=str(row[field]), count=row['total']))
+    JobFacetCount.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('category', 'Category'), ('job_type', 'Job Type'), ('location', 'Location')], max_length=20)),
+                ('value', models.CharField(max_length=200)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'category', '-created_at', '-id'], name='job_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'job_type', '-created_at', '-id'], name='job_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'location', '-created_at', '-id'], name='job_active_location_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobfacetcount',
+            unique_together={('facet', 'value')},
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_facets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', '-updated_at'], name='job_active_updated_idx'),
+        ),
+    ]
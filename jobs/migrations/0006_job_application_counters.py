@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:43
+
+from django.db import migrations, models
+
+
+def populate_application_counters(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    rows = JobApplication.objects.values('job_id', 'status').annotate(total=models.Count('id')).order_by()
+    for row in rows:
+        Job.objects.filter(pk=row['job_id']).update(**{
+            'application_count': models.F('application_count') + row['total'],
+            f"{row['status']}_count": models.F(f"{row['status']}_count") + row['total'],
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='accepted_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='reviewed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_application_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-18 05:51
+
+import jobs.storage
+import jobs.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_application_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='resume',
+            field=models.FileField(storage=jobs.storage.resume_storage, upload_to='resumes/', validators=[jobs.uploads.validate_resume_size]),
+        ),
+    ]
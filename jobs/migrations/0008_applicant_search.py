@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_resume_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeblob',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resumeblob',
+            name='text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.CreateModel(
+            name='ApplicantTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField()),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='jobs.jobapplication')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'term'], name='applicant_term_job_idx')],
+                'unique_together': {('application', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_salaries(apps, schema_editor):
+    from jobs.salary import backfill
+
+    backfill(apps.get_model('jobs', 'Job').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_applicant_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='salary_currency',
+            field=models.CharField(blank=True, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_period',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', '-salary_max', '-id'], name='job_active_salary_idx'),
+        ),
+        migrations.RunPython(backfill_salaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_job_salary_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_active_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_active_category_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_active_type_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_active_location_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_active_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_active_salary_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='job_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', '-created_at', '-id'], name='job_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job_type', '-created_at', '-id'], name='job_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['location', '-created_at', '-id'], name='job_active_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='job_active_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-salary_max', '-id'], name='job_active_salary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_by', '-created_at'], name='job_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['applicant', '-applied_at', '-id'], name='application_applicant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-applied_at', '-id'], name='application_job_applied_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_index_plan'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='accepted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='reviewed_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
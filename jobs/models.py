@@ -2,12 +2,18 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from .storage import resume_storage
+from .uploads import validate_resume_size
+
 class JobCategory(models.Model):
     name = models.CharField(max_length=100)
     
     def __str__(self):
         return self.name
 
+# Filter shared by the partial indexes on public (active) jobs.
+ACTIVE = models.Q(is_active=True)
+
 class Job(models.Model):
     JOB_TYPE_CHOICES = [
         ('full_time', 'Full Time'),
@@ -22,15 +28,91 @@ class Job(models.Model):
     description = models.TextField()
     requirements = models.TextField()
     salary = models.CharField(max_length=100, blank=True)
+    # Parsed from ``salary`` by jobs.salary; yearly amounts in salary_currency
+    salary_min = models.PositiveIntegerField(null=True, blank=True)
+    salary_max = models.PositiveIntegerField(null=True, blank=True)
+    salary_currency = models.CharField(max_length=3, blank=True)
+    salary_period = models.CharField(max_length=10, blank=True)
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES)
     category = models.ForeignKey(JobCategory, on_delete=models.SET_NULL, null=True)
-    posted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posted_jobs')
+    # Indexed by job_owner_created_idx; a separate FK index would only cost writes.
+    posted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posted_jobs', db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    # Denormalized application counters, maintained by jobs.counters with
+    # F() updates only; save() never writes them back (see below).
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+    reviewed_count = models.PositiveIntegerField(default=0, editable=False)
+    accepted_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+    COUNTER_FIELDS = ('application_count', 'pending_count', 'reviewed_count', 'accepted_count', 'rejected_count')
+    
+    class Meta:
+        # Public pages only ever read active jobs, so their indexes are
+        # partial: inactive rows add no index entries and no write cost.
+        indexes = [
+            # Backs keyset pagination of the public job list.
+            models.Index(fields=['-created_at', '-id'], condition=ACTIVE, name='job_active_created_idx'),
+            # Facet filters keep the same order, so each gets its own prefix.
+            models.Index(fields=['category', '-created_at', '-id'], condition=ACTIVE, name='job_active_category_idx'),
+            models.Index(fields=['job_type', '-created_at', '-id'], condition=ACTIVE, name='job_active_type_idx'),
+            models.Index(fields=['location', '-created_at', '-id'], condition=ACTIVE, name='job_active_location_idx'),
+            # Newest modification stamp for conditional GET validators.
+            models.Index(fields=['-updated_at'], condition=ACTIVE, name='job_active_updated_idx'),
+            # ?sort=salary keyset pages and ?salary_min= range filters.
+            models.Index(fields=['-salary_max', '-id'], condition=ACTIVE, name='job_active_salary_idx'),
+            # Employer dashboard and export: an owner's jobs, newest first.
+            models.Index(fields=['posted_by', '-created_at'], name='job_owner_created_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        # Writing back the counters loaded with the job would undo any
+        # increment made since, so full saves of an existing row skip them.
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"{self.title} at {self.company}"
 
+class JobFacetCount(models.Model):
+    """Number of active jobs per facet value, maintained incrementally."""
+    FACET_CHOICES = [
+        ('category', 'Category'),
+        ('job_type', 'Job Type'),
+        ('location', 'Location'),
+    ]
+    
+    facet = models.CharField(max_length=20, choices=FACET_CHOICES)
+    value = models.CharField(max_length=200)
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['facet', 'value']
+    
+    def __str__(self):
+        return f"{self.facet}={self.value} ({self.count})"
+
+class ResumeBlob(models.Model):
+    """A content-addressed resume file and how many applications use it."""
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Filled in once per content by the process_resume task
+    text = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
 class JobApplication(models.Model):
     APPLICATION_STATUS = [
         ('pending', 'Pending'),
@@ -39,15 +121,41 @@ class JobApplication(models.Model):
         ('rejected', 'Rejected'),
     ]
     
-    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
-    applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='applications')
-    resume = models.FileField(upload_to='resumes/')
+    # Both lead composite indexes below, so they get no FK index of their own.
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications', db_index=False)
+    applicant = models.ForeignKey(User, on_delete=models.CASCADE, related_name='applications', db_index=False)
+    resume = models.FileField(upload_to='resumes/', storage=resume_storage, validators=[validate_resume_size])
     cover_letter = models.TextField()
     applied_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=APPLICATION_STATUS, default='pending')
     
     class Meta:
+        # (job, applicant) also serves has-applied checks and the employer's
+        # unordered list of a job's applications.
         unique_together = ['job', 'applicant']
+        indexes = [
+            # An applicant's own applications, newest first.
+            models.Index(fields=['applicant', '-applied_at', '-id'], name='application_applicant_idx'),
+            # Keyset pages of one job's applicants (ApplicantPagination).
+            models.Index(fields=['job', '-applied_at', '-id'], name='application_job_applied_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.applicant.username} - {self.job.title}"
+
+class ApplicantTerm(models.Model):
+    """A term of an application's resume or cover letter, for applicant search."""
+    # Covered by applicant_term_job_idx and the (application, term) constraint.
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+', db_index=False)
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='terms', db_index=False)
+    term = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ['application', 'term']
+        indexes = [
+            models.Index(fields=['job', 'term'], name='applicant_term_job_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.applicant.username} - {self.job.title}"
\ No newline at end of file
+        return f"{self.application_id}:{self.term}"
\ No newline at end of file
@@ -0,0 +1,213 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+
+from .search import search_jobs
+
+
+DEFAULT_ORDERING = ('-created_at', '-id')
+# Relevance order of search_jobs() matches
+SEARCH_ORDERING = ('-rank', '-id')
+# ?sort= values and the keyset orderings they select
+SORT_ORDERINGS = {
+    'salary': ('-salary_max', '-id'),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """Turn the sort key of the last row on a page into an opaque token."""
+    payload = json.dumps([_to_json(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, queryset, ordering):
+    """Inverse of encode_cursor; values are coerced back to the field types."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor('Invalid cursor')
+
+    model = queryset.model
+    decoded = []
+    for field_name, value in zip(_field_names(ordering), values):
+        try:
+            field = model._meta.get_field(field_name)
+        except Exception:
+            # Annotated sort keys (e.g. search rank) are stored as-is.
+            decoded.append(value)
+            continue
+        try:
+            decoded.append(field.to_python(value))
+        except Exception:
+            raise InvalidCursor('Invalid cursor')
+    return decoded
+
+
+def get_sort_ordering(value):
+    """Ordering for a ``?sort=`` value, or None for the default."""
+    return SORT_ORDERINGS.get(value)
+
+
+def get_page_size(value=None):
+    """Clamp a client supplied page size to the configured bounds."""
+    default = getattr(settings, 'JOB_LIST_PAGE_SIZE', 20)
+    maximum = getattr(settings, 'JOB_LIST_MAX_PAGE_SIZE', 100)
+    try:
+        size = int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+def keyset_paginate(queryset, cursor=None, page_size=None, ordering=DEFAULT_ORDERING):
+    """
+    Return one page of ``queryset`` using keyset (seek) pagination.
+
+    Instead of OFFSET, the page is located with a WHERE clause on the sort
+    key of the last row of the previous page, so with a matching index every
+    page costs the same no matter how deep it is.  ``ordering`` must end in a
+    unique column (normally ``id``) to make the key total.
+
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    page_size = page_size or get_page_size()
+    queryset = _keyset_queryset(queryset, cursor, ordering)
+    return _keyset_page(list(queryset[:page_size + 1]), page_size, ordering)
+
+
+async def akeyset_paginate(queryset, cursor=None, page_size=None, ordering=DEFAULT_ORDERING):
+    """Async version of keyset_paginate()."""
+    page_size = page_size or get_page_size()
+    queryset = _keyset_queryset(queryset, cursor, ordering)
+    return _keyset_page([row async for row in queryset[:page_size + 1]], page_size, ordering)
+
+
+def _keyset_queryset(queryset, cursor, ordering):
+    queryset = _load_fields(queryset.order_by(*ordering), _field_names(ordering))
+    if cursor:
+        values = decode_cursor(cursor, queryset, ordering)
+        queryset = queryset.filter(_seek_filter(ordering, values))
+    return queryset
+
+
+def _keyset_page(rows, page_size, ordering):
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [getattr(last, name) for name in _field_names(ordering)]
+        )
+    return rows, next_cursor
+
+
+def ranked_paginate(queryset, hits, cursor=None, page_size=None):
+    """
+    Paginate precomputed search ``hits`` (``[(id, score), ...]``, best first).
+
+    The cursor is the (score, id) of the last row shown.  ``queryset`` is
+    applied to the candidate ids in a single query so that any other filters
+    the caller has (active only, facets, ...) still hold.
+    """
+    page_size = page_size or get_page_size()
+    hits = _ranked_candidates(queryset, hits, cursor)
+    allowed = set(queryset.filter(id__in=[job_id for job_id, _ in hits])
+                  .values_list('id', flat=True))
+    page, next_cursor = _ranked_page(hits, allowed, page_size)
+    rows = queryset.in_bulk([job_id for job_id, _ in page])
+    return _with_ranks(rows, page), next_cursor
+
+
+def _ranked_candidates(queryset, hits, cursor):
+    hits = sorted(hits, key=lambda hit: (hit[1], hit[0]), reverse=True)
+    if cursor:
+        after = tuple(decode_cursor(cursor, queryset, ('-rank', '-id')))
+        hits = [hit for hit in hits if (hit[1], hit[0]) < after]
+    return hits
+
+
+def _ranked_page(hits, allowed, page_size):
+    page = [hit for hit in hits if hit[0] in allowed][:page_size + 1]
+    next_cursor = None
+    if len(page) > page_size:
+        page = page[:page_size]
+        next_cursor = encode_cursor([page[-1][1], page[-1][0]])
+    return page, next_cursor
+
+
+def _with_ranks(rows, page):
+    ranked = []
+    for job_id, score in page:
+        if job_id in rows:
+            rows[job_id].rank = score
+            ranked.append(rows[job_id])
+    return ranked
+
+
+def search_ordering(queryset, query=None, ordering=None):
+    """
+    ``(queryset, ordering)`` for a job list: by recency, or narrowed to the
+    matches of a search query and by relevance.  An explicit ``ordering``
+    (e.g. by salary) wins over relevance and is applied to the matches.
+    """
+    if query:
+        return search_jobs(queryset, query), ordering or SEARCH_ORDERING
+    return queryset, ordering or DEFAULT_ORDERING
+
+
+def paginate_jobs(queryset, query=None, cursor=None, page_size=None, ordering=None):
+    """Keyset pages of ``search_ordering(queryset, query, ordering)``."""
+    queryset, ordering = search_ordering(queryset, query, ordering)
+    return keyset_paginate(queryset, cursor, page_size, ordering)
+
+
+async def apaginate_jobs(queryset, query=None, cursor=None, page_size=None, ordering=None):
+    """Async version of paginate_jobs()."""
+    queryset, ordering = search_ordering(queryset, query, ordering)
+    return await akeyset_paginate(queryset, cursor, page_size, ordering)
+
+
+def _load_fields(queryset, names):
+    """Keep the sort key loaded when the queryset was narrowed with .only()."""
+    loaded, deferred = queryset.query.deferred_loading
+    if loaded and not deferred:
+        fields = [name for name in names if name not in queryset.query.annotations]
+        return queryset.only(*loaded, *fields)
+    return queryset
+
+
+def _seek_filter(ordering, values):
+    # (a, b, c) after (x, y, z) expands to
+    #   a >= x AND (a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z))
+    # with the comparisons flipped for descending columns.  The leading
+    # a >= x is implied by the rest, but planners cannot see through the OR:
+    # without it they scan the index from the start instead of seeking to x.
+    condition = Q()
+    equal = Q()
+    for term, value in zip(ordering, values):
+        name = term.lstrip('-')
+        lookup = 'lt' if term.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    first = ordering[0]
+    bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+    return bound & condition
+
+
+def _field_names(ordering):
+    return [term.lstrip('-') for term in ordering]
+
+
+def _to_json(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
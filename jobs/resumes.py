@@ -0,0 +1,85 @@
+"""
+Plain text out of uploaded resumes (PDF, DOCX, plain text) for applicant search.
+
+Extraction runs in the ``process_resume`` task, never in a request.  PDFs
+are read with ``pypdf`` (in requirements.txt); if it is missing, every PDF
+logs an error and is indexed by its cover letter only.  Malformed files
+yield an empty string rather than an exception, so a bad upload is not
+retried over and over.
+"""
+import logging
+import os
+import zipfile
+from xml.etree import ElementTree
+
+from django.conf import settings
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - broken install
+    PdfReader = None
+
+logger = logging.getLogger('jobs.resumes')
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+TEXT_EXTENSIONS = {'.txt', '.md', '.text'}
+
+
+def max_chars():
+    return getattr(settings, 'RESUME_TEXT_MAX_CHARS', 100_000)
+
+
+def extract_text(file, name):
+    """Text of an open binary resume ``file``; the format is taken from ``name``."""
+    extension = os.path.splitext(name)[1].lower()
+    if extension == '.pdf':
+        extractor = _pdf_text
+    elif extension == '.docx':
+        extractor = _docx_text
+    elif extension in TEXT_EXTENSIONS:
+        extractor = _plain_text
+    else:
+        return ''
+    try:
+        return extractor(file)[:max_chars()]
+    except Exception:
+        logger.warning('Could not extract text from resume %s', name, exc_info=True)
+        return ''
+
+
+def _plain_text(file):
+    return file.read(max_chars() * 4).decode('utf-8', errors='replace')
+
+
+def _pdf_text(file):
+    if PdfReader is None:
+        logger.error('pypdf is not installed; PDF resumes are not searchable')
+        return ''
+    parts, length = [], 0
+    for page in PdfReader(file).pages:
+        text = page.extract_text() or ''
+        parts.append(text)
+        length += len(text)
+        if length >= max_chars():
+            break
+    return '\n'.join(parts)
+
+
+def _docx_text(file):
+    with zipfile.ZipFile(file) as archive:
+        info = archive.getinfo('word/document.xml')
+        # Refuse zip bombs before inflating anything.
+        if info.file_size > max_chars() * 50:
+            raise ValueError(f'document.xml is {info.file_size} bytes')
+        with archive.open(info) as document:
+            parts, length = [], 0
+            for _, element in ElementTree.iterparse(document):
+                if element.tag == WORD_NAMESPACE + 't' and element.text:
+                    parts.append(element.text)
+                    length += len(element.text)
+                elif element.tag == WORD_NAMESPACE + 'p':
+                    parts.append('\n')
+                    element.clear()
+                if length >= max_chars():
+                    break
+    return ''.join(parts)
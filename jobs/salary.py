@@ -0,0 +1,128 @@
+"""
+Structured salaries parsed from the free-text ``Job.salary``.
+
+``salary`` stays the text shown to people; ``salary_min``/``salary_max`` hold
+the parsed range converted to a yearly amount in ``salary_currency`` so jobs
+paid by the hour or month can be filtered and sorted together, and
+``salary_period`` records how the posting stated it.  Unparseable text
+("Competitive", "DOE") leaves all four empty.
+"""
+import re
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+Salary = namedtuple('Salary', ['min', 'max', 'currency', 'period'])
+NO_SALARY = Salary(None, None, '', '')
+FIELDS = ('salary_min', 'salary_max', 'salary_currency', 'salary_period')
+
+# Yearly multipliers (40 hour weeks, 260 working days)
+PERIODS = {'year': 1, 'month': 12, 'week': 52, 'day': 260, 'hour': 2080}
+PERIOD_PATTERNS = [
+    ('hour', re.compile(r'\b(?:per\s+)?(?:hour|hr|h)\b|hourly|/\s*h', re.I)),
+    ('day', re.compile(r'\b(?:per\s+)?day\b|daily|/\s*d\b', re.I)),
+    ('week', re.compile(r'\b(?:per\s+)?(?:week|wk)\b|weekly', re.I)),
+    ('month', re.compile(r'\b(?:per\s+)?(?:month|mo|mth)\b|monthly|/\s*m\b', re.I)),
+]
+CURRENCY_SYMBOLS = {'$': 'USD', '£': 'GBP', '€': 'EUR', '₹': 'INR', '¥': 'JPY'}
+CURRENCY_CODE = re.compile(r'\b(USD|EUR|GBP|INR|CAD|AUD|NZD|CHF|JPY|SGD)\b', re.I)
+AMOUNT = re.compile(r'(\d[\d,.]*)\s*([km])?\b', re.I)
+# Yearly amounts beyond this are typos, not salaries.
+MAX_AMOUNT = 100_000_000
+
+
+def parse_salary(text):
+    """Parse ``"$80,000 - $100,000"``, ``"80k-100k EUR"``, ``"£25/hour"`` and the like."""
+    if not text:
+        return NO_SALARY
+    amounts = [amount for amount in (_amount(*match) for match in AMOUNT.findall(text)) if amount]
+    if not amounts:
+        return NO_SALARY
+    low, high = amounts[0], amounts[1] if len(amounts) > 1 else amounts[0]
+    if low > high:
+        low, high = high, low
+
+    period = next((name for name, pattern in PERIOD_PATTERNS if pattern.search(text)), 'year')
+    low, high = low * PERIODS[period], high * PERIODS[period]
+    if high > MAX_AMOUNT:
+        return NO_SALARY
+    return Salary(int(low), int(high), _currency(text), period)
+
+
+def _amount(number, suffix):
+    if re.fullmatch(r'\d{1,3}(\.\d{3})+', number):
+        # 50.000 is fifty thousand (European grouping).
+        number = number.replace('.', '')
+    try:
+        value = Decimal(number.replace(',', '').rstrip('.'))
+    except InvalidOperation:
+        return None
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(suffix.lower(), 1) if suffix else 1
+    return value * multiplier
+
+
+def _currency(text):
+    match = CURRENCY_CODE.search(text)
+    if match:
+        return match.group(1).upper()
+    return next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), '')
+
+
+def apply_to_job(job):
+    """Set the structured fields of ``job`` from its text; True if any changed."""
+    parsed = parse_salary(job.salary)
+    changed = False
+    for field, value in zip(FIELDS, parsed):
+        if getattr(job, field) != value:
+            setattr(job, field, value)
+            changed = True
+    return changed
+
+
+def backfill(jobs, batch_size=1000):
+    """
+    Parse salaries for ``jobs`` in primary key batches and write the changed
+    rows with one ``bulk_update`` per batch.  Returns ``(seen, updated)``.
+    """
+    jobs = jobs.only('id', 'salary', *FIELDS).order_by('pk')
+    seen = updated = 0
+    last_pk = 0
+    while True:
+        batch = list(jobs.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        seen += len(batch)
+        changed = [job for job in batch if apply_to_job(job)]
+        if changed:
+            with transaction.atomic():
+                jobs.model.objects.bulk_update(changed, FIELDS)
+            updated += len(changed)
+    return seen, updated
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_jobs(queryset, params):
+    """
+    Apply ``?salary_min=`` (pays at least), ``?salary_max=`` (starts at most)
+    and ``?salary_currency=``; ``?sort=salary`` drops jobs without a salary.
+    """
+    minimum = _parse_int(params.get('salary_min'))
+    if minimum is not None:
+        queryset = queryset.filter(salary_max__gte=minimum)
+    maximum = _parse_int(params.get('salary_max'))
+    if maximum is not None:
+        queryset = queryset.filter(salary_min__lte=maximum)
+    currency = params.get('salary_currency', '').strip().upper()
+    if currency:
+        queryset = queryset.filter(salary_currency=currency)
+    if params.get('sort') == 'salary':
+        queryset = queryset.filter(salary_max__isnull=False)
+    return queryset
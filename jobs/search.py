@@ -0,0 +1,283 @@
+"""
+Full-text search over active jobs.
+
+The inverted index lives next to ``jobs_job`` and is kept current by the
+``index_job`` task that ``jobs.signals`` queues on every save and delete.
+SQLite uses an FTS5 virtual table and PostgreSQL a ``tsvector`` column with
+a GIN index; both rank matches in the database so a query never falls back
+to a LIKE scan over the job table.
+
+``search_jobs`` joins the index into a Job queryset, so the caller's
+filters, ordering and LIMIT run in the same query over every match.
+``search`` returns a capped list of ``(id, score)`` hits instead.
+"""
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Job
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+class SearchBackend:
+    """ORM fallback for databases without a native full-text index."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def index(self, job):
+        pass
+
+    def index_many(self, jobs):
+        for job in jobs:
+            self.index(job)
+
+    def remove(self, job_id):
+        pass
+
+    def search(self, query, limit):
+        ids = (self.filter(Job.objects.filter(is_active=True), query)
+               .order_by('-created_at', '-id').values_list('id', flat=True)[:limit])
+        return [(job_id, 1.0) for job_id in ids]
+
+    def filter(self, queryset, query):
+        """``queryset`` narrowed to the matches of ``query`` and annotated with their ``rank``."""
+        tokens = tokenize(query)
+        if not tokens:
+            queryset = queryset.none()
+        for token in tokens:
+            queryset = queryset.filter(
+                Q(title__icontains=token) | Q(company__icontains=token) |
+                Q(description__icontains=token) | Q(requirements__icontains=token)
+            )
+        return queryset.annotate(rank=Value(1.0, output_field=FloatField()))
+
+
+class SQLiteSearchBackend(SearchBackend):
+    table = 'jobs_job_fts'
+    # bm25 column weights: title, company, description, requirements
+    weights = (10.0, 5.0, 1.0, 2.0)
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                "title, company, description, requirements, "
+                "tokenize = 'porter unicode61')"
+            )
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, company, description, requirements) '
+                'SELECT id, title, company, description, requirements '
+                'FROM jobs_job WHERE is_active'
+            )
+
+    def index(self, job):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, company, description, requirements) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [job.pk, job.title, job.company, job.description, job.requirements],
+            )
+
+    def index_many(self, jobs):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [[job.pk] for job in jobs])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, title, company, description, requirements) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [[job.pk, job.title, job.company, job.description, job.requirements] for job in jobs],
+            )
+
+    def remove(self, job_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [job_id])
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, {self.score_sql()} AS score FROM {self.table} '
+                f'WHERE {self.table} MATCH %s ORDER BY score DESC, rowid DESC LIMIT %s',
+                [self.match(tokens), limit],
+            )
+            return cursor.fetchall()
+
+    def filter(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return super().filter(queryset, query)
+        return queryset.extra(
+            tables=[self.table],
+            where=[f'{self.table}.rowid = {Job._meta.db_table}.id', f'{self.table} MATCH %s'],
+            params=[self.match(tokens)],
+        ).annotate(rank=RawSQL(self.score_sql(), [], output_field=FloatField()))
+
+    def match(self, tokens):
+        # Every term must match; the last one is a prefix so partial words
+        # typed into the search box still find something.
+        return ' '.join(f'"{token}"' for token in tokens) + '*'
+
+    def score_sql(self):
+        weights = ', '.join(str(weight) for weight in self.weights)
+        return f'-bm25({self.table}, {weights})'
+
+
+class PostgresSearchBackend(SearchBackend):
+    table = 'jobs_job_search'
+    config = 'english'
+    document_sql = (
+        "setweight(to_tsvector('{config}', {title}), 'A') || "
+        "setweight(to_tsvector('{config}', {company}), 'B') || "
+        "setweight(to_tsvector('{config}', {requirements}), 'C') || "
+        "setweight(to_tsvector('{config}', {description}), 'D')"
+    )
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                'job_id bigint PRIMARY KEY REFERENCES jobs_job (id) '
+                'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_document_gin '
+                f'ON {self.table} USING GIN (document)'
+            )
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def rebuild(self):
+        document = self.document_sql.format(
+            config=self.config, title='title', company='company',
+            requirements='requirements', description='description',
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (job_id, document) '
+                f'SELECT id, {document} FROM jobs_job WHERE is_active'
+            )
+
+    def index(self, job):
+        self.index_many([job])
+
+    def index_many(self, jobs):
+        document = self.document_sql.format(
+            config=self.config, title='%s', company='%s',
+            requirements='%s', description='%s',
+        )
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (job_id, document) VALUES (%s, {document}) '
+                'ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document',
+                [[job.pk, job.title, job.company, job.requirements, job.description] for job in jobs],
+            )
+
+    def remove(self, job_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE job_id = %s', [job_id])
+
+    def search(self, query, limit):
+        if not tokenize(query):
+            return []
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT job_id, ts_rank_cd(document, query) AS score '
+                f'FROM {self.table}, websearch_to_tsquery(%s, %s) query '
+                'WHERE document @@ query ORDER BY score DESC, job_id DESC LIMIT %s',
+                [self.config, query, limit],
+            )
+            return cursor.fetchall()
+
+    def filter(self, queryset, query):
+        if not tokenize(query):
+            return super().filter(queryset, query)
+        tsquery = 'websearch_to_tsquery(%s, %s)'
+        return queryset.extra(
+            tables=[self.table],
+            where=[f'{self.table}.job_id = {Job._meta.db_table}.id', f'{self.table}.document @@ {tsquery}'],
+            params=[self.config, query],
+        ).annotate(rank=RawSQL(f'ts_rank_cd({self.table}.document, {tsquery})', [self.config, query],
+                               output_field=FloatField()))
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend(connection=None):
+    connection = connection or default_connection
+    return BACKENDS.get(connection.vendor, SearchBackend)(connection)
+
+
+def index_job(job):
+    """Add, refresh or drop ``job`` from the index depending on is_active."""
+    backend = get_backend()
+    if job.is_active:
+        backend.index(job)
+    else:
+        backend.remove(job.pk)
+
+
+def index_jobs(jobs):
+    """Add or refresh many active ``jobs`` at once, e.g. after bulk_create."""
+    if jobs:
+        get_backend().index_many(jobs)
+
+
+def remove_job(job_id):
+    get_backend().remove(job_id)
+
+
+def search_jobs(queryset, query):
+    """
+    ``queryset`` narrowed to the jobs matching ``query``, annotated with a
+    ``rank`` (higher is better).  Order by ``-rank`` for relevance.
+    """
+    return get_backend().filter(queryset, query)
+
+
+def search(query, limit=None):
+    """Return up to ``limit`` ``[(job_id, score), ...]`` for active jobs, best match first."""
+    limit = limit or getattr(settings, 'SEARCH_MAX_RESULTS', 1000)
+    return [(job_id, float(score)) for job_id, score in get_backend().search(query, limit)]
+
+
+async def asearch(query, limit=None):
+    """Async version of search(); the backends run raw SQL, so in a thread."""
+    return await sync_to_async(search)(query, limit)
+
@@ -0,0 +1,174 @@
+"""
+Synthetic job board data for benchmarks and load tests.
+
+``seed`` writes users, jobs and applications with ``bulk_create`` in
+batches and then, once at the end, brings everything the model signals
+would have maintained up to date: application counters, facet counts, the
+search index, the applicant index and the page cache version.  Passwords are
+hashed once and shared, so seeding time does not depend on the hasher's
+work factor.  Usernames carry a per-run tag, so seeding twice adds data
+rather than failing on duplicates.
+"""
+import random
+import secrets
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from . import applicant_search, bulk, counters, salary
+from .models import ApplicantTerm, Job, JobApplication, JobCategory
+
+SeedResult = namedtuple('SeedResult', ['tag', 'users', 'employers', 'jobs', 'applications'])
+
+DEFAULT_PASSWORD = 'seed-Pass-123'
+
+CATEGORIES = [
+    'Engineering', 'Design', 'Marketing', 'Sales', 'Customer Support', 'Finance',
+    'Operations', 'Data Science', 'Product', 'Human Resources', 'Legal', 'Healthcare',
+]
+ROLES = [
+    'Backend Developer', 'Frontend Engineer', 'Data Analyst', 'Product Designer',
+    'DevOps Engineer', 'Account Executive', 'Support Specialist', 'Marketing Manager',
+    'Financial Analyst', 'Recruiter', 'QA Engineer', 'Machine Learning Engineer',
+    'Project Manager', 'Technical Writer', 'Nurse Practitioner', 'Legal Counsel',
+]
+LEVELS = ['Junior', '', '', 'Senior', 'Lead', 'Principal']
+COMPANIES = [
+    'Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises',
+    'Wonka', 'Soylent', 'Tyrell', 'Cyberdyne', 'Aperture', 'Vandelay', 'Pied Piper',
+]
+LOCATIONS = [
+    'Remote', 'New York', 'San Francisco', 'London', 'Berlin', 'Bangalore', 'Toronto',
+    'Sydney', 'Austin', 'Amsterdam', 'Singapore', 'Paris', 'Chicago', 'Dublin',
+]
+SALARIES = [
+    '$60,000 - $80,000', '$90k-$120k', '$45/hour', '£40,000 - £55,000', '€55k',
+    '₹12,00,000 per year', '$7,500/month', 'Competitive', '', 'DOE',
+]
+SKILLS = [
+    'python', 'django', 'javascript', 'react', 'sql', 'postgres', 'aws', 'docker',
+    'kubernetes', 'figma', 'excel', 'salesforce', 'communication', 'leadership',
+    'analytics', 'testing', 'security', 'linux', 'go', 'typescript', 'negotiation',
+]
+# pending, reviewed, accepted, rejected
+STATUS_WEIGHTS = [60, 25, 5, 10]
+ACTIVE_SHARE = 0.8
+HISTORY_DAYS = 180
+
+
+def _text(rng, words, count):
+    return ' '.join(rng.choice(words) for _ in range(count))
+
+
+def _batches(total, batch_size):
+    for start in range(0, total, batch_size):
+        yield range(start, min(total, start + batch_size))
+
+
+@contextmanager
+def _keep_timestamps():
+    """Let bulk_create store the backdated creation times set on the rows."""
+    fields = [Job._meta.get_field('created_at'), Job._meta.get_field('updated_at'),
+              JobApplication._meta.get_field('applied_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def seed(jobs=1000, users=500, applications=2000, employers=None, batch_size=1000,
+         password=DEFAULT_PASSWORD, random_seed=None, progress=None):
+    """
+    Create ``users`` accounts (``employers`` of them staff, default one in
+    twenty), ``jobs`` jobs posted by the employers and up to ``applications``
+    distinct applications from the other users.  Returns a ``SeedResult``.
+    """
+    rng = random.Random(random_seed)
+    tag = secrets.token_hex(3)
+    report = progress or (lambda message: None)
+    now = timezone.now()
+    employers = min(users, employers if employers is not None else max(1, users // 20))
+    password = make_password(password)
+
+    created_users = []
+    for batch in _batches(users, batch_size):
+        with transaction.atomic():
+            created_users += User.objects.bulk_create([
+                User(
+                    username=f'{"employer" if index < employers else "seeker"}_{tag}_{index}',
+                    email=f'user{index}.{tag}@example.com', password=password,
+                    is_staff=index < employers,
+                )
+                for index in batch
+            ])
+    owners, seekers = created_users[:employers], created_users[employers:]
+    report(f'{len(created_users)} users')
+
+    categories = [JobCategory.objects.get_or_create(name=name)[0] for name in CATEGORIES]
+    new_jobs = []
+    for _ in range(jobs if owners else 0):
+        role = rng.choice(ROLES)
+        job = Job(
+            title=f'{rng.choice(LEVELS)} {role}'.strip(), company=rng.choice(COMPANIES),
+            location=rng.choice(LOCATIONS), salary=rng.choice(SALARIES),
+            description=f'We are hiring a {role}. ' + _text(rng, SKILLS, 40),
+            requirements=_text(rng, SKILLS, 12), job_type=rng.choice(Job.JOB_TYPE_CHOICES)[0],
+            category=rng.choice(categories), posted_by=rng.choice(owners),
+            is_active=rng.random() < ACTIVE_SHARE,
+        )
+        job.created_at = job.updated_at = now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+        salary.apply_to_job(job)
+        new_jobs.append(job)
+
+    statuses = [status for status, _ in JobApplication.APPLICATION_STATUS]
+    new_applications = []
+    if new_jobs and seekers:
+        pairs = set()
+        wanted = min(applications, len(new_jobs) * len(seekers))
+        # Newer jobs draw more applicants, like a real board.
+        newest_first = sorted(range(len(new_jobs)), key=lambda index: new_jobs[index].created_at, reverse=True)
+        while len(pairs) < wanted:
+            pairs.add((newest_first[int(len(newest_first) * rng.random() ** 2)], rng.randrange(len(seekers))))
+        for job_index, seeker_index in pairs:
+            job = new_jobs[job_index]
+            application = JobApplication(
+                job=job, applicant=seekers[seeker_index], resume='resumes/seed.pdf',
+                cover_letter=f'I would love to join {job.company}. ' + _text(rng, SKILLS, 20),
+                status=rng.choices(statuses, STATUS_WEIGHTS)[0],
+            )
+            application.applied_at = now - rng.random() * (now - job.created_at)
+            # The counters the signals would keep, set before the jobs are saved.
+            job.application_count += 1
+            setattr(job, counters.STATUS_FIELDS[application.status],
+                    getattr(job, counters.STATUS_FIELDS[application.status]) + 1)
+            new_applications.append(application)
+
+    with _keep_timestamps():
+        for batch in _batches(len(new_jobs), batch_size):
+            with transaction.atomic():
+                Job.objects.bulk_create(new_jobs[batch.start:batch.stop])
+        report(f'{len(new_jobs)} jobs')
+
+        for batch in _batches(len(new_applications), batch_size):
+            rows = new_applications[batch.start:batch.stop]
+            with transaction.atomic():
+                JobApplication.objects.bulk_create(rows)
+                ApplicantTerm.objects.bulk_create([
+                    ApplicantTerm(job_id=application.job_id, application_id=application.pk, term=term, weight=weight)
+                    for application in rows
+                    for term, weight in applicant_search.terms_for('', application.cover_letter).items()
+                ], batch_size=batch_size)
+        report(f'{len(new_applications)} applications')
+
+    if new_jobs:
+        bulk.refresh_derived_data()
+    return SeedResult(tag, len(created_users), len(owners), len(new_jobs), len(new_applications))
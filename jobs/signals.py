@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache, counters, events, facets, salary, tasks, uploads
+from .applications import StatusChange, statuses_changed
+from .models import Job, JobApplication, JobCategory
+
+
+@receiver(pre_save, sender=Job)
+def parse_salary(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    salary.apply_to_job(instance)
+
+
+@receiver(pre_save, sender=Job)
+def remember_facet_values(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._stored_facets = facets.stored_values(instance.pk) if instance.pk else {}
+
+
+@receiver(post_save, sender=Job)
+def update_facet_counts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    facets.apply_change(getattr(instance, '_stored_facets', {}), facets.values_for_job(instance))
+
+
+@receiver(post_delete, sender=Job)
+def release_facet_counts(sender, instance, **kwargs):
+    facets.apply_change(facets.values_for_job(instance), {})
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Queued in this transaction; the task drops the entry if the job is gone.
+    tasks.index_job.delay(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+def invalidate_job_board_cache(sender, **kwargs):
+    # After commit: bumped earlier, a concurrent request could cache the
+    # still-committed old rows under the new version.
+    transaction.on_commit(cache.bump_content_version)
+
+
+@receiver(pre_save, sender=JobApplication)
+def remember_application_status(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    instance._stored_status = (JobApplication.objects.filter(pk=instance.pk)
+                               .values_list('status', flat=True).first())
+
+
+@receiver(post_save, sender=JobApplication)
+def update_application_counters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.record_created(instance.job_id, instance.status)
+    else:
+        stored = getattr(instance, '_stored_status', None)
+        if stored is not None:
+            counters.record_status_change(instance.job_id, stored, instance.status)
+
+
+@receiver(post_save, sender=JobApplication)
+def publish_status_change(sender, instance, created, raw=False, **kwargs):
+    stored = getattr(instance, '_stored_status', None)
+    if created or raw or stored is None or stored == instance.status:
+        return
+    events.publish_status_changes([StatusChange(
+        instance.pk, instance.job_id, instance.applicant_id, stored, instance.status,
+    )])
+
+
+@receiver(statuses_changed, sender=JobApplication)
+def publish_bulk_status_changes(sender, changes, **kwargs):
+    events.publish_status_changes(changes)
+
+
+@receiver(post_delete, sender=JobApplication)
+def release_application_counters(sender, instance, **kwargs):
+    counters.record_deleted(instance.job_id, instance.status)
+
+
+@receiver(pre_save, sender=JobApplication)
+def retain_resume_blob(sender, instance, raw=False, **kwargs):
+    # Before the file is written; see uploads.retain_resume.
+    if instance._state.adding and not raw:
+        uploads.retain_resume(instance)
+
+
+@receiver(post_save, sender=JobApplication)
+def process_resume(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        tasks.process_resume.delay(instance.pk)
+
+
+@receiver(post_save, sender=JobApplication)
+def notify_employer(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        tasks.notify_employer.delay(instance.pk)
+
+
+@receiver(post_delete, sender=JobApplication)
+def release_resume_blob(sender, instance, **kwargs):
+    uploads.release_resume(instance)
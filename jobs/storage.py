@@ -0,0 +1,47 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each distinct file once, under the SHA-256 of its content.
+
+    ``resumes/cv.pdf`` is saved as ``resumes/ab/ab12...ef.pdf``; saving the
+    same bytes again returns the existing name without writing anything.
+    Uploads coming from ``jobs.uploads.ResumeUploadHandler`` carry their
+    digest already, anything else is hashed here.
+    """
+
+    def __init__(self, **kwargs):
+        # Two writers racing on the same digest write identical bytes.
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    def _save(self, name, content):
+        digest = getattr(content, 'sha256', None) or self.hash_content(content)
+        name = self.content_name(name, digest)
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+    @staticmethod
+    def hash_content(content):
+        hasher = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        content.seek(0)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def content_name(name, digest):
+        directory = os.path.dirname(name)
+        # Keep the extension for content type sniffing, but bounded for max_length.
+        extension = os.path.splitext(name)[1].lower()[:16]
+        return os.path.join(directory, digest[:2], digest + extension)
+
+
+def resume_storage():
+    return ContentAddressedStorage()
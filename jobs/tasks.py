@@ -0,0 +1,84 @@
+"""
+Background work triggered by job and application changes (see ``tasks``).
+"""
+import hashlib
+import logging
+
+from django.core.mail import send_mail
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import task
+
+from . import applicant_search, resumes, search
+from .models import Job, JobApplication, ResumeBlob
+
+logger = logging.getLogger('jobs.tasks')
+
+
+@task
+def index_job(job_id):
+    """Bring the search index entry of a job up to date (or drop it)."""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is None:
+        search.remove_job(job_id)
+    else:
+        search.index_job(job)
+
+
+@task
+def process_resume(application_id):
+    """Verify, extract and index a new application's resume."""
+    application = JobApplication.objects.filter(pk=application_id).first()
+    if application is None:
+        return
+    applicant_search.index_application(application, resume_text(application))
+
+
+def resume_text(application):
+    """Extracted resume text, computed once per distinct file and kept on its ResumeBlob."""
+    if not application.resume:
+        return ''
+    name = application.resume.name
+    blob = ResumeBlob.objects.filter(name=name).first()
+    if blob is not None and blob.processed_at:
+        return blob.text
+
+    try:
+        with application.resume.open('rb') as resume:
+            hasher = hashlib.sha256()
+            size = 0
+            for chunk in resume.chunks():
+                hasher.update(chunk)
+                size += len(chunk)
+            resume.seek(0)
+            text = resumes.extract_text(resume, name)
+    except FileNotFoundError:
+        # Index the cover letter anyway; retrying will not bring the file back.
+        logger.warning('Resume %s is missing from storage', name)
+        return ''
+    if blob is not None:
+        if hasher.hexdigest() != blob.sha256:
+            logger.warning('Resume %s does not match its content hash', name)
+        ResumeBlob.objects.filter(pk=blob.pk).update(size=size, text=text, processed_at=timezone.now())
+    return text
+
+
+@task
+def notify_employer(application_id):
+    """Email the job poster about a new application."""
+    application = (JobApplication.objects.select_related('job__posted_by', 'applicant')
+                   .filter(pk=application_id).first())
+    if application is None:
+        return
+    employer = application.job.posted_by
+    if not employer.email:
+        return
+    path = reverse('view_applications', args=[application.job_id])
+    send_mail(
+        f'New application for {application.job.title}',
+        f'{application.applicant.username} applied for {application.job.title} '
+        f'at {application.job.company}.\n\nReview applications: {path}',
+        None,
+        [employer.email],
+    )
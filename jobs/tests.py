@@ -1,9 +1,34 @@
-﻿from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase, Client
+﻿import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.contrib.auth.models import User
-from .models import Job, JobCategory, JobApplication
+from rest_framework.test import APIClient
+from jobportal.instrumentation import RequestMetrics
+from .models import ApplicantTerm, Job, JobCategory, JobApplication, JobFacetCount, ResumeBlob
+from . import applicant_search, counters, facets, resumes
+from .applications import AlreadyApplied, statuses_changed, submit_application, update_statuses
+from .resumes import extract_text
+from .salary import parse_salary
+from .search import search
+from .storage import ContentAddressedStorage
+from .uploads import ResumeUploadHandler
 
 # ========== MODEL TESTS ==========
 class TestJobCategoryModel(TestCase):
@@ -144,6 +169,7 @@ class TestJobViews(TestCase):
     """Test job views."""
     
     def setUp(self):
+        cache.clear()
         self.client = Client()
         
         # Create users
@@ -265,4 +291,1163 @@ class TestJobViews(TestCase):
         })
         
         self.assertEqual(response.status_code, 302)  # Redirect after success
-        self.assertTrue(Job.objects.filter(title='New Job Position').exists())
\ No newline at end of file
+        self.assertTrue(Job.objects.filter(title='New Job Position').exists())
+
+# ========== PAGINATION TESTS ==========
+class TestHomePagination(TestCase):
+    """Test keyset pagination of the home page."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@test.com',
+            password='testpass123'
+        )
+        self.jobs = [
+            Job.objects.create(
+                title=f'Job {i}',
+                company='Paging Corp',
+                location='Remote',
+                description='Description',
+                requirements='Requirements',
+                job_type='full_time',
+                posted_by=self.employer,
+                is_active=True
+            )
+            for i in range(5)
+        ]
+    
+    def test_pages_cover_all_jobs_in_order(self):
+        """Test that following cursors walks every job exactly once."""
+        seen = []
+        url = reverse('home') + '?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(job.id for job in response.context['jobs'])
+            next_query = response.context['next_query']
+            url = reverse('home') + '?' + next_query if next_query else None
+        
+        expected = [job.id for job in sorted(self.jobs, key=lambda j: (j.created_at, j.id), reverse=True)]
+        self.assertEqual(seen, expected)
+    
+    def test_page_query_count_is_constant(self):
+        """Test that a deep page costs the same queries as the first one."""
+        with CaptureQueriesContext(connection) as first_page:
+            first = self.client.get(reverse('home') + '?page_size=1')
+        cursor = first.context['next_query']
+        with self.assertNumQueries(len(first_page)):
+            self.client.get(reverse('home') + '?' + cursor)
+    
+    def test_invalid_cursor(self):
+        """Test that a garbage cursor returns 404."""
+        response = self.client.get(reverse('home') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+# ========== SEARCH TESTS ==========
+class TestJobSearch(TestCase):
+    """Test full-text job search."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@test.com',
+            password='testpass123'
+        )
+        # Indexing is a task, run once the jobs are committed.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_job = Job.objects.create(
+                title='Python Developer',
+                company='Snake Corp',
+                location='Remote',
+                description='Build web services',
+                requirements='Django experience',
+                job_type='full_time',
+                posted_by=self.employer,
+                is_active=True
+            )
+            self.other_job = Job.objects.create(
+                title='Accountant',
+                company='Numbers Ltd',
+                location='Paris',
+                description='Keep the books, some python scripting is a plus',
+                requirements='CPA',
+                job_type='full_time',
+                posted_by=self.employer,
+                is_active=True
+            )
+    
+    def test_search_ranks_title_matches_first(self):
+        """Test that a title match outranks a description match."""
+        response = self.client.get(reverse('home'), {'q': 'python'})
+        self.assertEqual(
+            [job.id for job in response.context['jobs']],
+            [self.python_job.id, self.other_job.id]
+        )
+    
+    def test_search_uses_stemming_and_prefixes(self):
+        """Test that stemmed and partial terms match."""
+        response = self.client.get(reverse('home'), {'q': 'servic'})
+        self.assertEqual([job.id for job in response.context['jobs']], [self.python_job.id])
+    
+    def test_index_follows_updates_and_deactivation(self):
+        """Test that the index is maintained as jobs change."""
+        self.python_job.title = 'Rust Developer'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_job.save()
+        response = self.client.get(reverse('home'), {'q': 'rust'})
+        self.assertEqual([job.id for job in response.context['jobs']], [self.python_job.id])
+        
+        self.python_job.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_job.save()
+        response = self.client.get(reverse('home'), {'q': 'rust'})
+        self.assertEqual(list(response.context['jobs']), [])
+    
+    def test_search_pagination(self):
+        """Test that ranked results can be paged with cursors."""
+        response = self.client.get(reverse('home'), {'q': 'python', 'page_size': 1})
+        self.assertEqual([job.id for job in response.context['jobs']], [self.python_job.id])
+        response = self.client.get(reverse('home') + '?' + response.context['next_query'])
+        self.assertEqual([job.id for job in response.context['jobs']], [self.other_job.id])
+        self.assertIsNone(response.context['next_query'])
+    
+    @override_settings(SEARCH_MAX_RESULTS=2)
+    def test_filters_apply_to_every_match(self):
+        """Test that matches beyond SEARCH_MAX_RESULTS still reach filtered pages and counts."""
+        with self.captureOnCommitCallbacks(execute=True):
+            contracts = [
+                Job.objects.create(
+                    title=f'Python Contractor {index}', company='Gig Co', location='Lyon',
+                    description='Short python mission', requirements='Python',
+                    job_type='contract', posted_by=self.employer, is_active=True
+                )
+                for index in range(2)
+            ]
+            for index in range(3):
+                Job.objects.create(
+                    title=f'Python Python Lead {index}', company='Python Python Inc', location='Remote',
+                    description='Python', requirements='Python', job_type='full_time',
+                    posted_by=self.employer, is_active=True
+                )
+        
+        response = self.client.get(reverse('home'), {'q': 'python', 'job_type': 'contract'})
+        self.assertEqual({job.id for job in response.context['jobs']}, {job.id for job in contracts})
+        job_types = {value['value']: value['count'] for value in response.context['facets']['job_type']}
+        self.assertEqual(job_types, {'full_time': 5, 'contract': 2})
+        
+        response = self.client.get(reverse('home'), {'q': 'python', 'page_size': 3})
+        ranks = [job.rank for job in response.context['jobs']]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        response = self.client.get(reverse('home') + '?' + response.context['next_query'])
+        self.assertEqual(len(response.context['jobs']), 3)
+        response = self.client.get(reverse('home') + '?' + response.context['next_query'])
+        self.assertEqual(len(response.context['jobs']), 1)
+
+
+# ========== FACET TESTS ==========
+class TestJobFacets(TestCase):
+    """Test facet filters and incrementally maintained facet counts."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@test.com',
+            password='testpass123'
+        )
+        self.it = JobCategory.objects.create(name='IT')
+        self.sales = JobCategory.objects.create(name='Sales')
+        self.remote_job = self._create_job('Backend Engineer', self.it, 'remote', 'Remote')
+        self.office_job = self._create_job('Account Manager', self.sales, 'full_time', 'Paris')
+    
+    def _create_job(self, title, category, job_type, location):
+        return Job.objects.create(
+            title=title,
+            company='Facet Corp',
+            location=location,
+            description='Description',
+            requirements='Requirements',
+            job_type=job_type,
+            category=category,
+            posted_by=self.employer,
+            is_active=True
+        )
+    
+    def _counts(self, facet):
+        return dict(JobFacetCount.objects.filter(facet=facet, count__gt=0).values_list('value', 'count'))
+    
+    def test_counts_follow_writes(self):
+        """Test that counts move with creates, edits, deactivation and deletes."""
+        self.assertEqual(self._counts('job_type'), {'remote': 1, 'full_time': 1})
+        
+        self.office_job.job_type = 'remote'
+        self.office_job.save()
+        self.assertEqual(self._counts('job_type'), {'remote': 2})
+        
+        self.remote_job.is_active = False
+        self.remote_job.save()
+        self.assertEqual(self._counts('category'), {str(self.sales.id): 1})
+        
+        self.office_job.delete()
+        self.assertEqual(self._counts('location'), {})
+    
+    def test_rebuild_matches_incremental_counts(self):
+        """Test that a rebuild produces the same counts."""
+        before = sorted(JobFacetCount.objects.filter(count__gt=0).values_list('facet', 'value', 'count'))
+        facets.rebuild()
+        after = sorted(JobFacetCount.objects.values_list('facet', 'value', 'count'))
+        self.assertEqual(before, after)
+    
+    def test_home_view_filters_and_sidebar_counts(self):
+        """Test facet filtering on the home page."""
+        response = self.client.get(reverse('home'), {'job_type': 'remote'})
+        self.assertEqual([job.id for job in response.context['jobs']], [self.remote_job.id])
+        self.assertContains(response, 'Sales')
+        self.assertContains(response, '(1)')
+        
+        response = self.client.get(reverse('home'), {'category': self.sales.id, 'location': 'Paris'})
+        self.assertEqual([job.id for job in response.context['jobs']], [self.office_job.id])
+    
+    def test_sidebar_does_not_aggregate(self):
+        """Test that rendering the facet sidebar does not run GROUP BY queries."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('home'))
+        self.assertFalse(any('GROUP BY' in query['sql'] for query in queries.captured_queries))
+
+
+# ========== INSTRUMENTATION TESTS ==========
+class TestRequestMetrics(TestCase):
+    """Test the request metrics middleware."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='metrics',
+            email='metrics@test.com',
+            password='testpass123'
+        )
+    
+    def test_server_timing_header(self):
+        """Test that query and template timings are reported."""
+        response = self.client.get(reverse('home'))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('tmpl;dur=', timing)
+        self.assertIn('total;dur=', timing)
+    
+    def test_repeated_queries_are_counted(self):
+        """Test that N+1 style repeats are flagged as duplicates."""
+        metrics = RequestMetrics()
+        for _ in range(3):
+            metrics(lambda *args: None, 'SELECT * FROM jobs_job WHERE id = %s', [1], False, {})
+        metrics(lambda *args: None, 'SELECT * FROM jobs_jobcategory', [], False, {})
+        self.assertEqual(metrics.queries, 4)
+        self.assertEqual(metrics.duplicates, 2)
+    
+    def test_sampling_disabled(self):
+        """Test that unsampled requests are not instrumented."""
+        with self.settings(REQUEST_METRICS_SAMPLE_RATE=0):
+            response = self.client.get(reverse('home'))
+        self.assertFalse(response.has_header('Server-Timing'))
+    
+    def test_log_line(self):
+        """Test that a structured log line is written per request."""
+        with self.assertLogs('jobportal.requests', level='INFO') as logs:
+            self.client.get(reverse('home'))
+        self.assertIn('"path": "/"', logs.output[0])
+        self.assertIn('"queries":', logs.output[0])
+
+
+# ========== RESPONSE CACHE TESTS ==========
+class TestJobBoardCache(TestCase):
+    """Test the public job board response cache."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.employer = User.objects.create_user(
+            username='employer',
+            email='employer@test.com',
+            password='testpass123'
+        )
+        self.job = Job.objects.create(
+            title='Cached Job',
+            company='Cache Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.employer,
+            is_active=True
+        )
+    
+    def test_anonymous_hits_are_served_from_cache(self):
+        """Test that a repeated anonymous request runs no queries."""
+        first = self.client.get(reverse('home'))
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('home'))
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.content, second.content)
+    
+    def test_query_params_are_part_of_the_key(self):
+        """Test that different filters are cached separately."""
+        self.client.get(reverse('home'))
+        response = self.client.get(reverse('home'), {'job_type': 'contract'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertNotContains(response, 'Cached Job')
+    
+    def test_uncommitted_write_keeps_the_version(self):
+        """Test that pages are only invalidated once the write commits."""
+        self.client.get(reverse('home'))
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.title = 'Renamed Job'
+            self.job.save()
+            self.assertEqual(self.client.get(reverse('home'))['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(reverse('home'))['X-Cache'], 'MISS')
+    
+    def test_job_and_category_writes_invalidate(self):
+        """Test that saving a job or category invalidates cached pages."""
+        self.client.get(reverse('home'))
+        self.job.title = 'Renamed Job'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.save()
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertContains(response, 'Renamed Job')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            JobCategory.objects.create(name='Brand New Category')
+        self.assertEqual(self.client.get(reverse('home'))['X-Cache'], 'MISS')
+    
+    def test_authenticated_users_bypass_cache(self):
+        """Test that pages showing the current user are never cached."""
+        self.client.login(username='employer', password='testpass123')
+        self.client.get(reverse('home'))
+        response = self.client.get(reverse('home'))
+        self.assertFalse(response.has_header('X-Cache'))
+        self.assertContains(response, 'Welcome, employer')
+    
+    def test_api_list_is_cached(self):
+        """Test that the public API list is cached and invalidated."""
+        self.assertEqual(self.client.get(reverse('api_jobs'))['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api_jobs'))
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()[0]['title'], 'Cached Job')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.delete()
+        self.assertEqual(self.client.get(reverse('api_jobs')).json(), [])
+    
+    def test_browsable_api_is_never_shared(self):
+        """Test that a second client never receives the first client's CSRF token."""
+        pages = []
+        for client in (Client(), Client()):
+            response = client.get(reverse('api_jobs'), HTTP_ACCEPT='text/html')
+            self.assertEqual(response['X-Cache'], 'MISS')
+            pages.append(re.search(r'"csrfToken": "([^"]+)"', response.content.decode()).group(1))
+            self.assertIn('csrftoken', response.cookies)
+        self.assertNotEqual(pages[0], pages[1])
+    
+    def test_pages_varying_on_cookie_are_shared_without_cookies_only(self):
+        """Test that a page with Vary: Cookie is only shared between cookieless clients."""
+        first = self.client.get(reverse('home'))
+        self.assertIn('Cookie', first['Vary'])
+        self.assertEqual(Client().get(reverse('home'))['X-Cache'], 'HIT')
+        
+        with_cookie = Client()
+        with_cookie.cookies['csrftoken'] = 'a' * 32
+        self.assertEqual(with_cookie.get(reverse('home'))['X-Cache'], 'MISS')
+        self.assertEqual(with_cookie.get(reverse('home'))['X-Cache'], 'MISS')
+
+
+# ========== CONDITIONAL GET TESTS ==========
+class TestConditionalGet(TestCase):
+    """Test ETag / Last-Modified revalidation of job pages."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='poller',
+            email='poller@test.com',
+            password='testpass123'
+        )
+        self.job = Job.objects.create(
+            title='Polled Job',
+            company='Feed Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.user,
+            is_active=True
+        )
+    
+    def test_api_list_not_modified(self):
+        """Test that an unchanged feed revalidates with a cheap 304."""
+        with self.settings(JOB_BOARD_CACHE_TIMEOUT=0):
+            response = self.client.get(reverse('api_jobs'))
+            etag = response['ETag']
+            self.assertTrue(response.has_header('Last-Modified'))
+            
+            with self.assertNumQueries(1):
+                response = self.client.get(reverse('api_jobs'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+    
+    def test_cached_list_revalidates_without_queries(self):
+        """Test that a cache hit answers If-None-Match on its own."""
+        etag = self.client.get(reverse('home'))['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+    
+    def test_list_etag_changes_on_write(self):
+        """Test that editing or deleting a job changes the list ETag."""
+        etag = self.client.get(reverse('api_jobs'))['ETag']
+        self.job.title = 'Edited'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.save()
+        response = self.client.get(reverse('api_jobs'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.delete()
+        response = self.client.get(reverse('api_jobs'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+    
+    def test_detail_if_modified_since(self):
+        """Test Last-Modified on the public job page."""
+        response = self.client.get(reverse('job_detail', args=[self.job.id]))
+        last_modified = response['Last-Modified']
+        response = self.client.get(
+            reverse('job_detail', args=[self.job.id]),
+            HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+    
+    def test_detail_etag_tracks_has_applied(self):
+        """Test that applying changes the job page ETag for that user."""
+        self.client.login(username='poller', password='testpass123')
+        etag = self.client.get(reverse('job_detail', args=[self.job.id]))['ETag']
+        JobApplication.objects.create(
+            job=self.job,
+            applicant=self.user,
+            cover_letter='Hello',
+            resume='resume.pdf'
+        )
+        response = self.client.get(reverse('job_detail', args=[self.job.id]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'already applied')
+    
+    def test_api_detail_not_modified(self):
+        """Test 304 on the authenticated job detail API."""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse('api_job_detail', args=[self.job.id])
+        etag = client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        
+        self.assertEqual(APIClient().get(url, HTTP_IF_NONE_MATCH=etag).status_code, 401)
+
+
+# ========== APPLICATION COUNTER TESTS ==========
+class TestApplicationCounters(TestCase):
+    """Test the denormalized application counters on Job."""
+    
+    def setUp(self):
+        self.employer = User.objects.create_superuser(
+            username='boss',
+            email='boss@test.com',
+            password='testpass123'
+        )
+        self.job = Job.objects.create(
+            title='Counted Job',
+            company='Count Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.employer,
+            is_active=True
+        )
+        self.applicants = [
+            User.objects.create_user(username=f'applicant{i}', password='testpass123')
+            for i in range(3)
+        ]
+        self.applications = [
+            JobApplication.objects.create(
+                job=self.job,
+                applicant=applicant,
+                cover_letter='Hello',
+                resume='resume.pdf'
+            )
+            for applicant in self.applicants
+        ]
+    
+    def test_counters_follow_creates_status_changes_and_deletes(self):
+        """Test that counters are maintained on every write."""
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 3)
+        self.assertEqual(self.job.pending_count, 3)
+        
+        application = self.applications[0]
+        application.status = 'accepted'
+        application.save()
+        self.applications[1].delete()
+        
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 2)
+        self.assertEqual(self.job.pending_count, 1)
+        self.assertEqual(self.job.accepted_count, 1)
+    
+    def test_saving_a_stale_job_keeps_newer_counts(self):
+        """Test that a full save, as in the admin, does not undo concurrent increments."""
+        stale = Job.objects.get(pk=self.job.pk)
+        JobApplication.objects.create(
+            job=self.job,
+            applicant=User.objects.create_user(username='late', password='testpass123'),
+            cover_letter='Hello',
+            resume='resume.pdf'
+        )
+        stale.is_active = False
+        stale.save()
+        
+        self.job.refresh_from_db()
+        self.assertFalse(self.job.is_active)
+        self.assertEqual((self.job.application_count, self.job.pending_count), (4, 4))
+    
+    def test_admin_shows_counters_read_only(self):
+        """Test that the admin form has no inputs for the counters."""
+        self.client.login(username='boss', password='testpass123')
+        response = self.client.get(reverse('admin:jobs_job_change', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('application_count', response.context['adminform'].form.fields)
+        self.assertContains(response, 'Application count')
+    
+    def test_reconcile_repairs_drift(self):
+        """Test that the reconcile command fixes drifted counters."""
+        Job.objects.filter(pk=self.job.pk).update(application_count=99, rejected_count=5)
+        out = StringIO()
+        call_command('reconcile_application_counts', stdout=out)
+        self.assertIn('1 job(s)', out.getvalue())
+        
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 3)
+        self.assertEqual(self.job.rejected_count, 0)
+    
+    def test_dashboard_does_not_scan_applications(self):
+        """Test that the dashboard reads totals without touching applications."""
+        self.client.login(username='boss', password='testpass123')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.context['total_applications'], 3)
+        self.assertFalse(any('jobs_jobapplication' in query['sql'] for query in queries.captured_queries))
+
+
+
+# ========== BULK STATUS TESTS ==========
+class TestBulkStatusUpdate(TestCase):
+    """Test changing many application statuses in one go."""
+    
+    def setUp(self):
+        self.employer = User.objects.create_user(username='screener', password='testpass123', is_staff=True)
+        self.other = User.objects.create_user(username='other', password='testpass123', is_staff=True)
+        self.job = Job.objects.create(
+            title='Screened Job', company='Screen Corp', location='Remote',
+            description='Description', requirements='Requirements',
+            job_type='remote', posted_by=self.employer, is_active=True
+        )
+        self.other_job = Job.objects.create(
+            title='Other Job', company='Other Corp', location='Remote',
+            description='Description', requirements='Requirements',
+            job_type='remote', posted_by=self.other, is_active=True
+        )
+        self.applications = [
+            JobApplication.objects.create(
+                job=self.job,
+                applicant=User.objects.create_user(username=f'candidate{i}', password='testpass123'),
+                cover_letter='Hello',
+                resume='resume.pdf'
+            )
+            for i in range(4)
+        ]
+        self.foreign = JobApplication.objects.create(
+            job=self.other_job, applicant=self.applications[0].applicant,
+            cover_letter='Hello', resume='resume.pdf'
+        )
+    
+    def test_one_update_per_status_with_counters_and_signal(self):
+        """Test statuses, counters and the batch signal after a bulk update."""
+        received = []
+        def handler(sender, changes, **kwargs):
+            received.append(changes)
+        statuses_changed.connect(handler)
+        self.addCleanup(statuses_changed.disconnect, handler)
+        
+        first, second, third, fourth = [application.id for application in self.applications]
+        with CaptureQueriesContext(connection) as queries:
+            result = update_statuses(
+                {first: 'accepted', second: 'rejected', third: 'rejected', fourth: 'pending',
+                 self.foreign.id: 'accepted', 999999: 'accepted'},
+                owner=self.employer
+            )
+        status_updates = [query for query in queries.captured_queries
+                          if query['sql'].startswith('UPDATE "jobs_jobapplication"')]
+        self.assertEqual(len(status_updates), 2)
+        self.assertEqual(sorted(result.updated), [first, second, third])
+        self.assertEqual(result.unchanged, [fourth])
+        self.assertEqual(result.missing, [self.foreign.id, 999999])
+        self.assertEqual(len(received), 1)
+        self.assertEqual(len(received[0]), 3)
+        
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.pending_count, self.job.accepted_count, self.job.rejected_count), (1, 1, 2))
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.status, 'pending')
+    
+    def test_employer_page_bulk_form(self):
+        """Test the applications page posts ticked applications to the bulk view."""
+        self.client.login(username='screener', password='testpass123')
+        response = self.client.post(reverse('update_application_status', args=[self.job.id]), {
+            'status': 'reviewed',
+            'applications': [self.applications[0].id, self.applications[1].id, self.foreign.id],
+        })
+        self.assertRedirects(response, reverse('view_applications', args=[self.job.id]))
+        self.assertEqual(JobApplication.objects.filter(status='reviewed').count(), 2)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.reviewed_count, 2)
+    
+    def test_admin_action(self):
+        """Test the admin action updates the selection and keeps counters right."""
+        admin_user = User.objects.create_superuser(username='root', email='root@test.com', password='testpass123')
+        self.client.force_login(admin_user)
+        response = self.client.post(reverse('admin:jobs_jobapplication_changelist'), {
+            'action': 'mark_rejected',
+            '_selected_action': [self.applications[2].id, self.foreign.id],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.job.refresh_from_db()
+        self.other_job.refresh_from_db()
+        self.assertEqual(self.job.rejected_count, 1)
+        self.assertEqual(self.other_job.rejected_count, 1)
+        self.assertEqual(self.other_job.pending_count, 0)
+
+
+# ========== ASYNC VIEW TESTS ==========
+@override_settings(ROOT_URLCONF='jobportal.urls_async')
+class TestAsyncViews(TestCase):
+    """Test the async home and detail views served in ASGI mode."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='asyncer', password='testpass123')
+        category = JobCategory.objects.create(name='Async')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jobs = [
+                Job.objects.create(
+                    title=f'Async Job {index}', company='Loop Corp', location='Remote',
+                    description='Event loop work', requirements='Requirements',
+                    job_type='remote', category=category, posted_by=self.user, is_active=True
+                )
+                for index in range(3)
+            ]
+    
+    async def test_home_page(self):
+        """Test the async home page paginates, renders facets and is cached."""
+        client = AsyncClient()
+        response = await client.get(reverse('home'), {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job.title for job in response.context['jobs']], ['Async Job 2', 'Async Job 1'])
+        self.assertIsNotNone(response.context['next_query'])
+        self.assertEqual(response.context['facets']['category'][0]['count'], 3)
+        self.assertNotIn('"0 queries"', response['Server-Timing'])
+        
+        second = await client.get(reverse('home'), {'page_size': 2})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        not_modified = await client.get(reverse('home'), {'page_size': 2}, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(not_modified.status_code, 304)
+    
+    async def test_home_page_search(self):
+        """Test ?q= ranks through the async search path."""
+        response = await AsyncClient().get(reverse('home'), {'q': 'loop'})
+        self.assertEqual(len(response.context['jobs']), 3)
+    
+    async def test_job_detail(self):
+        """Test the async detail page for visitors and applicants."""
+        client = AsyncClient()
+        job = self.jobs[0]
+        response = await client.get(reverse('job_detail', args=[job.id]))
+        self.assertContains(response, 'Async Job 0')
+        self.assertFalse(response.context['has_applied'])
+        
+        await JobApplication.objects.acreate(job=job, applicant=self.user, cover_letter='Hi', resume='resume.pdf')
+        await client.aforce_login(self.user)
+        response = await client.get(reverse('job_detail', args=[job.id]))
+        self.assertTrue(response.context['has_applied'])
+        
+        response = await client.get(reverse('job_detail', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+
+# ========== APPLY PATH TESTS ==========
+class TestApplyPath(TestCase):
+    """Test the insert-first apply flow of apply_job_view."""
+    
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='applicant',
+            email='applicant@test.com',
+            password='testpass123'
+        )
+        self.job = Job.objects.create(
+            title='Busy Job',
+            company='Busy Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.user,
+            is_active=True
+        )
+        self.client.login(username='applicant', password='testpass123')
+    
+    def _post(self):
+        return self.client.post(reverse('apply_job', args=[self.job.id]), {
+            'cover_letter': 'Hello',
+            'resume': SimpleUploadedFile('resume.pdf', b'content', content_type='application/pdf')
+        }, follow=True)
+    
+    def test_duplicate_post_is_reported_not_raised(self):
+        """Test that a second POST hits the constraint and shows the warning."""
+        self._post()
+        response = self._post()
+        self.assertContains(response, 'You have already applied for this job.')
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), 1)
+    
+    def test_submit_application_raises_already_applied(self):
+        """Test the shared helper translates the unique violation."""
+        self._post()
+        with self.assertRaises(AlreadyApplied):
+            submit_application(JobApplication(
+                job=self.job,
+                applicant=self.user,
+                cover_letter='Again',
+                resume='resume.pdf'
+            ))
+
+class TestResumeUploads(TestCase):
+    """Test streamed, size-limited and deduplicated resume uploads."""
+    
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root, RESUME_UPLOAD_MAX_SIZE=1024,
+                                  RESUME_UPLOAD_MAX_REQUEST_SIZE=4096)
+        media.enable()
+        self.addCleanup(media.disable)
+        
+        self.owner = User.objects.create_user(username='owner', password='testpass123')
+        self.job = Job.objects.create(
+            title='Upload Job',
+            company='Upload Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.owner,
+            is_active=True
+        )
+    
+    def _apply(self, username, content, name='resume.pdf'):
+        User.objects.create_user(username=username, password='testpass123')
+        client = Client()
+        client.login(username=username, password='testpass123')
+        with self.captureOnCommitCallbacks(execute=True):
+            return client.post(reverse('apply_job', args=[self.job.id]), {
+                'cover_letter': 'Hello',
+                'resume': SimpleUploadedFile(name, content, content_type='application/pdf')
+            })
+    
+    def test_resume_stored_under_content_hash(self):
+        """Test the stored name is the SHA-256 of the uploaded bytes."""
+        self._apply('first', b'%PDF my resume')
+        application = JobApplication.objects.get()
+        digest = hashlib.sha256(b'%PDF my resume').hexdigest()
+        self.assertEqual(application.resume.name, f'resumes/{digest[:2]}/{digest}.pdf')
+        with application.resume.open('rb') as stored:
+            self.assertEqual(stored.read(), b'%PDF my resume')
+    
+    def test_identical_resumes_share_one_file(self):
+        """Test identical uploads are stored once and reference counted."""
+        self._apply('first', b'same bytes', name='cv.pdf')
+        self._apply('second', b'same bytes', name='other-name.pdf')
+        names = set(JobApplication.objects.values_list('resume', flat=True))
+        self.assertEqual(len(names), 1)
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.size, len(b'same bytes'))
+    
+    def test_file_removed_with_last_reference(self):
+        """Test the shared file survives until its last application is deleted."""
+        self._apply('first', b'shared')
+        self._apply('second', b'shared')
+        first, second = JobApplication.objects.order_by('id')
+        storage, name = first.resume.storage, first.resume.name
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(storage.exists(name))
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(storage.exists(name))
+        self.assertFalse(ResumeBlob.objects.exists())
+    
+    def test_deferred_delete_spares_a_file_being_reused(self):
+        """Test a pending delete that runs while the same bytes are uploaded again keeps the file."""
+        self._apply('first', b'reused')
+        first = JobApplication.objects.get()
+        storage, name = first.resume.storage, first.resume.name
+        with self.captureOnCommitCallbacks() as pending:
+            first.delete()
+        
+        save = ContentAddressedStorage._save
+        
+        def save_then_delete(storage, name, content):
+            # The delete lands after the upload found the file already stored.
+            name = save(storage, name, content)
+            for callback in pending:
+                callback()
+            return name
+        
+        with mock.patch.object(ContentAddressedStorage, '_save', save_then_delete):
+            self._apply('second', b'reused')
+        self.assertTrue(storage.exists(name))
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+    
+    def test_oversized_resume_rejected(self):
+        """Test a resume over the limit is refused without creating anything."""
+        response = self._apply('first', b'x' * 2048)
+        self.assertRedirects(response, reverse('apply_job', args=[self.job.id]))
+        self.assertFalse(JobApplication.objects.exists())
+    
+    def test_oversized_request_not_parsed(self):
+        """Test a body over the request limit is refused before parsing."""
+        handler = ResumeUploadHandler()
+        self.assertIsNotNone(handler.handle_raw_input(None, {}, 8192, b'boundary'))
+        self.assertTrue(handler.too_large)
+        self.assertIsNone(ResumeUploadHandler().handle_raw_input(None, {}, 100, b'boundary'))
+
+class TestApplicantSearch(TestCase):
+    """Test resume text extraction and the per-job applicant index."""
+    
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        
+        self.employer = User.objects.create_user(username='employer', password='testpass123', is_staff=True)
+        self.job = Job.objects.create(
+            title='Platform Engineer',
+            company='Infra Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.employer,
+            is_active=True
+        )
+    
+    def _application(self, username, resume_name, resume_content, cover_letter='Hello'):
+        applicant = User.objects.create_user(username=username, password='testpass123')
+        with self.captureOnCommitCallbacks(execute=True):
+            return JobApplication.objects.create(
+                job=self.job,
+                applicant=applicant,
+                cover_letter=cover_letter,
+                resume=SimpleUploadedFile(resume_name, resume_content)
+            )
+    
+    def _docx(self, text):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>'
+            ))
+        return buffer.getvalue()
+    
+    def test_extract_text_from_docx_and_plain_text(self):
+        """Test DOCX and text resumes are turned into plain text."""
+        self.assertIn('Kubernetes operator', extract_text(io.BytesIO(self._docx('Kubernetes operator')), 'cv.docx'))
+        self.assertEqual(extract_text(io.BytesIO(b'plain words'), 'cv.txt'), 'plain words')
+        self.assertEqual(extract_text(io.BytesIO(b'not a zip'), 'cv.docx'), '')
+    
+    def test_extract_text_from_pdf(self):
+        """Test a real PDF resume is turned into plain text and found by applicant search."""
+        content = (Path(__file__).parent / 'testdata' / 'resume.pdf').read_bytes()
+        application = self._application('pdf', 'cv.pdf', content)
+        self.assertIn('Kubernetes platform engineer', resumes.extract_text(application.resume.open('rb'), 'cv.pdf'))
+        self.assertEqual(applicant_search.search(self.job.id, 'terraform')[0][0], application.id)
+        
+        with mock.patch.object(resumes, 'PdfReader', None), self.assertLogs('jobs.resumes', 'ERROR'):
+            self.assertEqual(resumes.extract_text(io.BytesIO(content), 'cv.pdf'), '')
+    
+    def test_search_ranks_matching_applicants(self):
+        """Test only applicants with every term match, more mentions rank higher."""
+        once = self._application('once', 'once.txt', b'Python and kubernetes')
+        twice = self._application('twice', 'twice.docx', self._docx('kubernetes kubernetes python'))
+        self._application('none', 'none.txt', b'Java developer')
+        
+        hits = applicant_search.search(self.job.id, 'Kubernetes python')
+        self.assertEqual([application_id for application_id, _ in hits], [twice.id, once.id])
+        self.assertEqual(applicant_search.search(self.job.id, 'kubernetes cobol'), [])
+    
+    def test_cover_letter_is_indexed(self):
+        """Test the cover letter is searchable alongside the resume."""
+        application = self._application('writer', 'cv.bin', b'\x00\x01', cover_letter='Terraform expert')
+        self.assertEqual(applicant_search.search(self.job.id, 'terraform')[0][0], application.id)
+    
+    def test_resume_text_extracted_once_per_content(self):
+        """Test identical resumes reuse the text stored on their ResumeBlob."""
+        self._application('first', 'cv.txt', b'golang')
+        self._application('second', 'cv.txt', b'golang')
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.text, 'golang')
+        self.assertIsNotNone(blob.processed_at)
+        self.assertEqual(ApplicantTerm.objects.filter(term='golang').count(), 2)
+    
+    def test_view_applications_query_filter(self):
+        """Test ?q= on view_applications lists only the matching applicants."""
+        self._application('match', 'cv.txt', b'kubernetes')
+        self._application('other', 'cv.txt', b'accounting')
+        client = Client()
+        client.login(username='employer', password='testpass123')
+        
+        response = client.get(reverse('view_applications', args=[self.job.id]), {'q': 'kubernetes'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a.applicant.username for a in response.context['applications']], ['match'])
+
+class TestSalary(TestCase):
+    """Test salary parsing, backfill and the salary filter and sort."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='poster', password='testpass123')
+    
+    def _job(self, salary, title='Job'):
+        return Job.objects.create(
+            title=title,
+            company='Pay Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            salary=salary,
+            job_type='remote',
+            posted_by=self.user,
+            is_active=True
+        )
+    
+    def test_parse_salary_formats(self):
+        """Test common salary strings parse to yearly ranges."""
+        self.assertEqual(parse_salary('$80,000 - $100,000'), (80000, 100000, 'USD', 'year'))
+        self.assertEqual(parse_salary('80k-100k EUR'), (80000, 100000, 'EUR', 'year'))
+        self.assertEqual(parse_salary('£25/hour'), (52000, 52000, 'GBP', 'hour'))
+        self.assertEqual(parse_salary('$6,000/month'), (72000, 72000, 'USD', 'month'))
+        self.assertEqual(parse_salary('Competitive'), (None, None, '', ''))
+    
+    def test_save_parses_and_keeps_text(self):
+        """Test saving a job fills the structured fields and keeps the display text."""
+        job = self._job('$80,000 - $100,000')
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min, job.salary_max, job.salary_currency), (80000, 100000, 'USD'))
+        self.assertEqual(job.salary, '$80,000 - $100,000')
+    
+    def test_backfill_command_updates_in_batches(self):
+        """Test the backfill command repairs rows written without parsing."""
+        jobs = [self._job('$%d,000' % amount) for amount in (50, 60, 70)]
+        Job.objects.update(salary_min=None, salary_max=None, salary_currency='', salary_period='')
+        out = StringIO()
+        call_command('backfill_salaries', batch_size=2, stdout=out)
+        self.assertIn('3 job(s) parsed, 3 updated', out.getvalue())
+        self.assertEqual(
+            list(Job.objects.filter(pk__in=[job.pk for job in jobs]).order_by('pk').values_list('salary_max', flat=True)),
+            [50000, 60000, 70000]
+        )
+    
+    def test_home_salary_filter_and_sort(self):
+        """Test ?salary_min= filters and ?sort=salary orders by pay."""
+        self._job('$50,000', title='Low')
+        self._job('$150,000', title='High')
+        self._job('$90,000 - $120,000', title='Mid')
+        self._job('Competitive', title='Unknown')
+        
+        response = self.client.get(reverse('home'), {'sort': 'salary', 'salary_min': '80000'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['High', 'Mid'])
+
+class TestBulkImportExport(TestCase):
+    """Test the import_jobs and export_jobs commands."""
+    
+    CSV = (
+        'title,company,location,description,requirements,salary,job_type,category,is_active\n'
+        'Backend Dev,Acme,Berlin,Build APIs,Python,"$90,000",full_time,Technology,\n'
+        'Data Analyst,Acme,Paris,Analyse,SQL,,part_time,2,false\n'
+        ',Acme,Rome,No title,None,,remote,,\n'
+        'Designer,Acme,Oslo,Design,Figma,,freelance,Unknown,\n'
+    )
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer', password='testpass123', is_staff=True)
+        self.category = JobCategory.objects.create(name='Technology')
+        self.other_category = JobCategory.objects.create(name='Finance')
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+    
+    def _write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        return path
+    
+    def _import(self, path, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_jobs', path, user='importer', batch_size=2, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+    
+    def test_import_csv_validates_and_reports_rows(self):
+        """Test valid rows are inserted in batches and invalid rows reported by line."""
+        out, err = self._import(self._write('jobs.csv', self.CSV.replace(',2,', f',{self.other_category.pk},')))
+        self.assertIn('4 row(s) read, 2 imported, 2 rejected', out)
+        report = [json.loads(line) for line in err.splitlines()]
+        self.assertEqual([entry['line'] for entry in report], [4, 5])
+        self.assertIn('title', report[0]['errors'])
+        self.assertEqual(set(report[1]['errors']), {'job_type', 'category'})
+        
+        backend = Job.objects.get(title='Backend Dev')
+        self.assertEqual((backend.category, backend.is_active, backend.salary_max), (self.category, True, 90000))
+        self.assertFalse(Job.objects.get(title='Data Analyst').is_active)
+    
+    def test_import_refreshes_facets_and_search(self):
+        """Test the signals skipped by bulk_create are made up for."""
+        self._import(self._write('jobs.csv', self.CSV))
+        backend = Job.objects.get(title='Backend Dev')
+        self.assertEqual(JobFacetCount.objects.get(facet='location', value='Berlin').count, 1)
+        self.assertEqual([job_id for job_id, _ in search('backend')], [backend.id])
+    
+    def test_import_adds_to_existing_counts_without_rebuilding(self):
+        """Test that an import only indexes and counts the rows it inserted."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.create(
+                title='Existing Backend Role', company='Old Corp', location='Berlin', description='Description',
+                requirements='Requirements', job_type='full_time', posted_by=self.user, is_active=True
+            )
+        with mock.patch('jobs.facets.rebuild') as rebuild, \
+                mock.patch('jobs.search.SQLiteSearchBackend.rebuild') as reindex:
+            self._import(self._write('jobs.csv', self.CSV))
+        rebuild.assert_not_called()
+        reindex.assert_not_called()
+        self.assertEqual(JobFacetCount.objects.get(facet='location', value='Berlin').count, 2)
+        self.assertEqual(JobFacetCount.objects.get(facet='job_type', value='full_time').count, 2)
+        self.assertFalse(JobFacetCount.objects.filter(facet='location', value='Paris', count__gt=0).exists())
+        self.assertEqual(len(search('backend')), 2)
+    
+    def test_dry_run_inserts_nothing(self):
+        """Test --dry-run only validates."""
+        out, _ = self._import(self._write('jobs.csv', self.CSV), dry_run=True)
+        self.assertIn('would be imported', out)
+        self.assertFalse(Job.objects.exists())
+    
+    def test_jsonl_round_trip(self):
+        """Test an export re-imports into identical jobs."""
+        self._import(self._write('jobs.jsonl', '\n'.join([
+            json.dumps({'title': 'One', 'company': 'A', 'location': 'X', 'description': 'd',
+                        'requirements': 'r', 'salary': '50k', 'job_type': 'remote', 'category': 'finance'}),
+            'not json',
+        ])))
+        out = StringIO()
+        call_command('export_jobs', format='jsonl', stdout=out)
+        exported = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(exported), 1)
+        self.assertEqual((exported[0]['title'], exported[0]['category']), ('One', 'Finance'))
+        
+        Job.objects.all().delete()
+        out, _ = self._import(self._write('again.jsonl', out.getvalue()))
+        self.assertIn('1 imported', out)
+        self.assertEqual(Job.objects.get().salary, '50k')
+
+
+# ========== SEEDING AND BENCHMARK TESTS ==========
+class TestSeedPortal(TestCase):
+    """Test the seed_portal command and the portal benchmark."""
+    
+    def _seed(self, **options):
+        out = StringIO()
+        call_command('seed_portal', stdout=out, **options)
+        return out.getvalue()
+    
+    def test_seed_counts_and_derived_data(self):
+        """Test the requested rows are created with counters, facets and search filled in."""
+        out = self._seed(jobs=40, users=20, applications=60, employers=4, batch_size=7, seed=1)
+        self.assertIn('Seeded 20 users (4 employers), 40 jobs and 60 applications', out)
+        self.assertEqual(User.objects.filter(is_staff=True).count(), 4)
+        self.assertEqual(Job.objects.count(), 40)
+        self.assertEqual(JobApplication.objects.count(), 60)
+        self.assertFalse(JobApplication.objects.filter(applicant__is_staff=True).exists())
+        # Counters match, creation times are spread out, applications come after their job.
+        self.assertEqual(counters.reconcile(dry_run=True), 0)
+        self.assertGreater(len(set(Job.objects.values_list('created_at', flat=True))), 1)
+        application = JobApplication.objects.select_related('job').first()
+        self.assertGreaterEqual(application.applied_at, application.job.created_at)
+        
+        active = Job.objects.filter(is_active=True)
+        self.assertEqual(sum(JobFacetCount.objects.filter(facet='job_type').values_list('count', flat=True)),
+                         active.count())
+        job = active.first()
+        self.assertIn(job.id, [job_id for job_id, _ in search(job.company)])
+    
+    def test_seeding_twice_adds_rows(self):
+        """Test a second run does not collide with the first one's usernames."""
+        self._seed(jobs=5, users=4, applications=3)
+        self._seed(jobs=5, users=4, applications=3)
+        self.assertEqual((User.objects.count(), Job.objects.count()), (8, 10))
+    
+    def test_benchmark_covers_every_route(self):
+        """Test the benchmark measures each route and rolls its data back."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'benchmark.json')
+            call_command('benchmark_portal', scales='20,40', requests=1, json_path=path, stdout=StringIO())
+            with open(path, encoding='utf-8') as results_file:
+                report = json.load(results_file)
+            out = StringIO()
+            call_command('benchmark_portal', scales='20', requests=1, endpoints=['home'],
+                         compare=path, stdout=out)
+        
+        self.assertEqual([scale['jobs'] for scale in report['scales']], [20, 40])
+        self.assertEqual(report['unmeasured'], [])
+        self.assertEqual(list(report['skipped']), ['api_apply_job'])
+        endpoints = report['scales'][1]['endpoints']
+        self.assertEqual(len(endpoints), 23)
+        for endpoint in endpoints:
+            self.assertTrue(all(code < '400' for code in endpoint['status']), endpoint)
+            self.assertIn('p99', endpoint['latency_ms'])
+        self.assertRegex(out.getvalue(), r'20 home\s+p50')
+        self.assertFalse(Job.objects.exists())
+
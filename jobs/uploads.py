@@ -0,0 +1,181 @@
+"""
+Streaming resume uploads and content-addressed resume blobs.
+
+``ResumeUploadHandler`` writes the ``resume`` part of a multipart body to a
+temporary file chunk by chunk while hashing it, and gives up as soon as the
+request or the file is over ``RESUME_UPLOAD_MAX_SIZE``, without reading the
+rest of the body.  Stored resumes are shared between applications through
+``ResumeBlob`` reference counts.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+RESUME_FIELD = 'resume'
+
+
+def max_resume_size():
+    return getattr(settings, 'RESUME_UPLOAD_MAX_SIZE', 5 * 1024 * 1024)
+
+
+def validate_resume_size(value):
+    if value.size is not None and value.size > max_resume_size():
+        raise ValidationError(
+            f'Resume files must be smaller than {max_resume_size() // (1024 * 1024)} MB.'
+        )
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.active = False
+        self.too_large = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        max_request = getattr(settings, 'RESUME_UPLOAD_MAX_REQUEST_SIZE', max_resume_size() + 256 * 1024)
+        if content_length > max_request:
+            # Refuse before reading a single byte of the body.
+            self._reject()
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.active = field_name == RESUME_FIELD
+        if not self.active:
+            return
+        if content_length is not None and content_length > max_resume_size():
+            self._reject()
+            raise StopUpload(connection_reset=True)
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.file = TemporaryUploadedFile(file_name, content_type, 0, charset, content_type_extra)
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > max_resume_size():
+            self._reject()
+            raise StopUpload(connection_reset=True)
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.active = False
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.hasher.hexdigest()
+        return self.file
+
+    def _reject(self):
+        self.too_large = True
+        if self.request is not None:
+            self.request.resume_too_large = True
+
+
+def install_resume_upload_handler(request):
+    """Put the streaming handler first; must run before request.POST/FILES is read."""
+    request.upload_handlers.insert(0, ResumeUploadHandler(request))
+
+
+def upload_too_large(request):
+    """Parse the body (if not done yet) and report whether the handler refused it."""
+    request.FILES
+    return getattr(request, 'resume_too_large', False)
+
+
+def retain_resume(application):
+    """
+    Count a new reference to the blob ``application.resume`` is about to be
+    stored as.  Runs before the file is written, so a concurrent
+    ``discard_upload`` of the same content either sees the reference or has
+    removed the file before it is written again.
+    """
+    from .models import ResumeBlob  # models imports this module for the validator
+
+    name = pending_resume_name(application)
+    if not name:
+        # Not stored by ContentAddressedStorage, so never shared.
+        return
+    blobs = ResumeBlob.objects.filter(name=name)
+    if blobs.update(ref_count=F('ref_count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            # The size is filled in by the process_resume task, off the request.
+            ResumeBlob.objects.create(name=name, sha256=digest_from_name(name), ref_count=1)
+    except IntegrityError:
+        # Created by a concurrent upload since the update.
+        blobs.update(ref_count=F('ref_count') + 1)
+
+
+def pending_resume_name(application):
+    """The name an unsaved resume upload will be stored under, or '' if it is not content addressed."""
+    from .storage import ContentAddressedStorage
+
+    resume = application.resume
+    if not resume or resume._committed or not isinstance(resume.storage, ContentAddressedStorage):
+        return ''
+    content = resume.file
+    if not getattr(content, 'sha256', None):
+        # Hashed once here; the storage reuses it.
+        content.sha256 = resume.storage.hash_content(content)
+    return resume.storage.content_name(resume.field.generate_filename(application, resume.name), content.sha256)
+
+
+def release_resume(application):
+    """Drop the reference held by a deleted application; the last one removes the file."""
+    from .models import ResumeBlob
+
+    name = application.resume.name
+    blobs = ResumeBlob.objects.filter(name=name)
+    if not name or not blobs.update(ref_count=F('ref_count') - 1):
+        # Stored before content addressing; Django never deleted those either.
+        return
+    if blobs.filter(ref_count__lte=0).delete()[0]:
+        discard_upload(name, application.resume.storage)
+
+
+def discard_upload(name, storage):
+    """
+    Delete a stored resume once the transaction commits, unless some
+    application references it by then (identical uploads share one file).
+    """
+    from .models import ResumeBlob
+
+    if not digest_from_name(name):
+        return
+
+    def delete():
+        with transaction.atomic():
+            # Lock the name's blob row, or a zero-count one standing in for it:
+            # retain_resume waits on it, so no upload of the same content can
+            # count a reference between this check and the delete.
+            blob, _ = ResumeBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={'sha256': digest_from_name(name)},
+            )
+            if blob.ref_count <= 0:
+                storage.delete(name)
+                blob.delete()
+
+    transaction.on_commit(delete)
+
+
+def digest_from_name(name):
+    stem = name.rsplit('/', 1)[-1].split('.', 1)[0]
+    if len(stem) == 64 and all(char in '0123456789abcdef' for char in stem):
+        return stem
+    return ''
+
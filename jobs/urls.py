@@ -10,4 +10,5 @@ urlpatterns = [
     path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('create-job/', views.create_job, name='create_job'),
     path('job/<int:job_id>/applications/', views.view_applications, name='view_applications'),
+    path('job/<int:job_id>/applications/status/', views.update_application_status, name='update_application_status'),
 ]
\ No newline at end of file
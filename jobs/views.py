@@ -1,19 +1,93 @@
 
 # Create your views here.
-from django.shortcuts import render, get_object_or_404, redirect
+from functools import wraps
+
+from django.shortcuts import aget_object_or_404, render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.http import Http404
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import condition, require_POST
 from .models import Job, JobApplication, JobCategory
 from .forms import JobForm, ApplicationForm
+from .applications import AlreadyApplied, submit_application, update_statuses
+from .uploads import install_resume_upload_handler, max_resume_size, upload_too_large
+from .pagination import InvalidCursor, apaginate_jobs, get_page_size, get_sort_ordering, paginate_jobs
+from .search import search_jobs
+from . import applicant_search, facets, salary
+from .cache import cache_public_response
+from .conditional import async_condition, job_board_etag, job_list_last_modified, job_page_etag, job_page_last_modified
+
+# Yearly minimums offered as salary filter links on the home page
+SALARY_FILTER_STEPS = [50000, 80000, 100000, 150000]
 
+@cache_public_response()
+@condition(etag_func=job_board_etag, last_modified_func=job_list_last_modified)
 def home_view(request):
-    jobs = Job.objects.filter(is_active=True).order_by('-created_at')
-    categories = JobCategory.objects.all()
-    return render(request, 'jobs/home.html', {
+    query = request.GET.get('q', '').strip()
+    jobs = facets.filter_jobs(Job.objects.filter(is_active=True), request.GET)
+    try:
+        jobs, next_cursor = paginate_jobs(
+            salary.filter_jobs(jobs, request.GET),
+            query=query,
+            cursor=request.GET.get('cursor'),
+            page_size=get_page_size(request.GET.get('page_size')),
+            ordering=get_sort_ordering(request.GET.get('sort')),
+        )
+    except InvalidCursor:
+        raise Http404('Invalid cursor')
+
+    categories = list(JobCategory.objects.all())
+    facet_counts = facets.get_facet_counts(categories, _search_matches(query))
+    return render(request, 'jobs/home.html',
+                  _home_context(request, query, jobs, next_cursor, categories, facet_counts))
+
+def _search_matches(query):
+    """Every active match of ``query`` for the facet counts, or None without one."""
+    return search_jobs(Job.objects.filter(is_active=True), query) if query else None
+
+def _home_context(request, query, jobs, next_cursor, categories, facet_counts):
+    next_query = None
+    if next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        next_query = params.urlencode()
+
+    for facet, values in facet_counts.items():
+        for value in values:
+            value['query'] = _filter_query(request.GET, facet, value['value'])
+            value['selected'] = request.GET.get(facet) == value['value']
+
+    salary_options = [
+        {'label': f'{amount // 1000}k+', 'query': _filter_query(request.GET, 'salary_min', str(amount)),
+         'selected': request.GET.get('salary_min') == str(amount)}
+        for amount in SALARY_FILTER_STEPS
+    ]
+    sort = request.GET.get('sort', '')
+
+    return {
         'jobs': jobs,
-        'categories': categories
-    })
+        'categories': categories,
+        'facets': facet_counts,
+        'salary_options': salary_options,
+        'sort': sort,
+        'sort_newest_query': _filter_query(request.GET, 'sort', None),
+        'sort_salary_query': _filter_query(request.GET, 'sort', 'salary'),
+        'query': query,
+        'next_query': next_query,
+    }
 
+def _filter_query(params, name, value):
+    """Current query string with one filter set (or removed), back on page one."""
+    params = params.copy()
+    params.pop('cursor', None)
+    if value is None:
+        params.pop(name, None)
+    else:
+        params[name] = value
+    return params.urlencode()
+
+@condition(etag_func=job_page_etag, last_modified_func=job_page_last_modified)
 def job_detail_view(request, job_id):
     job = get_object_or_404(Job, id=job_id, is_active=True)
     has_applied = False
@@ -28,25 +102,88 @@ def job_detail_view(request, job_id):
         'has_applied': has_applied
     })
 
+# Async versions of the read paths, routed in ASGI mode (jobportal.urls_async)
+def resolve_user(view_func):
+    """Load request.user with auser() so nothing below touches it lazily."""
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        request.user = await request.auser()
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+@resolve_user
+@cache_public_response()
+@async_condition(etag_func=job_board_etag, last_modified_func=job_list_last_modified)
+async def async_home_view(request):
+    query = request.GET.get('q', '').strip()
+    jobs = facets.filter_jobs(Job.objects.filter(is_active=True), request.GET)
+    try:
+        jobs, next_cursor = await apaginate_jobs(
+            salary.filter_jobs(jobs, request.GET),
+            query=query,
+            cursor=request.GET.get('cursor'),
+            page_size=get_page_size(request.GET.get('page_size')),
+            ordering=get_sort_ordering(request.GET.get('sort')),
+        )
+    except InvalidCursor:
+        raise Http404('Invalid cursor')
+
+    categories = [category async for category in JobCategory.objects.all()]
+    facet_counts = await facets.aget_facet_counts(categories, _search_matches(query))
+    return render(request, 'jobs/home.html',
+                  _home_context(request, query, jobs, next_cursor, categories, facet_counts))
+
+@resolve_user
+@async_condition(etag_func=job_page_etag, last_modified_func=job_page_last_modified)
+async def async_job_detail_view(request, job_id):
+    job = await aget_object_or_404(Job, id=job_id, is_active=True)
+    has_applied = False
+    if request.user.is_authenticated:
+        has_applied = await JobApplication.objects.filter(
+            job=job,
+            applicant=request.user
+        ).aexists()
+
+    return render(request, 'jobs/job_detail.html', {
+        'job': job,
+        'has_applied': has_applied
+    })
+
 @login_required
+@csrf_exempt
 def apply_job_view(request, job_id):
+    if request.method == 'POST':
+        # Upload handlers can only be swapped before the body is parsed, and
+        # the CSRF check parses it, so the check runs in _apply_job instead.
+        install_resume_upload_handler(request)
+        if upload_too_large(request):
+            messages.error(request, f'Your resume must be smaller than {max_resume_size() // (1024 * 1024)} MB.')
+            return redirect('apply_job', job_id=job_id)
+    return _apply_job(request, job_id)
+
+@csrf_protect
+def _apply_job(request, job_id):
     job = get_object_or_404(Job, id=job_id, is_active=True)
     
-    # Check if already applied
-    if JobApplication.objects.filter(job=job, applicant=request.user).exists():
-        messages.warning(request, 'You have already applied for this job.')
-        return redirect('job_detail', job_id=job_id)
-    
     if request.method == 'POST':
+        # No exists() pre-check: the unique constraint decides, race-free.
         form = ApplicationForm(request.POST, request.FILES)
         if form.is_valid():
             application = form.save(commit=False)
             application.job = job
             application.applicant = request.user
-            application.save()
+            try:
+                submit_application(application)
+            except AlreadyApplied:
+                messages.warning(request, 'You have already applied for this job.')
+                return redirect('job_detail', job_id=job_id)
             messages.success(request, 'Application submitted successfully!')
             return redirect('job_detail', job_id=job_id)
     else:
+        # Check if already applied
+        if JobApplication.objects.filter(job=job, applicant=request.user).exists():
+            messages.warning(request, 'You have already applied for this job.')
+            return redirect('job_detail', job_id=job_id)
         form = ApplicationForm()
     
     return render(request, 'jobs/apply_job.html', {
@@ -61,8 +198,9 @@ def is_admin(user):
 @login_required
 @user_passes_test(is_admin)
 def admin_dashboard(request):
-    jobs = Job.objects.filter(posted_by=request.user)
-    total_applications = JobApplication.objects.filter(job__posted_by=request.user).count()
+    jobs = list(Job.objects.filter(posted_by=request.user).order_by('-created_at'))
+    # Counters live on the job rows, so no aggregate over applications.
+    total_applications = sum(job.application_count for job in jobs)
     
     return render(request, 'jobs/admin/admin_dashboard.html', {
         'jobs': jobs,
@@ -89,9 +227,32 @@ def create_job(request):
 @user_passes_test(is_admin)
 def view_applications(request, job_id):
     job = get_object_or_404(Job, id=job_id, posted_by=request.user)
-    applications = job.applications.all()
+    applications = job.applications.select_related('applicant')
+    query = request.GET.get('q', '').strip()
+    if query:
+        # Ranked from the applicant index; resumes are not opened here.
+        hits = applicant_search.search(job.id, query)
+        rows = applications.in_bulk([application_id for application_id, _ in hits])
+        applications = [rows[application_id] for application_id, _ in hits if application_id in rows]
     
     return render(request, 'jobs/admin/view_applications.html', {
         'job': job,
-        'applications': applications
-    })
\ No newline at end of file
+        'applications': applications,
+        'query': query
+    })
+
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def update_application_status(request, job_id):
+    """Set the status of the ticked applications in one bulk update."""
+    job = get_object_or_404(Job, id=job_id, posted_by=request.user)
+    status = request.POST.get('status')
+    ids = [int(value) for value in request.POST.getlist('applications') if value.isdigit()]
+    if status not in dict(JobApplication.APPLICATION_STATUS) or not ids:
+        messages.error(request, 'Select at least one application and a status.')
+    else:
+        result = update_statuses(dict.fromkeys(ids, status), owner=request.user)
+        messages.success(request, f'{len(result.updated)} application(s) marked as {status}.')
+    return redirect('view_applications', job_id=job.id)
+
@@ -0,0 +1,12 @@
+"""
+A small database-backed task queue.
+
+Side effects that do not have to finish inside the request (search index
+updates, resume processing, notifications) are declared with ``@task`` and
+queued with ``.delay()``.  The queue row is written in the caller's
+transaction, so it commits or rolls back together with the data it is
+about (the outbox pattern), and ``manage.py run_workers`` executes it.
+"""
+from .queue import enqueue, task
+
+__all__ = ['enqueue', 'task']
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_at', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['created_at', 'finished_at', 'locked_by', 'locked_at']
+    actions = ['retry_tasks']
+    
+    @admin.action(description='Queue selected tasks again')
+    def retry_tasks(self, request, queryset):
+        updated = queryset.exclude(status=Task.RUNNING).update(
+            status=Task.QUEUED, attempts=0, run_at=timezone.now(), finished_at=None,
+        )
+        self.message_user(request, f'{updated} task(s) queued again.')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from tasks.worker import run_workers
+
+
+class Command(BaseCommand):
+    help = 'Run background task workers against the database queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1,
+                            help='Worker processes to start (default 1).')
+        parser.add_argument('--threads', type=int, default=1,
+                            help='Worker threads per process (default 1).')
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help='Seconds an idle worker waits before polling again.')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once the queue is empty instead of waiting.')
+
+    def handle(self, *args, **options):
+        processed = run_workers(
+            processes=options['processes'],
+            threads=options['threads'],
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+        )
+        if processed is not None:
+            self.stdout.write(self.style.SUCCESS(f'{processed} task(s) processed.'))
@@ -0,0 +1,164 @@
+"""
+Task registration, queueing and execution.
+
+Workers claim a task with a conditional ``UPDATE ... WHERE status = 'queued'``,
+which only one of them can win, so this works on SQLite as well as
+PostgreSQL without row locks.  A failed task is queued again with
+exponential backoff until it runs out of attempts; a task whose worker died
+is handed out again once its lock is older than ``TASKS_LOCK_TIMEOUT``.
+"""
+import logging
+import random
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger('tasks')
+
+_registry = {}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class TaskFunction:
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self.name, args, kwargs)
+
+    def __repr__(self):
+        return f'<task {self.name}>'
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """Register ``func`` as a task; use as ``@task`` or ``@task(max_attempts=3)``."""
+    def register(func):
+        task_name = name or f'{func.__module__}.{func.__qualname__}'
+        wrapper = TaskFunction(func, task_name, max_attempts)
+        _registry[task_name] = wrapper
+        return wrapper
+    return register(func) if func is not None else register
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def enqueue(name, args=(), kwargs=None, run_at=None):
+    """
+    Queue a call of the task ``name``.
+
+    With ``TASKS_ALWAYS_EAGER`` the task runs in this process once the
+    caller's transaction commits (right away outside one), like a worker
+    would pick it up; its exceptions are logged, never raised to the caller.
+    """
+    from .models import Task
+
+    registered = get_task(name)
+    if registered is None:
+        raise LookupError(f'Unknown task {name!r}')
+    kwargs = kwargs or {}
+    if _setting('TASKS_ALWAYS_EAGER', False):
+        transaction.on_commit(partial(_run_eagerly, registered, args, kwargs), robust=True)
+        return None
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        max_attempts=registered.max_attempts or _setting('TASKS_MAX_ATTEMPTS', 5),
+    )
+
+
+def _run_eagerly(registered, args, kwargs):
+    try:
+        registered(*args, **kwargs)
+    except Exception:
+        logger.exception('Eager task %s failed', registered.name)
+
+
+def retry_delay(attempts):
+    """Seconds to wait before attempt ``attempts + 1``: exponential, capped, jittered."""
+    base = _setting('TASKS_RETRY_BACKOFF', 10)
+    delay = min(base * 2 ** max(attempts - 1, 0), _setting('TASKS_RETRY_BACKOFF_MAX', 3600))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim(worker_name, candidates=10):
+    """Lock and return the oldest due task, or None when the queue is empty."""
+    from .models import Task
+
+    now = timezone.now()
+    due = (Task.objects.filter(status=Task.QUEUED, run_at__lte=now)
+           .order_by('run_at', 'id').values_list('id', flat=True)[:candidates])
+    for pk in due:
+        won = Task.objects.filter(pk=pk, status=Task.QUEUED).update(
+            status=Task.RUNNING,
+            locked_by=worker_name,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if won:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def execute(queued):
+    """Run a claimed task and record the outcome; returns True on success."""
+    from .models import Task
+
+    registered = get_task(queued.name)
+    try:
+        if registered is None:
+            raise LookupError(f'Unknown task {queued.name!r}')
+        registered(*queued.args, **queued.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if queued.attempts >= queued.max_attempts:
+            logger.error('Task %s #%s failed for good:\n%s', queued.name, queued.pk, error)
+            changes = {'status': Task.FAILED, 'finished_at': timezone.now()}
+        else:
+            logger.warning('Task %s #%s failed, will retry:\n%s', queued.name, queued.pk, error)
+            run_at = timezone.now() + timedelta(seconds=retry_delay(queued.attempts))
+            changes = {'status': Task.QUEUED, 'run_at': run_at}
+        Task.objects.filter(pk=queued.pk).update(last_error=error, locked_by='', locked_at=None, **changes)
+        return False
+    Task.objects.filter(pk=queued.pk).update(
+        status=Task.DONE, finished_at=timezone.now(), locked_by='', locked_at=None,
+    )
+    return True
+
+
+def requeue_stale(timeout=None):
+    """Hand out again the tasks of workers that died mid-run; returns how many."""
+    from .models import Task
+
+    timeout = timeout if timeout is not None else _setting('TASKS_LOCK_TIMEOUT', 600)
+    stale = Task.objects.filter(status=Task.RUNNING, locked_at__lt=timezone.now() - timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.FAILED, finished_at=timezone.now(), last_error='Worker lock expired',
+    )
+    return failed + stale.update(status=Task.QUEUED, locked_by='', locked_at=None)
+
+
+def purge_finished(older_than=None):
+    """Delete done tasks past ``TASKS_DONE_RETENTION`` seconds; failed ones are kept."""
+    from .models import Task
+
+    older_than = older_than if older_than is not None else _setting('TASKS_DONE_RETENTION', 86400)
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    return Task.objects.filter(status=Task.DONE, finished_at__lt=cutoff).delete()[0]
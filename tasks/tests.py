@@ -0,0 +1,171 @@
+﻿import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job, JobApplication
+from .models import Task
+from .queue import claim, enqueue, execute, requeue_stale, task
+from .worker import drain
+
+calls = []
+
+
+@task(name='tasks.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task(name='tasks.tests.explode', max_attempts=2)
+def explode():
+    raise RuntimeError('boom')
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class TestTaskQueue(TestCase):
+    """Test queueing, claiming, retries and stale locks."""
+    
+    def setUp(self):
+        calls.clear()
+    
+    def test_delay_writes_queue_row(self):
+        """Test that delay() only records the call until a worker runs it."""
+        record.delay('a')
+        self.assertEqual(calls, [])
+        queued = Task.objects.get()
+        self.assertEqual((queued.name, queued.args, queued.status), ('tasks.tests.record', ['a'], Task.QUEUED))
+        
+        self.assertEqual(drain(), 1)
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+    
+    def test_claimed_task_not_handed_out_twice(self):
+        """Test that a claimed task is invisible to other workers."""
+        record.delay('a')
+        self.assertIsNotNone(claim('worker-1'))
+        self.assertIsNone(claim('worker-2'))
+    
+    def test_failure_retries_with_backoff_then_fails(self):
+        """Test a failing task is rescheduled, then marked failed after max attempts."""
+        explode.delay()
+        self.assertFalse(execute(claim('worker')))
+        queued = Task.objects.get()
+        self.assertEqual((queued.status, queued.attempts), (Task.QUEUED, 1))
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertIn('boom', queued.last_error)
+        
+        Task.objects.update(run_at=timezone.now())
+        self.assertFalse(execute(claim('worker')))
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+    
+    def test_stale_lock_requeued(self):
+        """Test that a task whose worker died is handed out again."""
+        record.delay('a')
+        claim('dead-worker')
+        Task.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(timeout=60), 1)
+        self.assertEqual(Task.objects.get().status, Task.QUEUED)
+    
+    def test_running_pool_requeues_stale_tasks(self):
+        """Test that a pool keeps requeueing while it runs, not only at startup."""
+        import threading
+        from unittest import mock
+        from . import worker
+        
+        stop_event = threading.Event()
+        with mock.patch.object(worker.queue, 'claim', return_value=None), \
+                mock.patch.object(worker.queue, 'purge_finished'), \
+                mock.patch.object(worker.queue, 'requeue_stale', return_value=0) as requeue:
+            pool = threading.Thread(target=worker.run_pool, kwargs={
+                'poll_interval': 0.01, 'stop_event': stop_event, 'housekeeping_interval': 0,
+            })
+            pool.start()
+            try:
+                for _ in range(100):
+                    if requeue.call_count >= 3:
+                        break
+                    time.sleep(0.05)
+            finally:
+                stop_event.set()
+                pool.join()
+        self.assertGreaterEqual(requeue.call_count, 3)
+    
+    def test_unknown_task_rejected(self):
+        """Test that queueing an unregistered name fails loudly."""
+        with self.assertRaises(LookupError):
+            enqueue('tasks.tests.missing')
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        """Test that eager mode runs the task on commit without a queue row."""
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delay('now')
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ['now'])
+        self.assertFalse(Task.objects.exists())
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_mode_skips_rolled_back_work(self):
+        """Test that an eager task queued in a rolled back transaction never runs."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    record.delay('never')
+                    raise RuntimeError('rollback')
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(calls, [])
+    
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_failure_is_logged(self):
+        """Test that an eager task failure is logged rather than raised to the caller."""
+        with self.assertLogs('tasks', 'ERROR') as logs:
+            with self.captureOnCommitCallbacks(execute=True):
+                explode.delay()
+        self.assertIn('tasks.tests.explode', logs.output[0])
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class TestApplySideEffects(TestCase):
+    """Test that applying queues its side effects instead of running them."""
+    
+    def setUp(self):
+        self.employer = User.objects.create_user(username='employer', email='boss@test.com', password='testpass123')
+        self.job = Job.objects.create(
+            title='Queued Job',
+            company='Queue Corp',
+            location='Remote',
+            description='Description',
+            requirements='Requirements',
+            job_type='remote',
+            posted_by=self.employer,
+            is_active=True
+        )
+        User.objects.create_user(username='applicant', password='testpass123')
+        self.client = Client()
+        self.client.login(username='applicant', password='testpass123')
+        drain()
+    
+    def test_notification_sent_by_worker(self):
+        """Test the employer email goes out from the worker, not the request."""
+        self.client.post(reverse('apply_job', args=[self.job.id]), {
+            'cover_letter': 'Hello',
+            'resume': SimpleUploadedFile('resume.pdf', b'%PDF queued', content_type='application/pdf')
+        })
+        self.assertTrue(JobApplication.objects.exists())
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            set(Task.objects.filter(status=Task.QUEUED).values_list('name', flat=True)),
+            {'jobs.tasks.process_resume', 'jobs.tasks.notify_employer'}
+        )
+        
+        drain()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['boss@test.com'])
@@ -0,0 +1,143 @@
+"""
+Worker loops for ``manage.py run_workers``.
+
+Each thread runs its own ``Worker`` with its own database connection; with
+``processes > 1`` the pool is repeated in that many child processes.  SIGINT
+and SIGTERM let running tasks finish before the workers exit.  While the
+pool runs, its main thread hands out again the tasks of workers that died
+(``requeue_stale``) and purges finished ones every ``TASKS_LOCK_TIMEOUT``
+seconds.
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+
+from . import queue
+
+logger = logging.getLogger('tasks')
+
+
+class Worker:
+    def __init__(self, name, stop_event, poll_interval=None, burst=False):
+        self.name = name
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval if poll_interval is not None else getattr(
+            settings, 'TASKS_POLL_INTERVAL', 1.0)
+        self.burst = burst
+        self.processed = 0
+
+    def run_once(self):
+        """Claim and run one task; returns False when nothing was due."""
+        claimed = queue.claim(self.name)
+        if claimed is None:
+            return False
+        queue.execute(claimed)
+        self.processed += 1
+        return True
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                # Like a request boundary: drop broken or expired connections.
+                close_old_connections()
+                if not self.run_once():
+                    if self.burst:
+                        break
+                    self.stop_event.wait(self.poll_interval)
+        finally:
+            connection.close()
+        return self.processed
+
+
+def housekeeping():
+    """Requeue the tasks of dead workers and purge finished ones."""
+    close_old_connections()
+    try:
+        requeued = queue.requeue_stale()
+        queue.purge_finished()
+    except DatabaseError:
+        logger.exception('Task queue housekeeping failed')
+        return
+    if requeued:
+        logger.warning('Requeued %d task(s) whose worker lock expired', requeued)
+
+
+def run_pool(threads=1, poll_interval=None, burst=False, stop_event=None, housekeeping_interval=None):
+    """Run ``threads`` workers in this process until stopped (or idle, with ``burst``)."""
+    stop_event = stop_event or threading.Event()
+    prefix = f'{socket.gethostname()}:{os.getpid()}'
+    if housekeeping_interval is None:
+        housekeeping_interval = getattr(settings, 'TASKS_LOCK_TIMEOUT', 600)
+    housekeeping()
+    next_housekeeping = time.monotonic() + housekeeping_interval
+
+    workers = [Worker(f'{prefix}:{index}', stop_event, poll_interval, burst) for index in range(threads)]
+    pool = [threading.Thread(target=worker.run, name=worker.name, daemon=True) for worker in workers]
+    for thread in pool:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in pool):
+            for thread in pool:
+                thread.join(0.5)
+            if time.monotonic() >= next_housekeeping and not stop_event.is_set():
+                housekeeping()
+                next_housekeeping = time.monotonic() + housekeeping_interval
+    finally:
+        connection.close()
+    return sum(worker.processed for worker in workers)
+
+
+def _run_child(threads, poll_interval, burst):
+    import django
+    django.setup()
+    stop_event = threading.Event()
+    _stop_on_signals(stop_event)
+    run_pool(threads, poll_interval, burst, stop_event)
+
+
+def _stop_on_signals(stop_event):
+    def stop(signum, frame):
+        logger.info('Stopping workers after the running tasks finish')
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+
+def run_workers(processes=1, threads=1, poll_interval=None, burst=False):
+    if processes <= 1:
+        stop_event = threading.Event()
+        _stop_on_signals(stop_event)
+        return run_pool(threads, poll_interval, burst, stop_event)
+
+    # Spawn (not fork) so no child inherits this process's DB connections.
+    context = multiprocessing.get_context('spawn')
+    children = [context.Process(target=_run_child, args=(threads, poll_interval, burst))
+                for _ in range(processes)]
+    for child in children:
+        child.start()
+    try:
+        while any(child.is_alive() for child in children):
+            for child in children:
+                child.join(0.5)
+    except KeyboardInterrupt:
+        for child in children:
+            child.terminate()
+        for child in children:
+            child.join()
+    return None
+
+
+def drain(max_loops=1000):
+    """Run queued tasks in this thread until none are due; returns how many ran."""
+    worker = Worker('drain', threading.Event(), burst=True)
+    while worker.processed < max_loops and worker.run_once():
+        pass
+    return worker.processed
@@ -0,0 +1,199 @@
+"""
+Query-plan regression tests for the hot read paths.
+
+Each test requests a page or endpoint against a seeded dataset, captures
+every SELECT it runs and asks SQLite for its plan.  A ``SCAN`` of a table
+without an index means the query reads the whole table, which is fine on
+a developer's laptop and slow in production.  Such a plan fails the test
+with the query and plan in the message.  Only tiny lookup tables may be
+scanned.
+"""
+import unittest
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from jobs import bulk
+from jobs.models import Job, JobApplication, JobCategory
+
+JOBS = 3000
+APPLICANTS = 200
+APPLICATIONS_PER_APPLICANT = 15
+# Lookup tables with a handful of rows, read whole on purpose.
+SCANNABLE_TABLES = {'jobs_jobcategory', 'jobs_jobfacetcount'}
+
+
+def query_plan(sql, params):
+    """The EXPLAIN QUERY PLAN lines of ``sql``."""
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def full_scans(sql, params):
+    """The plan lines of ``sql`` that read a table without an index."""
+    scans = []
+    for detail in query_plan(sql, params):
+        words = detail.split()
+        if words[:1] != ['SCAN'] or ' USING ' in detail or words[1].startswith(('(', 'CONSTANT')):
+            continue
+        # An FTS5 MATCH ("M" in the index string) is a lookup in its own index.
+        if ' VIRTUAL TABLE INDEX ' in detail and 'M' in words[-1].partition(':')[2]:
+            continue
+        if words[1] not in SCANNABLE_TABLES:
+            scans.append(detail)
+    return scans
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Plans are read in SQLite EXPLAIN QUERY PLAN format')
+class TestQueryPlans(TestCase):
+    """Test that the hot paths are served from indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='testpass123', is_staff=True)
+        cls.applicant = User.objects.create_user(username='applicant', password='testpass123')
+        applicants = User.objects.bulk_create(
+            User(username=f'seeker{index}', password='!') for index in range(APPLICANTS)
+        ) + [cls.applicant]
+        categories = JobCategory.objects.bulk_create(JobCategory(name=f'Category {index}') for index in range(8))
+        owners = [cls.employer] + User.objects.bulk_create(
+            User(username=f'owner{index}', password='!', is_staff=True) for index in range(20)
+        )
+
+        now = timezone.now()
+        Job.objects.bulk_create([
+            Job(
+                title=f'Job {index}', company=f'Company {index % 50}', location=f'City {index % 30}',
+                description='Description', requirements='Requirements',
+                salary_max=40000 + index * 10, job_type=Job.JOB_TYPE_CHOICES[index % 4][0],
+                category=categories[index % len(categories)], posted_by=owners[index % len(owners)],
+                # Most of the table is closed or expired postings.
+                is_active=index % 5 == 0,
+            )
+            for index in range(JOBS)
+        ], batch_size=500)
+        # auto_now_add ignores the value given to bulk_create; spread them out.
+        for job in Job.objects.only('id'):
+            Job.objects.filter(pk=job.pk).update(created_at=now - timedelta(minutes=job.pk))
+
+        jobs = list(Job.objects.values_list('id', flat=True))
+        JobApplication.objects.bulk_create([
+            JobApplication(
+                job_id=jobs[(index * 37 + offset * 101) % len(jobs)], applicant=applicant,
+                resume='resumes/seed.pdf', cover_letter='Cover letter',
+                status=JobApplication.APPLICATION_STATUS[offset % 4][0],
+            )
+            for index, applicant in enumerate(applicants)
+            for offset in range(APPLICATIONS_PER_APPLICANT)
+        ], batch_size=500)
+        cls.job = Job.objects.filter(posted_by=cls.employer, is_active=True).first()
+        # Facet counts and the search index, as the signals would have left them.
+        bulk.refresh_derived_data()
+
+        with connection.cursor() as cursor:
+            # Table statistics, so the planner costs plans as in production.
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    @contextmanager
+    def captureSelects(self):
+        queries = []
+
+        def capture(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            yield queries
+        self.assertTrue(queries, 'No SELECT queries were captured')
+
+    @contextmanager
+    def assertNoFullScans(self):
+        with self.captureSelects() as queries:
+            yield
+        for sql, params in queries:
+            scans = full_scans(sql, params)
+            self.assertEqual(scans, [], f'Full table scan in:\n{sql}\nparams: {params}')
+
+    def _get(self, path, status_code=200, **headers):
+        with self.assertNoFullScans():
+            response = self.client.get(path, **headers)
+        self.assertEqual(response.status_code, status_code, path)
+        return response
+
+    def test_home_page(self):
+        """Test the public job board and its facet filters."""
+        self._get(reverse('home'))
+        for params in ('?category=%d' % self.job.category_id, '?job_type=remote', '?location=City%203'):
+            self._get(reverse('home') + params)
+
+    def test_job_list_api(self):
+        """Test the public job feed, its next page and the salary sort."""
+        response = self._get(reverse('api_jobs'))
+        next_link = response['Link'].split(';')[0].strip('<>')
+        self._get(next_link)
+        self._get(reverse('api_jobs') + '?sort=salary')
+        self._get(reverse('api_jobs') + '?salary_min=60000')
+        self._get(reverse('api_jobs') + '?q=job')
+
+    def test_next_pages_seek_into_the_index(self):
+        """Test a keyset page starts with an index range search, not a scan from the top."""
+        for path, search in (
+            (reverse('api_jobs'), 'SEARCH jobs_job USING INDEX job_active_created_idx (created_at<?)'),
+            (reverse('api_jobs') + '?sort=salary', 'SEARCH jobs_job USING INDEX job_active_salary_idx (salary_max'),
+        ):
+            next_link = self._get(path)['Link'].split(';')[0].strip('<>')
+            with self.captureSelects() as queries:
+                self.client.get(next_link)
+            plans = [line for sql, params in queries for line in query_plan(sql, params)]
+            self.assertTrue(any(line.startswith(search) for line in plans), f'{search!r} not in {plans}')
+
+    def test_search_and_facets(self):
+        """Test the board's full-text search and the facet counts endpoint."""
+        self._get(reverse('home') + '?q=job')
+        self._get(reverse('api_job_facets'))
+
+    def test_job_batch_api(self):
+        """Test a batch of ids, including closed postings, is fetched by primary key."""
+        ids = ','.join(str(pk) for pk in Job.objects.order_by('pk').values_list('pk', flat=True)[:20])
+        token = RefreshToken.for_user(self.applicant).access_token
+        response = self._get(reverse('api_job_batch') + f'?ids={ids}', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertTrue(response.json()['inactive'])
+
+    def test_job_detail(self):
+        """Test the job page for a signed-in applicant and the detail endpoint."""
+        token = RefreshToken.for_user(self.applicant).access_token
+        self._get(reverse('api_job_detail', args=[self.job.id]), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.client.force_login(self.applicant)
+        self._get(reverse('job_detail', args=[self.job.id]))
+
+    def test_applicant_pages(self):
+        """Test an applicant's own applications on the profile page and API."""
+        self.client.force_login(self.applicant)
+        self._get(reverse('profile'))
+        token = RefreshToken.for_user(self.applicant).access_token
+        self._get(reverse('api_my_applications'), HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_employer_pages(self):
+        """Test the employer dashboard and a job's applications."""
+        self.client.force_login(self.employer)
+        self._get(reverse('admin_dashboard'))
+        self._get(reverse('view_applications', args=[self.job.id]))
+        token = RefreshToken.for_user(self.employer).access_token
+        self._get(reverse('api_job_applications', args=[self.job.id]), HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_detects_full_scans(self):
+        """Test that the harness fails a query no index can serve."""
+        self.assertEqual(full_scans('SELECT * FROM jobs_job WHERE description = %s', ['x']), ['SCAN jobs_job'])
@@ -0,0 +1,66 @@
+"""
+Tests of the SQLite connection profiles and their concurrency benchmark.
+
+The benchmark starts several Django processes and takes seconds; it only
+runs with RUN_SLOW_TESTS=1 (``manage.py test --tag slow``).
+"""
+import os
+import unittest
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, tag
+
+from jobportal import sqlite, sqlite_benchmark
+
+
+class TestProfileOptions(SimpleTestCase):
+    def test_production_options(self):
+        """The production profile sets the pragmas per connection and begins immediate."""
+        options = sqlite.options('production', busy_timeout=5, mmap_size=1024)
+        self.assertEqual(options['timeout'], 5)
+        self.assertEqual(options['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(
+            options['init_command'].split(';'),
+            ['PRAGMA journal_mode=WAL', 'PRAGMA synchronous=NORMAL', 'PRAGMA busy_timeout=5000', 'PRAGMA mmap_size=1024'],
+        )
+
+    def test_stock_options(self):
+        """The stock profile only sets the busy timeout."""
+        self.assertEqual(sqlite.options('stock', busy_timeout=5), {'timeout': 5})
+
+    def test_unknown_profile(self):
+        """A misspelt profile is an error rather than silently stock."""
+        with self.assertRaises(ValueError):
+            sqlite.options('fast')
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'SQLite connection profile')
+class TestConnectionPragmas(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_uses_production_profile(self):
+        """Connections come up in WAL mode with the tuned pragmas."""
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), 20000)
+        self.assertGreater(self.pragma('mmap_size'), 0)
+
+    def test_atomic_begins_immediate(self):
+        """atomic() takes the write lock at BEGIN."""
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+
+@tag('slow')
+@unittest.skipUnless(os.environ.get('RUN_SLOW_TESTS') == '1', 'Slow test; set RUN_SLOW_TESTS=1')
+@unittest.skipUnless(connection.vendor == 'sqlite', 'SQLite concurrency benchmark')
+class TestSQLiteBenchmark(SimpleTestCase):
+    def test_production_profile_has_no_lock_errors(self):
+        """Concurrent readers and writers all succeed under the production profile."""
+        result, = sqlite_benchmark.run(profiles=['production'], workers=3, duration=1.0, write_ratio=0.5, jobs=50)
+        self.assertEqual(result['journal_mode'], 'wal')
+        self.assertEqual(result['errors'], {})
+        self.assertGreater(result['reads'], 0)
+        self.assertGreater(result['writes'], 0)